@@ -0,0 +1,80 @@
+"""Compare the blacklist matching engine with the legacy sliding-window scan.
+
+Usage:
+    python benchmarks/censorship_bench.py [--text-len 300] [--legacy-limit 1000]
+
+The legacy scan runs SequenceMatcher on every window for every word, so it is
+only timed for blacklists up to --legacy-limit words.
+"""
+
+import argparse
+import random
+import string
+import time
+from difflib import SequenceMatcher
+
+from telegram_bot.handlers.moderation.filters.matching import BlacklistMatcher
+
+SIZES = (10, 1_000, 10_000)
+MARGIN = 2
+SIMILARITY = 0.85
+
+
+def legacy_search(text: str, words: list[str]) -> bool:
+    for word in words:
+        length = len(word)
+        for window_len in range(max(length - MARGIN, 1), length + MARGIN + 1):
+            for i in range(len(text) - window_len + 1):
+                fragment = text[i : i + window_len]
+                if SequenceMatcher(None, fragment, word).ratio() >= SIMILARITY:
+                    return True
+    return False
+
+
+def random_word(rng: random.Random) -> str:
+    return "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10)))
+
+
+def timed(func, *args) -> tuple[float, object]:
+    started = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - started, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--text-len", type=int, default=300)
+    parser.add_argument("--legacy-limit", type=int, default=1_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    # A clean message is the worst case: every word has to be ruled out.
+    text = "".join(rng.choices(string.ascii_lowercase, k=args.text_len))
+
+    print(f"text length: {len(text)}, margin: {MARGIN}, similarity: {SIMILARITY}")
+    print(f"{'words':>8} {'build':>10} {'engine':>10} {'legacy':>10} {'speedup':>9}")
+
+    for size in SIZES:
+        words = [random_word(rng) for _ in range(size)]
+
+        build_time, matcher = timed(BlacklistMatcher, words, MARGIN, SIMILARITY)
+        engine_time, result = timed(matcher.search, text)
+
+        if size <= args.legacy_limit:
+            legacy_time, legacy_result = timed(legacy_search, text, words)
+            assert result.triggered == legacy_result
+            legacy = f"{legacy_time * 1000:8.1f}ms"
+            speedup = f"{legacy_time / engine_time:8.1f}x"
+        else:
+            legacy = f"{'skipped':>10}"
+            speedup = f"{'-':>9}"
+
+        print(
+            f"{size:>8} {build_time * 1000:8.1f}ms {engine_time * 1000:8.1f}ms "
+            f"{legacy} {speedup}"
+        )
+
+
+if __name__ == "__main__":
+    main()
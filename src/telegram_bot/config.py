@@ -1,14 +1,90 @@
 from dataclasses import dataclass
 from os import getenv
 from pathlib import Path
+from typing import Literal, cast
 
 from dotenv import load_dotenv
 
+LogOverflowPolicy = Literal["block", "drop_oldest"]
+AIBackend = Literal["torch", "onnx"]
+FloodBackend = Literal["memory", "snapshot", "sqlite"]
+
 
 @dataclass(frozen=True)
 class Config:
     bot_token: str
 
+    # Behaviour of the moderation log buffer when it is full.
+    log_overflow_policy: LogOverflowPolicy = "block"
+
+    # Worker pool for CPU-heavy moderation filters, 0 runs them inline.
+    filter_workers: int = 2
+    filter_timeout: float = 2.0
+
+    # Runtime of the AI censorship models, "onnx" uses quantized models
+    # cached in ai_onnx_cache_dir. 0 threads lets the runtime decide.
+    ai_backend: AIBackend = "torch"
+    ai_onnx_cache_dir: str = ".onnx_cache"
+    ai_intra_op_threads: int = 0
+    ai_inter_op_threads: int = 0
+    # Load the AI models at startup even if no chat uses AI censorship yet.
+    ai_warmup: bool = False
+    # Seconds an AI check waits for the models before it fails.
+    ai_timeout: float = 10.0
+    # Run the AI models in a separate worker process reached over a Unix socket.
+    ai_worker: bool = False
+    ai_worker_socket: str = ".inference.sock"
+
+    # Where the anti-flood message counts live: "memory" in the bot process,
+    # "snapshot" in memory but saved across restarts, "sqlite" in a file that
+    # several bot processes on one host can share.
+    flood_backend: FloodBackend = "memory"
+    flood_snapshot_path: str = "flood_snapshot.json"
+    flood_db_path: str = "flood.db"
+
+    # Mute users whose messages or filter hits, summed over at least
+    # global_flood_chats chats within global_flood_window seconds, reach the
+    # limits. A limit of 0 disables it.
+    global_flood_messages: int = 30
+    global_flood_hits: int = 3
+    global_flood_chats: int = 2
+    global_flood_window: int = 60
+    global_flood_mute_time: int = 3600
+
+
+def _getenv_choice(name: str, choices: tuple[str, ...], default: str) -> str:
+    value = getenv(name) or default
+    if value not in choices:
+        raise RuntimeError(f"{name} must be one of {choices}, got {value!r}")
+    return value
+
+
+def _getenv_bool(name: str, default: bool) -> bool:
+    value = (getenv(name) or str(default)).lower()
+    if value not in ("1", "0", "true", "false", "yes", "no"):
+        raise RuntimeError(f"{name} must be a boolean, got {value!r}")
+    return value in ("1", "true", "yes")
+
+
+def _getenv_int(name: str, default: int, minimum: int = 0) -> int:
+    value = getenv(name) or str(default)
+    if not value.isdigit():
+        raise RuntimeError(f"{name} must be a non-negative integer, got {value!r}")
+    if int(value) < minimum:
+        raise RuntimeError(f"{name} must be at least {minimum}, got {value!r}")
+    return int(value)
+
+
+def _getenv_float(name: str, default: float) -> float:
+    value = getenv(name) or str(default)
+    try:
+        number = float(value)
+    except ValueError:
+        number = -1.0
+    if number <= 0:
+        raise RuntimeError(f"{name} must be a positive number, got {value!r}")
+    return number
+
 
 def load_config() -> Config:
     """Load bot configuration from a local .env file."""
@@ -20,6 +96,42 @@ def load_config() -> Config:
     load_dotenv(env_path)
 
     if token := getenv("BOT_TOKEN"):
-        return Config(bot_token=token)
+        return Config(
+            bot_token=token,
+            log_overflow_policy=cast(
+                LogOverflowPolicy,
+                _getenv_choice(
+                    "LOG_OVERFLOW_POLICY", ("block", "drop_oldest"), "block"
+                ),
+            ),
+            filter_workers=_getenv_int("FILTER_WORKERS", 2),
+            filter_timeout=_getenv_float("FILTER_TIMEOUT", 2.0),
+            ai_backend=cast(
+                AIBackend, _getenv_choice("AI_BACKEND", ("torch", "onnx"), "torch")
+            ),
+            ai_onnx_cache_dir=getenv("AI_ONNX_CACHE_DIR") or ".onnx_cache",
+            ai_intra_op_threads=_getenv_int("AI_INTRA_OP_THREADS", 0),
+            ai_inter_op_threads=_getenv_int("AI_INTER_OP_THREADS", 0),
+            ai_warmup=_getenv_bool("AI_WARMUP", False),
+            ai_timeout=_getenv_float("AI_TIMEOUT", 10.0),
+            ai_worker=_getenv_bool("AI_WORKER", False),
+            ai_worker_socket=getenv("AI_WORKER_SOCKET") or ".inference.sock",
+            flood_backend=cast(
+                FloodBackend,
+                _getenv_choice(
+                    "FLOOD_BACKEND", ("memory", "snapshot", "sqlite"), "memory"
+                ),
+            ),
+            flood_snapshot_path=getenv("FLOOD_SNAPSHOT_PATH") or "flood_snapshot.json",
+            flood_db_path=getenv("FLOOD_DB_PATH") or "flood.db",
+            global_flood_messages=_getenv_int("GLOBAL_FLOOD_MESSAGES", 30),
+            global_flood_hits=_getenv_int("GLOBAL_FLOOD_HITS", 3),
+            global_flood_chats=_getenv_int("GLOBAL_FLOOD_CHATS", 2),
+            global_flood_window=_getenv_int("GLOBAL_FLOOD_WINDOW", 60, minimum=1),
+            # Telegram treats restrictions shorter than 30s as permanent.
+            global_flood_mute_time=_getenv_int(
+                "GLOBAL_FLOOD_MUTE_TIME", 3600, minimum=30
+            ),
+        )
     else:
         raise RuntimeError("BOT_TOKEN is not set")
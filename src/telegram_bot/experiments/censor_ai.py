@@ -1,58 +1,172 @@
 """
 Experimental toxicity detection using Hugging Face transformers.
 
-This module is not used in production because of resource and latency constraints,
-but is kept as a prototype for optional AI-based censorship features.
+The models run in a dedicated worker thread, so the event loop never waits for
+model loading or inference. Texts submitted within `max_wait` seconds of each
+other are classified together with one pipeline call per model.
+
+With `OnnxOptions` the models are exported once to ONNX with dynamic int8
+quantization, cached on disk and run with ONNX Runtime on the CPU
+(requires the `censor-ai-onnx` extra).
 """
 
+import asyncio
+import hashlib
 import logging
-from typing import TypedDict
+import platform
+import queue
+import sys
+import threading
+import time
+import unicodedata
+from dataclasses import dataclass
+from pathlib import Path
 
 from transformers import TextClassificationPipeline, pipeline
 from transformers.utils import logging as hf_logging
 
+from telegram_bot.experiments.toxicity import (
+    CLASSIFIER_LANGUAGES,
+    ToxicResult,
+    classify_chunks,
+    route_classifiers,
+)
 from telegram_bot.models.filters import AICensorshipConfig
+from telegram_bot.services.cache import CacheStats, TTLCache
 
 hf_logging.set_verbosity_error()
 logging.getLogger("torch").setLevel(logging.ERROR)
 
 
-class ToxicRecord(TypedDict):
-    label: str
-    score: float
+# Raw scores are cached per model, so chats with different thresholds share them.
+VERDICT_CACHE_SIZE = 100_000
+VERDICT_CACHE_TTL = 600.0
+VERDICT_CACHE_MAX_BYTES = 16 * 1024 * 1024
+# Rough memory taken by a cache key and the bookkeeping of an entry.
+VERDICT_ENTRY_OVERHEAD = 256
+
+MAX_BATCH_SIZE = 16
+# Seconds the worker waits for more texts after the first one of a batch.
+MAX_WAIT = 0.01
+# Seconds a check waits for the worker thread before giving up.
+REQUEST_TIMEOUT = 10.0
+
+
+RU_MODEL = "cointegrated/rubert-tiny-toxicity"
+EN_MODEL = "unitary/toxic-bert"
+MODELS = {"en": EN_MODEL, "ru": RU_MODEL}
+
+QUANTIZED_FILE_NAME = "model_quantized.onnx"
+
 
+@dataclass(frozen=True)
+class OnnxOptions:
+    """Settings of the quantized ONNX Runtime backend."""
 
-ToxicResult = list[ToxicRecord]
+    cache_dir: str = ".onnx_cache"
+    # 0 lets ONNX Runtime choose the number of threads.
+    intra_op_threads: int = 0
+    inter_op_threads: int = 0
 
 
-def _build_ru_classifier() -> TextClassificationPipeline:
+def _build_onnx_classifier(
+    model: str, options: OnnxOptions
+) -> TextClassificationPipeline:
+    """Create a classifier pipeline backed by an int8 quantized ONNX model.
+
+    The model is exported and quantized on first use and loaded from
+    `options.cache_dir` afterwards.
+    """
+    from onnxruntime import SessionOptions
+    from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from transformers import AutoTokenizer
+
+    model_dir = Path(options.cache_dir) / model.replace("/", "--")
+    if not (model_dir / QUANTIZED_FILE_NAME).exists():
+        logging.info(f"Exporting {model} to quantized ONNX in {model_dir}")
+        exported = ORTModelForSequenceClassification.from_pretrained(model, export=True)
+        exported.save_pretrained(model_dir)
+        AutoTokenizer.from_pretrained(model).save_pretrained(model_dir)
+
+        if platform.machine().lower() in ("arm64", "aarch64"):
+            qconfig = AutoQuantizationConfig.arm64(is_static=False, per_channel=False)
+        else:
+            qconfig = AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+        ORTQuantizer.from_pretrained(exported).quantize(
+            save_dir=model_dir, quantization_config=qconfig
+        )
+
+    session_options = SessionOptions()
+    session_options.intra_op_num_threads = options.intra_op_threads
+    session_options.inter_op_num_threads = options.inter_op_threads
+
+    quantized = ORTModelForSequenceClassification.from_pretrained(
+        model_dir,
+        file_name=QUANTIZED_FILE_NAME,
+        provider="CPUExecutionProvider",
+        session_options=session_options,
+    )
+    return pipeline(
+        "text-classification",
+        model=quantized,
+        tokenizer=AutoTokenizer.from_pretrained(model_dir),
+        device=-1,
+        truncation=True,
+    )
+
+
+def _build_ru_classifier(
+    onnx_options: OnnxOptions | None = None,
+) -> TextClassificationPipeline:
     """Create a Russian toxicity classifier pipeline."""
+    if onnx_options is not None:
+        return _build_onnx_classifier(RU_MODEL, onnx_options)
     return pipeline(
         "text-classification",
-        model="cointegrated/rubert-tiny-toxicity",
+        model=RU_MODEL,
         device=-1,
+        # Chunks are sized in words, a rare one may exceed the model's limit.
+        truncation=True,
     )
 
 
-def _build_en_classifier() -> TextClassificationPipeline:
+def _build_en_classifier(
+    onnx_options: OnnxOptions | None = None,
+) -> TextClassificationPipeline:
     """Create an English toxicity classifier pipeline."""
+    if onnx_options is not None:
+        return _build_onnx_classifier(EN_MODEL, onnx_options)
     return pipeline(
         "text-classification",
-        model="unitary/toxic-bert",
+        model=EN_MODEL,
         device=-1,
+        truncation=True,
+    )
+
+
+def _normalize_text(text: str) -> str:
+    """Fold case and whitespace variants of a text into one form."""
+    return " ".join(unicodedata.normalize("NFKC", text).casefold().split())
+
+
+def _text_digest(normalized: str) -> bytes:
+    return hashlib.blake2b(normalized.encode(), digest_size=16).digest()
+
+
+def _verdict_size(result: ToxicResult) -> int:
+    return VERDICT_ENTRY_OVERHEAD + sum(
+        sys.getsizeof(r) + sys.getsizeof(r["label"]) + sys.getsizeof(r["score"])
+        for r in result
     )
 
 
-TOXIC_LABELS = {
-    "toxic",
-    "insult",
-    "obscenity",
-    "threat",
-    "dangerous",
-    "severe_toxic",
-    "obscene",
-    "identity_hate",
-}
+@dataclass
+class _Request:
+    text: str
+    classifiers: tuple[str, ...]
+    future: "asyncio.Future[dict[str, ToxicResult]]"
+    loop: asyncio.AbstractEventLoop
 
 
 class ToxicityDetector:
@@ -60,50 +174,327 @@ class ToxicityDetector:
 
     This class owns the HF pipelines and exposes a single method to check whether
     a given text is likely toxic according to any of the underlying models.
+    The pipelines are loaded and called only from the worker thread.
     """
 
-    def __init__(self) -> None:
-        self.classifiers: list[TextClassificationPipeline] = []
+    def __init__(
+        self,
+        max_batch_size: int = MAX_BATCH_SIZE,
+        max_wait: float = MAX_WAIT,
+        onnx_options: OnnxOptions | None = None,
+        request_timeout: float = REQUEST_TIMEOUT,
+    ) -> None:
+        self.classifiers: dict[str, TextClassificationPipeline] = {}
         self.initialized = False
+        self.onnx_options = onnx_options
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.request_timeout = request_timeout
+        self.verdicts: TTLCache[tuple[str, bytes], ToxicResult] = TTLCache(
+            VERDICT_CACHE_SIZE,
+            VERDICT_CACHE_TTL,
+            max_bytes=VERDICT_CACHE_MAX_BYTES,
+            sizeof=_verdict_size,
+        )
+
+        # Verdicts being computed, so identical texts wait for the same one.
+        self._in_flight: dict[
+            tuple[str, bytes], asyncio.Future[ToxicResult | None]
+        ] = {}
+        self._requests: queue.SimpleQueue[_Request | None] = queue.SimpleQueue()
+        self._worker: threading.Thread | None = None
+        self._worker_lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self.initialized
+
+    def warm_up(self) -> None:
+        """Load the classifiers in the worker thread without waiting for them."""
+        self.start()
 
     def load_classifiers(self) -> None:
         """Synchronously load all classifiers if not loaded yet."""
+        started = time.perf_counter()
+        rss_before = _peak_rss_mb()
         try:
-            self.classifiers = [_build_en_classifier(), _build_ru_classifier()]
+            self.classifiers = {
+                "en": _build_en_classifier(self.onnx_options),
+                "ru": _build_ru_classifier(self.onnx_options),
+            }
             self.initialized = True
+            logging.info(
+                f"Toxicity classifiers loaded in "
+                f"{time.perf_counter() - started:.1f}s, peak RSS "
+                f"{rss_before:.0f} -> {_peak_rss_mb():.0f} MB"
+            )
         except Exception as e:
             logging.exception(f"Failed to load toxicity classifiers: {e}")
-            self.classifiers = []
+            self.classifiers = {}
             self.initialized = True
 
-    async def is_toxic(self, text: str, config: AICensorshipConfig) -> bool:
-        """Return True if any classifier considers the text toxic."""
+    def model_id(self, classifier: str) -> str:
+        """Identify the model behind a classifier, including its runtime."""
+        runtime = "onnx-int8" if self.onnx_options is not None else "torch"
+        return f"{MODELS[classifier]}@{runtime}"
+
+    def classify_batch(
+        self, texts: list[str], routes: list[tuple[str, ...]] | None = None
+    ) -> list[dict[str, ToxicResult]]:
+        """Classify texts with one pipeline call per model.
+
+        Each text is sent only to the classifiers named in its route
+        (all of them without routes). Return the results for each text.
+        """
         if not self.initialized:
             self.load_classifiers()
-        if not self.classifiers:
-            return False
 
-        results: list[ToxicResult] = []
-        for classifier in self.classifiers:
-            result_raw = classifier(text)
-            result: ToxicResult = [
-                {"label": r["label"], "score": float(r["score"])} for r in result_raw
+        results: list[dict[str, ToxicResult]] = [{} for _ in texts]
+        for name, classifier in self.classifiers.items():
+            indices = [
+                i for i in range(len(texts)) if routes is None or name in routes[i]
             ]
-            results.append(result)
-            logging.debug("Toxicity classifier result: %s", result)
+            if not indices:
+                continue
+
+            batch_raw = classifier([texts[i] for i in indices], batch_size=len(indices))
+            for i, r in zip(indices, batch_raw, strict=True):
+                result: ToxicResult = [
+                    {"label": r["label"], "score": float(r["score"])}
+                ]
+                results[i][name] = result
+                logging.debug("Toxicity classifier %s result: %s", name, result)
+
+        return results
 
-        return any(
-            any(
-                r["label"] in TOXIC_LABELS and r["score"] > config.threshold
-                for r in result
+    def start(self) -> None:
+        """Start the inference worker thread if it is not running."""
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name="toxicity-inference", daemon=True
+                )
+                self._worker.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stop the worker thread and fail the requests it did not take."""
+        with self._worker_lock:
+            worker, self._worker = self._worker, None
+        if worker is not None:
+            self._requests.put(None)
+            worker.join(timeout)
+
+        while True:
+            try:
+                request = self._requests.get_nowait()
+            except queue.Empty:
+                break
+            if request is not None:
+                request.loop.call_soon_threadsafe(
+                    _set_exception,
+                    request.future,
+                    RuntimeError("Toxicity detector stopped"),
+                )
+
+    def _run(self) -> None:
+        if not self.initialized:
+            self.load_classifiers()
+
+        stopping = False
+        while not stopping:
+            request = self._requests.get()
+            if request is None:
+                return
+
+            batch = [request]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    request = (
+                        self._requests.get(timeout=remaining)
+                        if remaining > 0
+                        else self._requests.get_nowait()
+                    )
+                except queue.Empty:
+                    break
+                if request is None:
+                    stopping = True
+                    break
+                batch.append(request)
+
+            self._process(batch)
+
+    def _process(self, batch: list[_Request]) -> None:
+        try:
+            results = self.classify_batch(
+                [r.text for r in batch], [r.classifiers for r in batch]
             )
-            for result in results
-        )
+        except Exception as e:
+            for r in batch:
+                r.loop.call_soon_threadsafe(_set_exception, r.future, e)
+            return
+
+        for r, result in zip(batch, results, strict=True):
+            r.loop.call_soon_threadsafe(_set_result, r.future, result)
+
+    async def classify(
+        self, text: str, classifiers: tuple[str, ...] = tuple(CLASSIFIER_LANGUAGES)
+    ) -> dict[str, ToxicResult]:
+        """Return the raw results of the given classifiers for the text.
+
+        The classifiers see the text normalized the same way as the cache key,
+        so case and whitespace variants always get the same verdict. Cached
+        verdicts are reused, verdicts already being computed for an identical
+        text are awaited, and the remaining classifiers are queued for the
+        worker thread. Raise asyncio.TimeoutError if it does not answer
+        within `request_timeout`.
+        """
+        normalized = _normalize_text(text)
+        digest = _text_digest(normalized)
+        results: dict[str, ToxicResult] = {}
+        pending: dict[str, asyncio.Future[ToxicResult | None]] = {}
+        keys = {name: (self.model_id(name), digest) for name in classifiers}
+        for name, key in keys.items():
+            cached = self.verdicts.get(key)
+            if cached is not None:
+                results[name] = cached
+            elif (in_flight := self._in_flight.get(key)) is not None:
+                pending[name] = in_flight
+
+        missing = {
+            name: key
+            for name, key in keys.items()
+            if name not in results and name not in pending
+        }
+        if missing:
+            results.update(await self._classify_missing(normalized, missing))
+
+        for name, in_flight in pending.items():
+            # Shielded, so one caller's timeout does not cancel it for the others.
+            result = await asyncio.wait_for(
+                asyncio.shield(in_flight), timeout=self.request_timeout
+            )
+            if result is not None:
+                results[name] = result
+
+        return results
+
+    async def _classify_missing(
+        self, text: str, missing: dict[str, tuple[str, bytes]]
+    ) -> dict[str, ToxicResult]:
+        """Queue the text for the worker thread and publish the in-flight verdicts."""
+        loop = asyncio.get_running_loop()
+        shared: dict[str, asyncio.Future[ToxicResult | None]] = {}
+        for name, key in missing.items():
+            shared[name] = self._in_flight[key] = loop.create_future()
+
+        try:
+            self.start()
+            future: asyncio.Future[dict[str, ToxicResult]] = loop.create_future()
+            self._requests.put(_Request(text, tuple(missing), future, loop))
+            batch = await asyncio.wait_for(future, timeout=self.request_timeout)
+
+            for name, in_flight in shared.items():
+                # None for classifiers that are not loaded.
+                in_flight.set_result(batch.get(name))
+                if name in batch:
+                    self.verdicts.set(missing[name], batch[name])
+            return batch
+        except Exception as e:
+            for in_flight in shared.values():
+                _fail_in_flight(in_flight, e)
+            raise
+        finally:
+            for name, key in missing.items():
+                self._in_flight.pop(key, None)
+                # The caller that queued the text was cancelled.
+                _fail_in_flight(shared[name], RuntimeError("Toxicity check cancelled"))
+
+    async def is_toxic(
+        self,
+        text: str,
+        config: AICensorshipConfig,
+        languages: list[str] | None = None,
+    ) -> bool:
+        """Return True if any classifier routed for the text considers it toxic.
+
+        Long texts are checked chunk by chunk, see `classify_chunks`.
+        """
+        classifiers = route_classifiers(text, languages)
+        if not classifiers:
+            return False
+
+        return await classify_chunks(text, classifiers, self.classify, config)
+
+
+def _peak_rss_mb() -> float:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0.0
+
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere.
+    return usage / (1024 * 1024) if sys.platform == "darwin" else usage / 1024
+
+
+def _set_result(
+    future: "asyncio.Future[dict[str, ToxicResult]]", result: dict[str, ToxicResult]
+) -> None:
+    # The caller may have stopped waiting, e.g. on a timeout.
+    if not future.done():
+        future.set_result(result)
+
+
+def _set_exception(
+    future: "asyncio.Future[dict[str, ToxicResult]]", exc: Exception
+) -> None:
+    if not future.done():
+        future.set_exception(exc)
+
+
+def _fail_in_flight(
+    future: "asyncio.Future[ToxicResult | None]", exc: Exception
+) -> None:
+    if not future.done():
+        future.set_exception(exc)
+        # Marks it retrieved, callers waiting on it still get the exception.
+        future.exception()
 
 
 _detector = ToxicityDetector()
 
 
-async def is_toxic(text: str, config: AICensorshipConfig) -> bool:
+def configure_detector(
+    onnx_options: OnnxOptions | None = None, request_timeout: float = REQUEST_TIMEOUT
+) -> None:
+    """Replace the shared detector, e.g. to switch to the ONNX backend."""
+    global _detector
+    _detector.stop()
+    _detector = ToxicityDetector(
+        onnx_options=onnx_options, request_timeout=request_timeout
+    )
+
+
+def warm_up() -> None:
+    """Start loading the shared detector's models in the background."""
+    _detector.warm_up()
+
+
+def models_ready() -> bool:
+    """Return True once the models are loaded, starting to load them if needed."""
+    _detector.warm_up()
+    return _detector.ready
+
+
+def get_verdict_cache_stats() -> CacheStats:
+    """Return hit/miss statistics of the shared detector's verdict cache."""
+    return _detector.verdicts.stats
+
+
+async def is_toxic(
+    text: str, config: AICensorshipConfig, languages: list[str] | None = None
+) -> bool:
     """Compatibility wrapper around ToxicityDetector.is_toxic."""
-    return await _detector.is_toxic(text, config)
+    return await _detector.is_toxic(text, config, languages)
@@ -0,0 +1,336 @@
+"""Run toxicity inference in a separate, supervised worker process.
+
+Torch and the transformer models add gigabytes to the memory of the process
+that loads them. With `RemoteToxicityDetector`, the bot starts this module as
+a child process and talks to it over a Unix socket, using one JSON object per
+line:
+
+    request:  {"id": 1, "text": "...", "classifiers": ["en"]}
+    response: {"id": 1, "results": {"en": [{"label": "...", "score": 0.9}]}}
+              {"id": 1, "error": "..."}
+
+The worker answers with raw scores and the bot applies the chat threshold.
+If the worker dies or the connection to it is lost, the worker is restarted
+with exponential backoff. Meanwhile the models are reported as not ready,
+and checks that were in flight raise ConnectionError, which
+AICensorshipFilter reports as FAILED.
+
+Run manually with:
+    python -m telegram_bot.experiments.inference_worker --socket PATH
+"""
+
+import argparse
+import asyncio
+import contextlib
+import itertools
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Any
+
+from telegram_bot.experiments.toxicity import (
+    ToxicResult,
+    classify_chunks,
+    route_classifiers,
+)
+from telegram_bot.models.filters import AICensorshipConfig
+
+WORKER_SOCKET = ".inference.sock"
+REQUEST_TIMEOUT = 10.0
+RESTART_DELAY = 1.0
+MAX_RESTART_DELAY = 60.0
+# Messages are at most 4096 characters, escaped JSON stays well below this.
+MAX_LINE_SIZE = 1024 * 1024
+# Seconds between checks whether the bot process that started the worker is gone.
+PARENT_CHECK_INTERVAL = 5.0
+
+
+class RemoteToxicityDetector:
+    """Client side of the inference worker with the ToxicityDetector interface.
+
+    `warm_up` starts the worker process and keeps it running. `ready` is True
+    while connected to the worker, which only listens once its models are
+    loaded.
+    """
+
+    def __init__(
+        self,
+        socket_path: str = WORKER_SOCKET,
+        worker_args: list[str] | None = None,
+        request_timeout: float = REQUEST_TIMEOUT,
+        restart_delay: float = RESTART_DELAY,
+        max_restart_delay: float = MAX_RESTART_DELAY,
+    ) -> None:
+        self.socket_path = socket_path
+        self.worker_args = worker_args or []
+        self.request_timeout = request_timeout
+        self.restart_delay = restart_delay
+        self.max_restart_delay = max_restart_delay
+
+        self.ready = False
+        self.restarts = 0
+
+        self._ids = itertools.count()
+        self._pending: dict[int, asyncio.Future[dict[str, ToxicResult]]] = {}
+        self._writer: asyncio.StreamWriter | None = None
+        self._process: asyncio.subprocess.Process | None = None
+        self._supervisor: asyncio.Task[None] | None = None
+        self._reader_task: asyncio.Task[None] | None = None
+
+    @property
+    def connected(self) -> bool:
+        return self._writer is not None
+
+    def models_ready(self) -> bool:
+        """Return True once the worker is up, starting it if needed."""
+        self.warm_up()
+        return self.ready
+
+    def warm_up(self) -> None:
+        """Start the worker process and keep restarting it when it stops."""
+        if self._supervisor is None:
+            self._supervisor = asyncio.create_task(self._supervise())
+
+    async def stop(self) -> None:
+        """Stop supervising and terminate the worker process."""
+        if self._supervisor is not None:
+            self._supervisor.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._supervisor
+            self._supervisor = None
+
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._reader_task
+            self._reader_task = None
+        self._disconnect()
+
+    async def _supervise(self) -> None:
+        delay = self.restart_delay
+        while True:
+            process = await self._spawn()
+            self._process = process
+            try:
+                if await self._connect(process):
+                    delay = self.restart_delay
+                    await self._wait_for_exit_or_disconnect(process)
+                else:
+                    await process.wait()
+            finally:
+                self._disconnect()
+                if process.returncode is None:
+                    process.terminate()
+                    await process.wait()
+
+            logging.warning(
+                f"Inference worker exited with code {process.returncode}, "
+                f"restarting in {delay:.0f}s"
+            )
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_restart_delay)
+            self.restarts += 1
+
+    async def _wait_for_exit_or_disconnect(
+        self, process: asyncio.subprocess.Process
+    ) -> None:
+        """Wait until the worker exits or its connection is lost.
+
+        A worker that keeps running without a connection is terminated by the
+        caller, so it is restarted and connected to again.
+        """
+        exited = asyncio.ensure_future(process.wait())
+        waiters: set[asyncio.Future[Any]] = {exited}
+        if self._reader_task is not None:
+            waiters.add(self._reader_task)
+        try:
+            await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            exited.cancel()
+
+    async def _spawn(self) -> asyncio.subprocess.Process:
+        spawn = asyncio.ensure_future(
+            asyncio.create_subprocess_exec(
+                sys.executable,
+                "-m",
+                __name__,
+                "--socket",
+                self.socket_path,
+                "--parent-pid",
+                str(os.getpid()),
+                *self.worker_args,
+            )
+        )
+        try:
+            return await asyncio.shield(spawn)
+        except asyncio.CancelledError:
+            # stop() landed while the child was being created, do not leave it behind.
+            process = await spawn
+            process.terminate()
+            await process.wait()
+            raise
+
+    async def _connect(self, process: asyncio.subprocess.Process) -> bool:
+        """Wait until the worker listens on its socket, return False if it exits."""
+        while process.returncode is None:
+            try:
+                reader, writer = await asyncio.open_unix_connection(
+                    self.socket_path, limit=MAX_LINE_SIZE
+                )
+            except (FileNotFoundError, ConnectionRefusedError):
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(process.wait(), timeout=0.5)
+                continue
+
+            self._attach(reader, writer)
+            logging.info(f"Connected to inference worker (pid {process.pid})")
+            return True
+        return False
+
+    def _attach(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self._writer = writer
+        self.ready = True
+        self._reader_task = asyncio.create_task(self._read_responses(reader, writer))
+
+    async def _read_responses(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while line := await reader.readline():
+                try:
+                    response = json.loads(line)
+                    future = self._pending.get(response["id"])
+                except (ValueError, KeyError, TypeError):
+                    logging.warning(f"Malformed inference worker response: {line!r}")
+                    continue
+
+                if future is None or future.done():
+                    continue
+                if "error" in response:
+                    future.set_exception(RuntimeError(response["error"]))
+                elif "results" in response:
+                    future.set_result(response["results"])
+                else:
+                    future.set_exception(
+                        RuntimeError("Inference worker response has no results")
+                    )
+        except (ConnectionError, ValueError):
+            logging.exception("Lost connection to inference worker")
+        finally:
+            if self._writer is writer:
+                self._disconnect()
+
+    def _disconnect(self) -> None:
+        self.ready = False
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("Inference worker stopped"))
+        self._pending.clear()
+
+    async def classify(
+        self, text: str, classifiers: tuple[str, ...]
+    ) -> dict[str, ToxicResult]:
+        """Send a text to the worker and wait for the raw classifier results."""
+        if self._writer is None:
+            raise ConnectionError("Inference worker is not running")
+
+        request_id = next(self._ids)
+        future: asyncio.Future[dict[str, ToxicResult]] = (
+            asyncio.get_running_loop().create_future()
+        )
+        self._pending[request_id] = future
+        try:
+            request = {"id": request_id, "text": text, "classifiers": classifiers}
+            self._writer.write(json.dumps(request).encode() + b"\n")
+            return await asyncio.wait_for(future, timeout=self.request_timeout)
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def is_toxic(
+        self,
+        text: str,
+        config: AICensorshipConfig,
+        languages: list[str] | None = None,
+    ) -> bool:
+        """Return True if any classifier routed for the text considers it toxic."""
+        classifiers = route_classifiers(text, languages)
+        if not classifiers:
+            return False
+
+        return await classify_chunks(text, classifiers, self.classify, config)
+
+
+async def serve(args: argparse.Namespace) -> None:
+    """Load the models, then answer classification requests on the socket."""
+    from telegram_bot.experiments.censor_ai import OnnxOptions, ToxicityDetector
+
+    onnx_options = (
+        OnnxOptions(args.onnx_cache_dir, args.intra_op_threads, args.inter_op_threads)
+        if args.backend == "onnx"
+        else None
+    )
+    detector = ToxicityDetector(onnx_options=onnx_options)
+    detector.load_classifiers()
+    detector.start()
+
+    async def handle(
+        reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        tasks: set[asyncio.Task[None]] = set()
+
+        async def respond(request: dict[str, Any]) -> None:
+            try:
+                results = await detector.classify(
+                    request["text"], tuple(request["classifiers"])
+                )
+                response = {"id": request["id"], "results": results}
+            except Exception as e:
+                response = {"id": request["id"], "error": str(e)}
+            writer.write(json.dumps(response).encode() + b"\n")
+
+        while line := await reader.readline():
+            task = asyncio.create_task(respond(json.loads(line)))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        writer.close()
+
+    server = await asyncio.start_unix_server(
+        handle, path=args.socket, limit=MAX_LINE_SIZE
+    )
+    logging.info(f"Inference worker listening on {args.socket}")
+
+    try:
+        async with server:
+            while args.parent_pid is None or os.getppid() == args.parent_pid:
+                await asyncio.sleep(PARENT_CHECK_INTERVAL)
+            logging.info("Bot process is gone, stopping inference worker")
+    finally:
+        detector.stop()
+        Path(args.socket).unlink(missing_ok=True)
+
+
+def run() -> None:
+    parser = argparse.ArgumentParser(description="Toxicity inference worker")
+    parser.add_argument("--socket", default=WORKER_SOCKET)
+    parser.add_argument("--parent-pid", type=int, default=None)
+    parser.add_argument("--backend", choices=("torch", "onnx"), default="torch")
+    parser.add_argument("--onnx-cache-dir", default=".onnx_cache")
+    parser.add_argument("--intra-op-threads", type=int, default=0)
+    parser.add_argument("--inter-op-threads", type=int, default=0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, stream=sys.stdout)
+    asyncio.run(serve(args))
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,136 @@
+"""Dependency-free parts of toxicity detection.
+
+Routing, chunking and result interpretation live here so that processes which
+only talk to a remote inference worker do not need to import transformers.
+"""
+
+import asyncio
+import re
+from collections.abc import Awaitable, Callable, Iterable
+from typing import TypedDict
+
+from telegram_bot.models.filters import AICensorshipConfig
+
+
+class ToxicRecord(TypedDict):
+    label: str
+    score: float
+
+
+ToxicResult = list[ToxicRecord]
+Classify = Callable[[str, tuple[str, ...]], Awaitable[dict[str, ToxicResult]]]
+
+# Chat languages each classifier is trained for, and the script it reads.
+CLASSIFIER_LANGUAGES = {"en": ("en",), "ru": ("ru", "ua")}
+CLASSIFIER_SCRIPTS = {"en": "latin", "ru": "cyrillic"}
+# Share of letters a script needs to count as present in a text.
+MIN_SCRIPT_SHARE = 0.2
+
+# Chunks of a long text classified together before checking for a toxic one.
+CHUNK_WAVE = 4
+
+_TOKEN_RE = re.compile(r"\S+")
+
+TOXIC_LABELS = {
+    "toxic",
+    "insult",
+    "obscenity",
+    "threat",
+    "dangerous",
+    "severe_toxic",
+    "obscene",
+    "identity_hate",
+}
+
+
+def detect_scripts(text: str) -> set[str]:
+    """Return the scripts ("latin", "cyrillic") with a notable share of letters."""
+    latin = cyrillic = 0
+    for ch in text:
+        if "a" <= ch <= "z" or "A" <= ch <= "Z" or "\u00c0" <= ch <= "\u024f":
+            latin += 1
+        elif "\u0400" <= ch <= "\u04ff":
+            cyrillic += 1
+
+    total = latin + cyrillic
+    scripts: set[str] = set()
+    if total:
+        if latin / total >= MIN_SCRIPT_SHARE:
+            scripts.add("latin")
+        if cyrillic / total >= MIN_SCRIPT_SHARE:
+            scripts.add("cyrillic")
+    return scripts
+
+
+def route_classifiers(text: str, languages: list[str] | None = None) -> tuple[str, ...]:
+    """Choose the classifiers that should check the text.
+
+    Only classifiers for the chat languages are considered. Among them, those
+    reading a script found in the text are chosen, mixed-script text goes to
+    several. If none matches (no letters, or a script the chat does not use),
+    every allowed classifier checks the text.
+    """
+    allowed = [
+        name
+        for name, langs in CLASSIFIER_LANGUAGES.items()
+        if languages is None or any(lang in languages for lang in langs)
+    ]
+    scripts = detect_scripts(text)
+    routed = [name for name in allowed if CLASSIFIER_SCRIPTS[name] in scripts]
+    return tuple(routed or allowed)
+
+
+def has_toxic_label(results: Iterable[ToxicResult], threshold: float) -> bool:
+    """Return True if any classifier result has a toxic label above threshold."""
+    return any(
+        any(r["label"] in TOXIC_LABELS and r["score"] > threshold for r in result)
+        for result in results
+    )
+
+
+def split_chunks(
+    text: str, chunk_tokens: int, overlap: int, max_tokens: int
+) -> list[str]:
+    """Split a long text into overlapping windows of whitespace-separated tokens.
+
+    Texts of at most `chunk_tokens` tokens are returned as they are. If the
+    windows hold more than `max_tokens` tokens, an evenly spread subset of
+    them is kept, always with the first and the last window. The last window
+    comes second, so toxic content at the end is found early too.
+    """
+    spans = [m.span() for m in _TOKEN_RE.finditer(text)]
+    if len(spans) <= chunk_tokens:
+        return [text]
+
+    last = len(spans) - chunk_tokens
+    starts = [*range(0, last, chunk_tokens - overlap), last]
+
+    limit = max(2, max_tokens // chunk_tokens)
+    if len(starts) > limit:
+        step = (len(starts) - 1) / (limit - 1)
+        starts = [starts[round(i * step)] for i in range(limit)]
+
+    order = [starts[0], starts[-1], *starts[1:-1]]
+    return [text[spans[s][0] : spans[s + chunk_tokens - 1][1]] for s in order]
+
+
+async def classify_chunks(
+    text: str,
+    classifiers: tuple[str, ...],
+    classify: Classify,
+    config: AICensorshipConfig,
+) -> bool:
+    """Return True as soon as a chunk of the text is toxic for any classifier.
+
+    Chunks are sent `CHUNK_WAVE` at a time, so they share a model batch and
+    the remaining ones are skipped once a toxic chunk is found.
+    """
+    chunks = split_chunks(
+        text, config.chunk_tokens, config.chunk_overlap, config.max_tokens
+    )
+    for i in range(0, len(chunks), CHUNK_WAVE):
+        wave = chunks[i : i + CHUNK_WAVE]
+        results = await asyncio.gather(*(classify(c, classifiers) for c in wave))
+        if any(has_toxic_label(r.values(), config.threshold) for r in results):
+            return True
+    return False
@@ -6,6 +6,8 @@ from aiogram.types import ChatMemberUpdated
 from telegram_bot.models.user import UserDTO
 from telegram_bot.services.db.chat_service import add_chat
 from telegram_bot.services.db.users_service import register_user
+from telegram_bot.services.telegram.admins import seed_chat_admins
+from telegram_bot.services.telegram.bot_self import bot_self
 
 router = Router()
 
@@ -13,6 +15,8 @@ router = Router()
 @router.my_chat_member()
 async def bot_added(update: ChatMemberUpdated):
     """Register the chat and its administrators in the system."""
+    bot_self.apply_update(update)
+
     old_status = update.old_chat_member.status
     new_status = update.new_chat_member.status
 
@@ -21,6 +25,7 @@ async def bot_added(update: ChatMemberUpdated):
         logging.info(f"Bot added to chat: {chat.title} ({chat.id})")
         await add_chat(chat.id, chat.title, chat.type)
         admins = await chat.get_administrators()
+        seed_chat_admins(chat.id, admins)
         for admin in admins:
             user = admin.user
             await register_user(
@@ -0,0 +1,12 @@
+from aiogram import Router
+from aiogram.types import ChatMemberUpdated
+
+from telegram_bot.services.telegram.admins import apply_chat_member_update
+
+router = Router()
+
+
+@router.chat_member()
+async def chat_member_updated(update: ChatMemberUpdated):
+    """Keep the cached administrator roster in sync with membership changes."""
+    apply_chat_member_update(update)
@@ -0,0 +1,5 @@
+from .moderation_context import ModerationContextMiddleware
+
+__all__ = [
+    "ModerationContextMiddleware",
+]
@@ -0,0 +1,50 @@
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from aiogram import BaseMiddleware
+from aiogram.types import CallbackQuery, Message, TelegramObject
+
+from telegram_bot.services.telegram.moderation_context import (
+    ModerationContext,
+    reset_moderation_context,
+    set_moderation_context,
+)
+
+
+class ModerationContextMiddleware(BaseMiddleware):
+    """Create one ModerationContext per message or callback query.
+
+    The context is passed to handlers as `moderation` and made current for
+    the guards and services that run on behalf of the update.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        context = _build_context(event)
+        if context is None:
+            return await handler(event, data)
+
+        data["moderation"] = context
+        token = set_moderation_context(context)
+        try:
+            return await handler(event, data)
+        finally:
+            reset_moderation_context(token)
+
+
+def _build_context(event: TelegramObject) -> ModerationContext | None:
+    if isinstance(event, Message):
+        message = event
+    elif isinstance(event, CallbackQuery) and isinstance(event.message, Message):
+        message = event.message
+    else:
+        return None
+
+    user = event.from_user
+    return ModerationContext(
+        message.bot, message.chat.id, user.id if user is not None else None
+    )
@@ -13,6 +13,7 @@ from telegram_bot.services.db.chat_settings_service import (
     set_chat_ai_censorship,
     set_chat_antispam,
     set_chat_censorship,
+    set_chat_raid_protection,
 )
 from telegram_bot.services.telegram.filters_summary import build_filters_summary
 
@@ -123,3 +124,33 @@ async def handle_antispam_off(message: Message):
 async def antispam_off_command_handler(message: Message):
     """Aiogram entrypoint for /antispam_off."""
     await handle_antispam_off(message)
+
+
+async def handle_raid_on(message: Message):
+    """Handle /raid_on: enable join raid protection in the chat."""
+    lang = await get_chat_language(message.chat.id)
+    await set_chat_raid_protection(message.chat.id, True)
+    await message.reply(t("moderation.modes.raid.on", lang))
+
+
+@router.message(Command("raid_on"))
+@group_only
+@user_is_admin_message
+async def raid_on_command_handler(message: Message):
+    """Aiogram entrypoint for /raid_on."""
+    await handle_raid_on(message)
+
+
+async def handle_raid_off(message: Message):
+    """Handle /raid_off: disable join raid protection in the chat."""
+    lang = await get_chat_language(message.chat.id)
+    await set_chat_raid_protection(message.chat.id, False)
+    await message.reply(t("moderation.modes.raid.off", lang))
+
+
+@router.message(Command("raid_off"))
+@group_only
+@user_is_admin_message
+async def raid_off_command_handler(message: Message):
+    """Aiogram entrypoint for /raid_off."""
+    await handle_raid_off(message)
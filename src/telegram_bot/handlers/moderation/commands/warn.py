@@ -18,6 +18,7 @@ from telegram_bot.services.db.warns_service import (
     get_user_warnings,
     reset_user_warnings,
 )
+from telegram_bot.services.telegram.bot_self import bot_self
 from telegram_bot.services.telegram.display import get_display_name
 from telegram_bot.services.telegram.message_links import get_message_link
 from telegram_bot.services.telegram.processor import process_action
@@ -51,7 +52,7 @@ async def ban_user_and_send_message(
         )
         await bot.ban_chat_member(chat_id=chat_id, user_id=target_user.id)
 
-        me = await bot.get_me()
+        me = await bot_self.get_user(bot)
         await message.reply(
             t(
                 "moderation.ban.success",
@@ -64,7 +65,7 @@ async def ban_user_and_send_message(
         await reset_user_warnings(chat_id, target_user.id)
     except Exception as e:
         if me is None:
-            me = await bot.get_me()
+            me = await bot_self.get_user(bot)
         log_status = ActionStatus.ERROR
         log_details = str(e)
         await message.reply(t("moderation.ban.error", lang, e=str(e)))
@@ -1,7 +1,9 @@
+import asyncio
 import logging
+from dataclasses import dataclass
 
 from aiogram import Bot, Router
-from aiogram.types import ChatMemberAdministrator, ChatMemberOwner, Message, User
+from aiogram.types import Message, User
 
 from telegram_bot.handlers.moderation.commands.mute import mute_user
 from telegram_bot.handlers.moderation.filters import (
@@ -15,30 +17,49 @@ from telegram_bot.handlers.moderation.filters import (
     MessageContext,
     UserMentionsFilter,
 )
+from telegram_bot.handlers.moderation.filters.activity import GlobalActivityIndex
+from telegram_bot.handlers.moderation.filters.base import FilterError, FilterStatus
+from telegram_bot.handlers.moderation.filters.executor import run_filter
 from telegram_bot.handlers.moderation.guards import (
     group_only,
     require_echo_context,
 )
+from telegram_bot.handlers.moderation.raid import handle_join_raid
 from telegram_bot.i18n import t
 from telegram_bot.models.filters import (
     AICensorshipConfig,
     CensorshipConfig,
     FloodConfig,
+    RaidConfig,
     SpamConfig,
 )
 from telegram_bot.models.user import UserDTO
-from telegram_bot.services.db.blacklist_service import get_blacklist_words
-from telegram_bot.services.db.chat_settings_service import (
-    get_chat_filters,
-    get_chat_language,
-)
-from telegram_bot.services.db.users_service import register_user
+from telegram_bot.services.db.blacklist_service import get_compiled_blacklist
+from telegram_bot.services.db.users_service import register_user, register_users
+from telegram_bot.services.telegram.admins import is_chat_admin
+from telegram_bot.services.telegram.bot_self import bot_self
 from telegram_bot.services.telegram.display import get_display_name
-from telegram_bot.services.telegram.resolve_targets import fetch_member
+from telegram_bot.services.telegram.moderation_context import get_moderation_context
 
 router = Router()
 
 flood_filter = FloodFilter()
+activity_index = GlobalActivityIndex()
+
+GLOBAL_FLOOD_REASON = "global_flood"
+
+
+@dataclass
+class CensorshipStageStats:
+    """How many messages reached each stage of the censorship cascade."""
+
+    checked: int = 0
+    blacklist_hits: int = 0
+    ai_checked: int = 0
+    ai_hits: int = 0
+
+
+censorship_stats = CensorshipStageStats()
 
 
 @group_only
@@ -54,10 +75,11 @@ async def echo_handler(message: Message) -> None:
 
     bot, user = require_echo_context(message)
 
-    lang = await get_chat_language(chat_id)
-    filter_configs = await get_chat_filters(chat_id)
+    moderation = get_moderation_context(bot, chat_id, user.id)
+    lang = await moderation.language()
+    filter_configs = await moderation.filters()
 
-    if await handle_new_chat_members(message, chat_id):
+    if await handle_new_chat_members(message, bot, chat_id, lang, filter_configs.raid):
         return
 
     await handle_user_registration(chat_id, user)
@@ -77,25 +99,58 @@ async def echo_handler(message: Message) -> None:
     if await handle_censorship(
         message, bot, chat_id, lang, message_context, filter_configs.censorship
     ):
+        activity_index.record_hit(chat_id, user.id)
         return
 
-    await handle_antispam(message, bot, lang, message_context, filter_configs.spam)
+    if await handle_antispam(message, bot, lang, message_context, filter_configs.spam):
+        activity_index.record_hit(chat_id, user.id)
 
 
-async def handle_new_chat_members(message: Message, chat_id: int) -> bool:
-    """Register each newly joined user in the database."""
-    if message.new_chat_members:
-        for user in message.new_chat_members:
-            await register_user(
-                UserDTO(
-                    id=user.id,
-                    full_name=user.full_name,
-                    username=user.username,
-                )
-            )
-            logging.info(f"New user in group: {get_display_name(user)} ({user.id})")
+async def handle_new_chat_members(
+    message: Message, bot: Bot, chat_id: int, lang: str, config: RaidConfig
+) -> bool:
+    """Register newly joined users, or hand them to raid handling during a raid.
+
+    Admins, and members added by an admin, are never handed to raid handling.
+    """
+    if not message.new_chat_members:
+        return False
+
+    users = message.new_chat_members
+    for user in users:
+        logging.info(f"New user in group: {get_display_name(user)} ({user.id})")
+
+    if config.enabled:
+        suspects = await _get_raid_suspects(message, bot, chat_id, users)
+        if suspects and await handle_join_raid(bot, chat_id, lang, suspects, config):
+            suspect_ids = {user.id for user in suspects}
+            users = [user for user in users if user.id not in suspect_ids]
+
+    if not users:
         return True
-    return False
+
+    await register_users(
+        [
+            UserDTO(id=user.id, full_name=user.full_name, username=user.username)
+            for user in users
+        ]
+    )
+    return True
+
+
+async def _get_raid_suspects(
+    message: Message, bot: Bot, chat_id: int, users: list[User]
+) -> list[User]:
+    """Return the joined users that raid handling may restrict."""
+    adder = message.from_user
+    if (
+        adder is not None
+        and all(user.id != adder.id for user in users)
+        and await is_chat_admin(bot, chat_id, adder.id)
+    ):
+        return []
+
+    return [user for user in users if not await is_chat_admin(bot, chat_id, user.id)]
 
 
 async def handle_user_registration(chat_id: int, user: User) -> None:
@@ -120,14 +175,12 @@ async def _mute_user_and_send_message(
     Skip administrators, perform the mute, and report the action to the chat.
     """
     try:
-        target_member = await fetch_member(bot, chat_id, str(target_user.id))
-
-        if isinstance(target_member, (ChatMemberAdministrator, ChatMemberOwner)):
+        if await is_chat_admin(bot, chat_id, target_user.id):
             return False
 
         await mute_user(bot, chat_id, target_user.id, mute_time)
 
-        me = await bot.get_me()
+        me = await bot_self.get_user(bot)
         await message.reply(
             t(
                 "moderation.mute.success",
@@ -154,15 +207,30 @@ async def handle_antiflood(
     """Check whether the user has exceeded the allowed message rate in the chat.
 
     If flood is detected, apply a temporary mute and notify the chat about the
-    moderation action.
+    moderation action. A user who floods several chats at once is muted for
+    the longer global mute time as soon as they post in any of them.
     """
+    activity_index.record_message(chat_id, user.id)
+
     if not config.enabled:
         return False
 
+    if activity_index.is_flooding(user.id):
+        return await _mute_user_and_send_message(
+            message,
+            bot,
+            chat_id,
+            lang,
+            user,
+            activity_index.config.mute_time,
+            GLOBAL_FLOOD_REASON,
+        )
+
     ctx = MessageContext(chat_id=chat_id, user_id=user.id, text=message.text or "")
-    flood_result = flood_filter.check(ctx, config)
+    flood_result = await flood_filter.check(ctx, config)
 
     if flood_result.triggered:
+        activity_index.record_hit(chat_id, user.id)
         return await _mute_user_and_send_message(
             message, bot, chat_id, lang, user, config.mute_time, flood_result.reason
         )
@@ -173,17 +241,57 @@ async def handle_antiflood(
 async def _check_blacklist(
     chat_id: int, ctx: MessageContext, config: CensorshipConfig
 ) -> FilterResult:
-    blacklist = await get_blacklist_words(chat_id)
-    return CensorshipFilter.check(ctx, blacklist, config)
+    blacklist = await get_compiled_blacklist(chat_id, config)
+    try:
+        return await run_filter(
+            ctx.text, CensorshipFilter.check, ctx, blacklist, config
+        )
+    except asyncio.TimeoutError:
+        logging.warning(f"Blacklist check timed out in chat {chat_id}")
+        return FilterResult(
+            triggered=False,
+            reason="",
+            status=FilterStatus.FAILED,
+            error=FilterError(
+                code="blacklist_timeout", message="Blacklist check timed out"
+            ),
+        )
 
 
-async def _check_ai(ctx: MessageContext, config: AICensorshipConfig) -> FilterResult:
+async def _check_ai(
+    ctx: MessageContext, config: AICensorshipConfig, languages: list[str]
+) -> FilterResult:
     if config.enabled:
-        return await AICensorshipFilter.check(ctx, config)
+        return await AICensorshipFilter.check(ctx, config, languages)
 
     return FilterResult(triggered=False, reason="")
 
 
+async def _run_censorship_cascade(
+    chat_id: int, ctx: MessageContext, config: CensorshipConfig
+) -> FilterResult:
+    """Check the blacklist first and ask AI only about messages it let through.
+
+    Blacklist hits are removed without AI. A miss says nothing about toxicity
+    in words unlike the blacklist, so every miss still goes to AI.
+    """
+    censorship_stats.checked += 1
+
+    blacklist_result = await _check_blacklist(chat_id, ctx, config)
+    if blacklist_result.triggered:
+        censorship_stats.blacklist_hits += 1
+        return blacklist_result
+
+    if not config.ai.enabled:
+        return blacklist_result
+
+    censorship_stats.ai_checked += 1
+    ai_result = await _check_ai(ctx, config.ai, config.languages)
+    if ai_result.triggered:
+        censorship_stats.ai_hits += 1
+    return ai_result
+
+
 async def handle_censorship(
     message: Message,
     bot: Bot,
@@ -201,11 +309,10 @@ async def handle_censorship(
         return False
 
     try:
-        blacklist_result = await _check_blacklist(chat_id, ctx, config)
-        ai_result = await _check_ai(ctx, config.ai)
+        result = await _run_censorship_cascade(chat_id, ctx, config)
 
-        if blacklist_result.triggered or ai_result.triggered:
-            reason = blacklist_result.reason or ai_result.reason
+        if result.triggered:
+            reason = result.reason
             try:
                 await message.delete()
             except Exception as e:
@@ -240,11 +347,12 @@ async def handle_antispam(
     lang: str,
     ctx: MessageContext,
     config: SpamConfig,
-) -> None:
+) -> bool:
     """Run anti-spam filters for a message, delete it if any filter is triggered.
 
     Determine the primary reason for triggering
-    and notify the user when their message is removed.
+    and notify the user when their message is removed. Return True if a
+    filter was triggered.
     """
     if not any(
         (
@@ -254,14 +362,18 @@ async def handle_antispam(
             config.gibberish.enabled,
         )
     ):
-        return
+        return False
 
-    (
-        link_result,
-        caps_result,
-        user_mentions_result,
-        gibberish_result,
-    ) = _run_spam_filters(ctx, config)
+    try:
+        (
+            link_result,
+            caps_result,
+            user_mentions_result,
+            gibberish_result,
+        ) = await run_filter(ctx.text, _run_spam_filters, ctx, config)
+    except asyncio.TimeoutError:
+        logging.warning(f"Spam filters timed out in chat {ctx.chat_id}")
+        return False
 
     triggered_reason = _get_first_triggered_reason(
         link_result,
@@ -270,24 +382,28 @@ async def handle_antispam(
         gibberish_result,
     )
 
-    if triggered_reason is not None:
-        try:
-            await message.delete()
-        except Exception as e:
-            logging.exception(f"Failed to delete spam message: {e}")
-
-        try:
-            await bot.send_message(
-                chat_id=message.chat.id,
-                text=(
-                    t("moderation.delete_message.success", lang)
-                    + "\n"
-                    + t("moderation.common.reason", lang, reason=triggered_reason)
-                ),
-            )
-        except Exception as e:
-            logging.exception(f"Error while applying censorship filters: {e}")
-            await message.answer(t("moderation.delete_message.error", lang, e=str(e)))
+    if triggered_reason is None:
+        return False
+
+    try:
+        await message.delete()
+    except Exception as e:
+        logging.exception(f"Failed to delete spam message: {e}")
+
+    try:
+        await bot.send_message(
+            chat_id=message.chat.id,
+            text=(
+                t("moderation.delete_message.success", lang)
+                + "\n"
+                + t("moderation.common.reason", lang, reason=triggered_reason)
+            ),
+        )
+    except Exception as e:
+        logging.exception(f"Error while applying censorship filters: {e}")
+        await message.answer(t("moderation.delete_message.error", lang, e=str(e)))
+
+    return True
 
 
 def _run_spam_filters(
@@ -1,6 +1,7 @@
 from .base import FilterResult, MessageContext
-from .censorship import AICensorshipFilter, CensorshipFilter
+from .censorship import AICensorshipFilter, CensorshipFilter, CompiledBlacklist
 from .flood import FloodFilter
+from .raid import JoinRaidDetector
 from .spam import (
     ExcessiveCapsFilter,
     GibberishSpamFilter,
@@ -12,10 +13,12 @@ __all__ = [
     "FilterResult",
     "MessageContext",
     "FloodFilter",
+    "JoinRaidDetector",
     "LinkFilter",
     "ExcessiveCapsFilter",
     "UserMentionsFilter",
     "GibberishSpamFilter",
     "CensorshipFilter",
+    "CompiledBlacklist",
     "AICensorshipFilter",
 ]
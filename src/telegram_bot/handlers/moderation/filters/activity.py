@@ -0,0 +1,117 @@
+import time
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class GlobalFloodConfig:
+    """Bot-wide limits on a user's activity summed over all chats.
+
+    A user is flagged once they sent `message_limit` messages or tripped
+    `hit_limit` filters within `time_window` seconds, in at least `min_chats`
+    different chats. A limit of 0 disables that check.
+    """
+
+    message_limit: int = 30
+    hit_limit: int = 3
+    min_chats: int = 2
+    time_window: int = 60
+    mute_time: int = 3600
+
+
+class _Activity:
+    """Per-bucket counters of one user, in rings of `buckets` slots."""
+
+    __slots__ = ("bucket", "messages", "hits", "chats")
+
+    def __init__(self, buckets: int, bucket: int) -> None:
+        self.bucket = bucket
+        self.messages = [0] * buckets
+        self.hits = [0] * buckets
+        # {chat_id: last bucket with activity in the chat}
+        self.chats: dict[int, int] = {}
+
+    def advance(self, bucket: int) -> None:
+        """Clear the slots of the buckets that passed since the last update."""
+        size = len(self.messages)
+        for b in range(self.bucket + 1, min(bucket, self.bucket + size) + 1):
+            self.messages[b % size] = 0
+            self.hits[b % size] = 0
+        self.bucket = max(self.bucket, bucket)
+
+        oldest = bucket - size
+        for chat_id in [c for c, last in self.chats.items() if last <= oldest]:
+            del self.chats[chat_id]
+
+
+class GlobalActivityIndex:
+    """Count each user's messages and filter hits across all chats.
+
+    Time is split into `buckets` buckets covering `time_window` seconds, so
+    a user costs a fixed number of counters plus the chats they were active
+    in. Users without activity in the window are dropped once per window.
+    """
+
+    def __init__(
+        self, config: GlobalFloodConfig | None = None, buckets: int = 6
+    ) -> None:
+        self.buckets = buckets
+        self.config = config or GlobalFloodConfig()
+        self._users: dict[int, _Activity] = {}
+        self._last_sweep = 0
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    def configure(self, config: GlobalFloodConfig) -> None:
+        self.config = config
+        self._users.clear()
+
+    def record_message(self, chat_id: int, user_id: int) -> None:
+        activity, bucket = self._touch(chat_id, user_id)
+        activity.messages[bucket % self.buckets] += 1
+
+    def record_hit(self, chat_id: int, user_id: int) -> None:
+        """Record that a filter was triggered by the user's message."""
+        activity, bucket = self._touch(chat_id, user_id)
+        activity.hits[bucket % self.buckets] += 1
+
+    def is_flooding(self, user_id: int) -> bool:
+        """Return True if the user's activity over all chats exceeds the limits."""
+        activity = self._users.get(user_id)
+        if activity is None:
+            return False
+
+        activity.advance(self._bucket())
+        config = self.config
+        if len(activity.chats) < config.min_chats:
+            return False
+        messages, hits = sum(activity.messages), sum(activity.hits)
+        return 0 < config.message_limit <= messages or 0 < config.hit_limit <= hits
+
+    def sweep(self) -> int:
+        """Forget users without activity in the window, return how many."""
+        oldest = self._bucket() - self.buckets
+        idle = [
+            user_id
+            for user_id, activity in self._users.items()
+            if activity.bucket <= oldest
+        ]
+        for user_id in idle:
+            del self._users[user_id]
+        return len(idle)
+
+    def _bucket(self) -> int:
+        return int(time.monotonic() * self.buckets / self.config.time_window)
+
+    def _touch(self, chat_id: int, user_id: int) -> tuple[_Activity, int]:
+        bucket = self._bucket()
+        if bucket - self._last_sweep >= self.buckets:
+            self._last_sweep = bucket
+            self.sweep()
+
+        activity = self._users.get(user_id)
+        if activity is None:
+            activity = self._users[user_id] = _Activity(self.buckets, bucket)
+        activity.advance(bucket)
+        activity.chats[chat_id] = bucket
+        return activity, bucket
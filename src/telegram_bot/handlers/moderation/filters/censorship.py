@@ -1,5 +1,11 @@
-import re
-from difflib import SequenceMatcher
+import contextlib
+import importlib
+import logging
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from types import ModuleType
+from typing import TYPE_CHECKING
 
 from telegram_bot.handlers.moderation.filters.base import (
     FilterError,
@@ -7,87 +13,333 @@ from telegram_bot.handlers.moderation.filters.base import (
     FilterStatus,
     MessageContext,
 )
+from telegram_bot.handlers.moderation.filters.matching import BlacklistMatcher
+from telegram_bot.handlers.moderation.filters.replacements import TRANSLATION_TABLES
 from telegram_bot.models.filters import AICensorshipConfig, CensorshipConfig
 
+if TYPE_CHECKING:
+    from telegram_bot.experiments.inference_worker import RemoteToxicityDetector
+
+
+@dataclass(frozen=True)
+class CompiledBlacklist:
+    """Blacklist of a chat with every entry already normalized per language.
+
+    Built once per chat and reused for every message until the blacklist
+    or the normalization-related settings change.
+    """
+
+    words: tuple[str, ...]
+    languages: tuple[str, ...]
+    max_norm_text_len: int
+    window_len_margin: int
+    similarity: float
+    normalized: dict[str, tuple[str, ...]]
+    matchers: dict[str, BlacklistMatcher]
+
+    @classmethod
+    def build(cls, words: list[str], config: CensorshipConfig) -> "CompiledBlacklist":
+        normalized: dict[str, tuple[str, ...]] = {}
+        for lang in config.languages:
+            norm_words = (
+                CensorshipFilter._normalize_text(word, lang, config) for word in words
+            )
+            # Entries that normalize to an empty string can never match.
+            normalized[lang] = tuple(dict.fromkeys(w for w in norm_words if w))
+
+        return cls(
+            words=tuple(words),
+            languages=tuple(config.languages),
+            max_norm_text_len=config.max_norm_text_len,
+            window_len_margin=config.window_len_margin,
+            similarity=config.similarity,
+            normalized=normalized,
+            matchers={
+                lang: BlacklistMatcher(
+                    norm_words, config.window_len_margin, config.similarity
+                )
+                for lang, norm_words in normalized.items()
+            },
+        )
+
+    @classmethod
+    def ensure(
+        cls, blacklist: "list[str] | CompiledBlacklist", config: CensorshipConfig
+    ) -> "CompiledBlacklist":
+        """Return a compiled blacklist that matches the given settings."""
+        if isinstance(blacklist, CompiledBlacklist):
+            if blacklist.is_compatible(config):
+                return blacklist
+            return cls.build(list(blacklist.words), config)
+        return cls.build(blacklist, config)
+
+    def __reduce__(self):
+        # Only the words and settings are sent to filter workers, each worker
+        # process compiles a blacklist once and reuses it (see executor).
+        return _restore_compiled_blacklist, (
+            self.words,
+            self.languages,
+            self.max_norm_text_len,
+            self.window_len_margin,
+            self.similarity,
+        )
+
+    def is_compatible(self, config: CensorshipConfig) -> bool:
+        """Return True if the blacklist was compiled with the same settings."""
+        return (
+            self.languages == tuple(config.languages)
+            and self.max_norm_text_len == config.max_norm_text_len
+            and self.window_len_margin == config.window_len_margin
+            and self.similarity == config.similarity
+        )
+
+
+@lru_cache(maxsize=256)
+def _restore_compiled_blacklist(
+    words: tuple[str, ...],
+    languages: tuple[str, ...],
+    max_norm_text_len: int,
+    window_len_margin: int,
+    similarity: float,
+) -> CompiledBlacklist:
+    config = CensorshipConfig(
+        languages=list(languages),
+        max_norm_text_len=max_norm_text_len,
+        window_len_margin=window_len_margin,
+        similarity=similarity,
+    )
+    return CompiledBlacklist.build(list(words), config)
+
 
 class CensorshipFilter:
     """Check whether the text approximately contains any blacklisted word.
 
     The text and blacklist entries are normalized
-    and then compared using fuzzy substring matching.
+    and then compared using fuzzy substring matching (see `matching`).
     """
 
     name = "blacklist"
 
     @staticmethod
     def _normalize_text(text: str, lang: str, config: CensorshipConfig) -> str:
-        from .replacements import REPLACEMENTS
-
-        text = text.lower()
-        for base, variants in REPLACEMENTS[lang].items():
-            for v in variants:
-                text = text.replace(v, base)
+        # Lowercasing, homoglyph folding, replacements and stripping of
+        # everything outside [а-яa-z0-9] all happen in a single translate pass.
+        # The table maps every character independently, so long texts are
+        # translated in chunks until enough normalized characters are collected.
+        table = TRANSLATION_TABLES[lang]
+        limit = config.max_norm_text_len
 
-        normalized = re.sub(r"[^а-яa-z0-9]", "", text)
-        return normalized[: config.max_norm_text_len]
+        parts: list[str] = []
+        size = 0
+        for start in range(0, len(text), limit):
+            part = text[start : start + limit].translate(table)
+            parts.append(part)
+            size += len(part)
+            if size >= limit:
+                break
 
-    @staticmethod
-    def _is_similar(s1: str, s2: str, threshold: float = 0.85) -> bool:
-        return SequenceMatcher(None, s1, s2).ratio() >= threshold
+        return "".join(parts)[:limit]
 
     @staticmethod
     def check(
         ctx: MessageContext,
-        blacklist: list[str],
+        blacklist: "list[str] | CompiledBlacklist",
         config: CensorshipConfig,
     ) -> FilterResult:
+        compiled = CompiledBlacklist.ensure(blacklist, config)
+        if not compiled.words:
+            # Without a blacklist there is no score to rank the message by.
+            return FilterResult(triggered=False, reason="")
+
+        best_score = 0.0
         for lang in config.languages:
             norm_text = CensorshipFilter._normalize_text(ctx.text, lang, config)
-            for bad_word in blacklist:
-                norm_bad = CensorshipFilter._normalize_text(bad_word, lang, config)
-
-                length = len(norm_bad)
-                window_len_margin = config.window_len_margin
-                window_range = range(
-                    max(length - window_len_margin, 1),
-                    length + window_len_margin + 1,
+            match = compiled.matchers[lang].search(norm_text)
+            if match.triggered:
+                return FilterResult(
+                    triggered=True,
+                    reason=CensorshipFilter.name,
+                    score=match.score,
                 )
+            best_score = max(best_score, match.score)
 
-                for window_len in window_range:
-                    for i in range(len(norm_text) - window_len + 1):
-                        fragment = norm_text[i : i + window_len]
-                        if CensorshipFilter._is_similar(
-                            fragment,
-                            norm_bad,
-                            threshold=config.similarity,
-                        ):
-                            return FilterResult(
-                                triggered=True,
-                                reason=CensorshipFilter.name,
-                            )
+        return FilterResult(triggered=False, reason="", score=best_score)
 
-        return FilterResult(triggered=False, reason="")
+
+@dataclass(frozen=True)
+class _AIRuntime:
+    backend: str
+    onnx_cache_dir: str
+    intra_op_threads: int
+    inter_op_threads: int
+    request_timeout: float
+
+
+# Set when AI inference runs in a separate worker process.
+_remote_detector: "RemoteToxicityDetector | None" = None
+# Applied to the in-process detector when censor_ai is first imported, so that
+# transformers is not loaded at startup while no chat needs AI censorship.
+_pending_runtime: _AIRuntime | None = None
+
+# The in-process censor_ai module. Importing it pulls in transformers and
+# torch, which takes seconds, so it is imported in a background thread.
+_censor_ai: ModuleType | None = None
+_censor_ai_error: ImportError | None = None
+_censor_ai_loader: threading.Thread | None = None
+
+
+def _apply_ai_runtime() -> None:
+    global _pending_runtime
+    if _pending_runtime is None:
+        return
+
+    from telegram_bot.experiments.censor_ai import OnnxOptions, configure_detector
+
+    runtime, _pending_runtime = _pending_runtime, None
+    configure_detector(
+        OnnxOptions(
+            runtime.onnx_cache_dir, runtime.intra_op_threads, runtime.inter_op_threads
+        )
+        if runtime.backend == "onnx"
+        else None,
+        runtime.request_timeout,
+    )
+
+
+def _import_censor_ai() -> None:
+    global _censor_ai, _censor_ai_error
+    try:
+        _apply_ai_runtime()
+        module = importlib.import_module("telegram_bot.experiments.censor_ai")
+    except ImportError as e:
+        logging.info("AI censorship dependencies are not installed")
+        _censor_ai_error = e
+        return
+
+    module.warm_up()
+    _censor_ai = module
+
+
+def _get_censor_ai() -> ModuleType | None:
+    """Return the censor_ai module, or None while it is being imported.
+
+    The first call starts the import in a background thread.
+    Raise ImportError if its dependencies are missing.
+    """
+    global _censor_ai_loader
+    if _censor_ai is not None:
+        return _censor_ai
+    if _censor_ai_error is not None:
+        raise _censor_ai_error
+
+    if _censor_ai_loader is None:
+        _censor_ai_loader = threading.Thread(
+            target=_import_censor_ai, name="censor-ai-import", daemon=True
+        )
+        _censor_ai_loader.start()
+    return None
+
+
+async def _is_toxic_in_process(
+    text: str, config: AICensorshipConfig, languages: list[str] | None = None
+) -> bool:
+    censor_ai = _get_censor_ai()
+    if censor_ai is None:
+        raise RuntimeError("AI models are loading")
+    return await censor_ai.is_toxic(text, config, languages=languages)
+
+
+def _models_ready_in_process() -> bool:
+    censor_ai = _get_censor_ai()
+    return censor_ai is not None and censor_ai.models_ready()
 
 
 def get_ai_checker():
-    from telegram_bot.experiments.censor_ai import is_toxic
+    if _remote_detector is not None:
+        return _remote_detector.is_toxic
+    return _is_toxic_in_process
+
+
+def get_ai_readiness():
+    if _remote_detector is not None:
+        return _remote_detector.models_ready
+    return _models_ready_in_process
+
+
+def warm_up_ai_checker() -> None:
+    """Start loading the AI models in the background, if their dependencies exist."""
+    if _remote_detector is not None:
+        _remote_detector.warm_up()
+        return
+
+    with contextlib.suppress(ImportError):
+        _get_censor_ai()
 
-    return is_toxic
+
+async def stop_ai_checker() -> None:
+    """Stop the inference worker process, if AI runs in one."""
+    if _remote_detector is not None:
+        await _remote_detector.stop()
+
+
+def configure_ai_checker(
+    backend: str,
+    onnx_cache_dir: str,
+    intra_op_threads: int,
+    inter_op_threads: int,
+    request_timeout: float,
+    worker_socket: str | None = None,
+) -> None:
+    """Select the runtime used by the AI checker.
+
+    The in-process detector is only configured when the AI checker is first
+    used. With `worker_socket`, the models run in a separate worker process
+    and this process does not import them at all.
+    """
+    global _remote_detector, _pending_runtime
+    if worker_socket is not None:
+        from telegram_bot.experiments.inference_worker import RemoteToxicityDetector
+
+        _remote_detector = RemoteToxicityDetector(
+            worker_socket,
+            worker_args=[
+                "--backend",
+                backend,
+                "--onnx-cache-dir",
+                onnx_cache_dir,
+                "--intra-op-threads",
+                str(intra_op_threads),
+                "--inter-op-threads",
+                str(inter_op_threads),
+            ],
+            request_timeout=request_timeout,
+        )
+        return
+
+    _pending_runtime = _AIRuntime(
+        backend, onnx_cache_dir, intra_op_threads, inter_op_threads, request_timeout
+    )
 
 
 class AICensorshipFilter:
     """Detect toxic content using AI classifiers.
 
     Delegate detection to the experimental censor_ai module when available.
-    Silent return if AI censorship is turned off or dependencies are missing.
+    Silent return if AI censorship is turned off, dependencies are missing
+    or the models are still loading.
     """
 
     name = "ai_censor"
 
     @staticmethod
-    async def check(ctx: MessageContext, config: AICensorshipConfig) -> FilterResult:
+    async def check(
+        ctx: MessageContext,
+        config: AICensorshipConfig,
+        languages: list[str] | None = None,
+    ) -> FilterResult:
         try:
             is_toxic = get_ai_checker()
+            ready = get_ai_readiness()()
         except ImportError as e:
             return FilterResult(
                 triggered=False,
@@ -96,8 +348,18 @@ class AICensorshipFilter:
                 error=FilterError(code="ai_censor_dependency_missing", message=str(e)),
             )
 
+        if not ready:
+            return FilterResult(
+                triggered=False,
+                reason="",
+                status=FilterStatus.SKIPPED,
+                error=FilterError(
+                    code="ai_censor_not_ready", message="AI models are loading"
+                ),
+            )
+
         try:
-            toxic = await is_toxic(ctx.text, config)
+            toxic = await is_toxic(ctx.text, config, languages=languages)
         except Exception as e:
             return FilterResult(
                 triggered=False,
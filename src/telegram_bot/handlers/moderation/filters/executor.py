@@ -0,0 +1,162 @@
+"""Run CPU-heavy moderation filters off the event loop.
+
+Blacklist matching and gibberish detection are pure Python, so a long message
+checked against a large blacklist would stall every chat the bot serves.
+`FilterExecutor` sends such checks to a process pool (or a thread pool on
+free-threaded builds, where threads run in parallel) and waits for them with
+a timeout. Short texts are checked inline, since shipping them to a worker
+costs more than the check itself.
+
+Functions and arguments sent to a process pool must be picklable. Workers
+are started with "forkserver" (or "spawn" where it is unavailable), since
+forking a process that already runs database, logging and inference threads
+can deadlock on locks held by those threads.
+"""
+
+import asyncio
+import importlib
+import logging
+import multiprocessing
+import sys
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+FILTER_WORKERS = 2
+FILTER_TIMEOUT = 2.0
+# Texts up to this length are cheaper to check than to send to a worker.
+INLINE_MAX_TEXT_LEN = 256
+# Modules with the checks sent to workers, imported when a worker starts.
+WORKER_PRELOAD = ["telegram_bot.handlers.moderation.filters.censorship"]
+
+
+def is_free_threaded() -> bool:
+    """Return True when running on a Python build with the GIL disabled."""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+class FilterExecutor:
+    """Run filter checks in a worker pool with a per-call timeout.
+
+    A timed out check keeps its worker busy until it finishes, the caller
+    only stops waiting for it. A crashed process pool is replaced, and the
+    interrupted check is given up like a timed out one: repeating it inline
+    would block the event loop, and the text itself may be what crashed it.
+    """
+
+    def __init__(
+        self,
+        workers: int = FILTER_WORKERS,
+        timeout: float = FILTER_TIMEOUT,
+        inline_max_text_len: int = INLINE_MAX_TEXT_LEN,
+    ) -> None:
+        self.workers = workers
+        self.timeout = timeout
+        self.inline_max_text_len = inline_max_text_len
+
+        self.inline = 0
+        self.offloaded = 0
+        self.timeouts = 0
+        self.crashes = 0
+
+        self._pool: Executor | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._pool is not None
+
+    def start(self) -> None:
+        """Create the pool and its workers, call before starting other threads."""
+        if self._pool is None and self.workers > 0:
+            self._pool = self._create_pool()
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _create_pool(self) -> Executor:
+        if is_free_threaded():
+            return ThreadPoolExecutor(self.workers, thread_name_prefix="filters")
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context("forkserver")
+            # Imported once by the server, so workers do not pay for it.
+            context.set_forkserver_preload([__name__, *WORKER_PRELOAD])
+        else:
+            context = multiprocessing.get_context("spawn")
+
+        pool = ProcessPoolExecutor(self.workers, mp_context=context)
+        # Processes are otherwise created on the first offloaded message.
+        for module in [__name__, *WORKER_PRELOAD]:
+            for _ in range(self.workers):
+                pool.submit(importlib.import_module, module)
+        return pool
+
+    async def run(self, text: str, func: Callable[..., T], *args: Any) -> T:
+        """Call func(*args) for a message with the given text.
+
+        Raise asyncio.TimeoutError if a worker does not answer within `timeout`,
+        or if the pool crashed while running the check.
+        """
+        if self._pool is None or len(text) <= self.inline_max_text_len:
+            self.inline += 1
+            return func(*args)
+
+        pool = self._pool
+        self.offloaded += 1
+        loop = asyncio.get_running_loop()
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(pool, func, *args), timeout=self.timeout
+            )
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise
+        except BrokenProcessPool as e:
+            # Concurrent checks see the same crash, only the first one restarts.
+            if self._pool is pool:
+                logging.exception("Filter worker pool crashed, restarting it")
+                self.crashes += 1
+                pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = self._create_pool()
+            raise asyncio.TimeoutError("Filter worker pool crashed") from e
+
+
+_executor: FilterExecutor | None = None
+
+
+def start_filter_executor(
+    workers: int = FILTER_WORKERS,
+    timeout: float = FILTER_TIMEOUT,
+    inline_max_text_len: int = INLINE_MAX_TEXT_LEN,
+) -> FilterExecutor:
+    """Start offloading long filter checks to the worker pool."""
+    global _executor
+    if _executor is None:
+        _executor = FilterExecutor(workers, timeout, inline_max_text_len)
+        _executor.start()
+    return _executor
+
+
+def stop_filter_executor() -> None:
+    """Shut the worker pool down and fall back to inline checks."""
+    global _executor
+    if _executor is not None:
+        executor, _executor = _executor, None
+        executor.shutdown()
+        logging.info(
+            f"Filter executor stopped: {executor.offloaded} offloaded, "
+            f"{executor.inline} inline, {executor.timeouts} timed out, "
+            f"{executor.crashes} pool crashes"
+        )
+
+
+async def run_filter(text: str, func: Callable[..., T], *args: Any) -> T:
+    """Run a filter check through the shared executor, or inline if it is off."""
+    if _executor is not None and _executor.running:
+        return await _executor.run(text, func, *args)
+    return func(*args)
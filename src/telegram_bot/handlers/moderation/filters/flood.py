@@ -1,34 +1,81 @@
-import time
+import asyncio
+import contextlib
+import logging
 
 from telegram_bot.handlers.moderation.filters.base import FilterResult, MessageContext
+from telegram_bot.handlers.moderation.filters.flood_state import (
+    FloodState,
+    FloodStats,
+    MemoryFloodState,
+)
 from telegram_bot.models.filters import FloodConfig
 
 
 class FloodFilter:
     """Check whether a user has exceeded the allowed message rate in a chat.
 
-    Track per-user message timestamps and triggers
-    when the configured limit is exceeded.
+    Trigger when the user's latest `message_limit` messages all fall inside
+    `time_window`. The message times are kept by a FloodState, in the bot
+    process unless another state is passed to `start`. Users idle for longer
+    than their window are removed every `sweep_interval` seconds while the
+    filter is started.
     """
 
     name = "flood"
 
-    def __init__(self) -> None:
-        # {(chat_id, user_id): [timestamp, timestamp, ...]}
-        self.user_messages: dict[tuple[int, int], list[float]] = {}
+    def __init__(
+        self, state: FloodState | None = None, sweep_interval: float = 60.0
+    ) -> None:
+        self.state: FloodState = state or MemoryFloodState()
+        self.sweep_interval = sweep_interval
+        self._sweeper: asyncio.Task[None] | None = None
 
-    def check(self, ctx: MessageContext, config: FloodConfig) -> FilterResult:
+    async def check(self, ctx: MessageContext, config: FloodConfig) -> FilterResult:
         key = (ctx.chat_id, ctx.user_id)
-        now = time.time()
+        if await self.state.hit(key, config.message_limit, config.time_window):
+            return FilterResult(triggered=True, reason=self.name)
 
-        timestamps = self.user_messages.get(key, [])
-        timestamps = [t for t in timestamps if now - t < config.time_window]
-        timestamps.append(now)
+        return FilterResult(triggered=False, reason="")
 
-        self.user_messages[key] = timestamps
+    async def sweep(self) -> int:
+        """Forget users without messages in their window, return how many."""
+        return await self.state.sweep()
 
-        if len(timestamps) >= config.message_limit:
-            self.user_messages[key] = []
-            return FilterResult(triggered=True, reason=self.name)
+    async def stats(self) -> FloodStats:
+        """Return the number of tracked users and the memory they take."""
+        return await self.state.stats()
 
-        return FilterResult(triggered=False, reason="")
+    async def start(self, state: FloodState | None = None) -> None:
+        """Open the state, replacing it with `state` if given, and start sweeping."""
+        if self._sweeper is not None:
+            return
+
+        if state is not None:
+            self.state = state
+        await self.state.open()
+        self._sweeper = asyncio.create_task(self._sweep_periodically())
+
+    async def stop(self) -> None:
+        """Stop sweeping and close the state."""
+        if self._sweeper is None:
+            return
+
+        task, self._sweeper = self._sweeper, None
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+        await self.state.close()
+
+    async def _sweep_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                swept = await self.sweep()
+                if swept:
+                    stats = await self.stats()
+                    logging.info(
+                        f"Flood state: swept {swept} idle users, "
+                        f"{stats.keys} tracked, ~{stats.bytes} bytes"
+                    )
+            except Exception:
+                logging.exception("Flood state sweep failed")
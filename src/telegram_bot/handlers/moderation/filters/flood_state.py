@@ -0,0 +1,329 @@
+"""Storage of the message times the flood filter counts.
+
+"memory" keeps them in the bot process, "snapshot" additionally saves them
+on shutdown and restores them on start, and "sqlite" keeps them in a SQLite
+file that several bot processes on one host can share.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Protocol
+
+import aiosqlite
+
+from telegram_bot.config import FloodBackend
+
+# {(chat_id, user_id)}
+FloodKey = tuple[int, int]
+
+
+@dataclass
+class FloodStats:
+    keys: int = 0
+    bytes: int = 0
+    swept: int = 0
+
+
+class FloodState(Protocol):
+    async def open(self) -> None: ...
+
+    async def close(self) -> None: ...
+
+    async def hit(self, key: FloodKey, limit: int, time_window: int) -> bool:
+        """Record a message, return True once `limit` of them fall in the window.
+
+        The window is cleared when it returns True.
+        """
+        ...
+
+    async def sweep(self) -> int:
+        """Forget users without messages in their window, return how many."""
+        ...
+
+    async def stats(self) -> FloodStats: ...
+
+
+class _Window:
+    """Ring buffer with the times of a user's latest `message_limit` messages."""
+
+    __slots__ = ("times", "head", "count", "last_seen", "time_window")
+
+    def __init__(self, size: int) -> None:
+        self.times = [0.0] * size
+        self.head = 0
+        self.count = 0
+        self.last_seen = 0.0
+        self.time_window = 0
+
+    def hit(self, now: float, limit: int, time_window: int) -> bool:
+        if len(self.times) != limit:
+            # The chat's limit changed, keep the latest messages that still fit.
+            latest = self.latest()[-limit:]
+            self.times = [0.0] * limit
+            self.head = 0
+            self.count = 0
+            for t in latest:
+                self._push(t)
+
+        self.last_seen = now
+        self.time_window = time_window
+        self._push(now)
+
+        # Only the oldest of the buffered messages can have left the window.
+        oldest = self.times[self.head % limit] if self.count == limit else None
+        if oldest is not None and now - oldest < time_window:
+            self.count = 0
+            return True
+        return False
+
+    @classmethod
+    def restore(cls, size: int, time_window: int, times: list[float]) -> "_Window":
+        window = cls(size)
+        for t in times[-size:]:
+            window._push(t)
+        window.last_seen = times[-1] if times else 0.0
+        window.time_window = time_window
+        return window
+
+    def latest(self) -> list[float]:
+        """Return the buffered times, oldest first."""
+        size = len(self.times)
+        return [self.times[(self.head - i) % size] for i in range(self.count, 0, -1)]
+
+    def _push(self, t: float) -> None:
+        self.times[self.head] = t
+        self.head = (self.head + 1) % len(self.times)
+        self.count = min(self.count + 1, len(self.times))
+
+
+class MemoryFloodState:
+    """Per-user ring buffers in the bot process, timed with time.monotonic."""
+
+    def __init__(self) -> None:
+        self.swept = 0
+        self._windows: dict[FloodKey, _Window] = {}
+
+    async def open(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    async def hit(self, key: FloodKey, limit: int, time_window: int) -> bool:
+        window = self._windows.get(key)
+        if window is None:
+            window = self._windows[key] = _Window(limit)
+        return window.hit(time.monotonic(), limit, time_window)
+
+    async def sweep(self) -> int:
+        now = time.monotonic()
+        idle = [
+            key
+            for key, window in self._windows.items()
+            if now - window.last_seen >= window.time_window
+        ]
+        for key in idle:
+            del self._windows[key]
+
+        self.swept += len(idle)
+        return len(idle)
+
+    async def stats(self) -> FloodStats:
+        """Return the number of tracked users and an estimate of their memory."""
+        size = sys.getsizeof(self._windows)
+        for key, window in self._windows.items():
+            size += sys.getsizeof(key) + sys.getsizeof(window)
+            size += sys.getsizeof(window.times)
+        return FloodStats(keys=len(self._windows), bytes=size, swept=self.swept)
+
+
+class SnapshotFloodState(MemoryFloodState):
+    """In-process state saved to a JSON file on close and restored on open.
+
+    Monotonic times do not survive a restart, so the snapshot stores wall
+    clock times and converts them back when it is loaded.
+    """
+
+    def __init__(self, path: str) -> None:
+        super().__init__()
+        self.path = Path(path)
+
+    async def open(self) -> None:
+        try:
+            snapshot = json.loads(self.path.read_text())
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable flood snapshot {self.path}: {e}")
+            return
+
+        offset = time.monotonic() - time.time()
+        for chat_id, user_id, limit, time_window, times in snapshot["windows"]:
+            self._windows[(chat_id, user_id)] = _Window.restore(
+                limit, time_window, [t + offset for t in times]
+            )
+
+        await self.sweep()
+        logging.info(f"Restored flood state of {len(self._windows)} users")
+
+    async def close(self) -> None:
+        await self.sweep()
+        offset = time.time() - time.monotonic()
+        windows = [
+            [
+                chat_id,
+                user_id,
+                len(window.times),
+                window.time_window,
+                [t + offset for t in window.latest()],
+            ]
+            for (chat_id, user_id), window in self._windows.items()
+            if window.count
+        ]
+
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        try:
+            tmp_path.write_text(json.dumps({"windows": windows}))
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logging.error(f"Failed to save flood snapshot {self.path}: {e}")
+
+
+class SqliteFloodState:
+    """Message times in a SQLite file shared by the bot processes of one host.
+
+    Each check runs in its own IMMEDIATE transaction, so concurrent processes
+    never lose or double count a message. Times are wall clock times because
+    monotonic clocks of different processes are not comparable.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.swept = 0
+        self._conn: aiosqlite.Connection | None = None
+        self._lock = asyncio.Lock()
+
+    async def open(self) -> None:
+        if self._conn is not None:
+            return
+
+        # Autocommit, transactions are started explicitly in `hit`.
+        conn = await aiosqlite.connect(self.path, isolation_level=None)
+        await conn.execute("PRAGMA journal_mode=WAL")
+        await conn.execute("PRAGMA synchronous=NORMAL")
+        await conn.execute("PRAGMA busy_timeout=5000")
+        await conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS flood_messages (
+                chat_id    INTEGER NOT NULL,
+                user_id    INTEGER NOT NULL,
+                sent_at    REAL    NOT NULL,
+                expires_at REAL    NOT NULL
+            )
+            """
+        )
+        await conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_flood_messages_user
+            ON flood_messages (chat_id, user_id, sent_at)
+            """
+        )
+        await conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_flood_messages_expires_at
+            ON flood_messages (expires_at)
+            """
+        )
+        self._conn = conn
+
+    async def close(self) -> None:
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            await conn.close()
+
+    def _connection(self) -> aiosqlite.Connection:
+        if self._conn is None:
+            raise RuntimeError("Flood state is not open")
+        return self._conn
+
+    async def hit(self, key: FloodKey, limit: int, time_window: int) -> bool:
+        conn = self._connection()
+        chat_id, user_id = key
+        now = time.time()
+
+        async with self._lock:
+            await conn.execute("BEGIN IMMEDIATE")
+            try:
+                await conn.execute(
+                    """
+                    DELETE FROM flood_messages
+                    WHERE chat_id = ? AND user_id = ? AND sent_at <= ?
+                    """,
+                    (chat_id, user_id, now - time_window),
+                )
+                await conn.execute(
+                    "INSERT INTO flood_messages VALUES (?, ?, ?, ?)",
+                    (chat_id, user_id, now, now + time_window),
+                )
+                async with conn.execute(
+                    """
+                    SELECT COUNT(*) FROM flood_messages
+                    WHERE chat_id = ? AND user_id = ?
+                    """,
+                    (chat_id, user_id),
+                ) as cursor:
+                    row = await cursor.fetchone()
+                triggered = row is not None and row[0] >= limit
+                if triggered:
+                    await conn.execute(
+                        "DELETE FROM flood_messages WHERE chat_id = ? AND user_id = ?",
+                        (chat_id, user_id),
+                    )
+            except BaseException:
+                await conn.execute("ROLLBACK")
+                raise
+            await conn.execute("COMMIT")
+
+        return triggered
+
+    async def sweep(self) -> int:
+        conn = self._connection()
+        async with self._lock:
+            cursor = await conn.execute(
+                "DELETE FROM flood_messages WHERE expires_at <= ?", (time.time(),)
+            )
+        self.swept += cursor.rowcount
+        return cursor.rowcount
+
+    async def stats(self) -> FloodStats:
+        """Return the number of tracked users and the size of the database file."""
+        conn = self._connection()
+        async with conn.execute(
+            """
+            SELECT COUNT(*) FROM (
+                SELECT DISTINCT chat_id, user_id FROM flood_messages
+            )
+            """
+        ) as cursor:
+            row = await cursor.fetchone()
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            size = 0
+        return FloodStats(keys=row[0] if row else 0, bytes=size, swept=self.swept)
+
+
+def create_flood_state(
+    backend: FloodBackend, snapshot_path: str, db_path: str
+) -> FloodState:
+    if backend == "snapshot":
+        return SnapshotFloodState(snapshot_path)
+    if backend == "sqlite":
+        return SqliteFloodState(db_path)
+    return MemoryFloodState()
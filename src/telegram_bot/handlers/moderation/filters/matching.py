@@ -0,0 +1,216 @@
+"""String matching engine used by the blacklist censorship filter.
+
+A message triggers the filter when some fragment of the normalized text, whose
+length differs from a blacklisted word by at most `window_len_margin`, has
+a `difflib.SequenceMatcher` ratio >= `similarity` with that word.
+
+Instead of running SequenceMatcher on every window for every word, the engine:
+
+1. Feeds all words into one Aho-Corasick automaton, so exact occurrences are
+   found in a single pass over the text, whatever the blacklist size.
+2. Bounds the edit distance of any fragment that could reach the similarity
+   threshold. SequenceMatcher's matching blocks form a common subsequence, so
+   ratio >= s implies an insert/delete distance of at most k = (n + m)(1 - s).
+   If a word is split into k + 1 pieces, at least one piece must appear intact
+   in such a fragment, and those pieces go into the same automaton.
+3. Runs SequenceMatcher only on windows around piece occurrences, which gives
+   exactly the same verdict as checking every window.
+
+Words too short to split into k + 1 non-empty pieces are checked with the
+plain sliding-window scan.
+"""
+
+from collections import deque
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from math import floor
+
+# Guards the floor() in the edit distance bound against float rounding.
+_EPSILON = 1e-9
+
+
+class AhoCorasick:
+    """Find all occurrences of many patterns in one pass over the text."""
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[tuple[int, ...]] = [()]
+        self.patterns: list[str] = []
+
+        for pattern in patterns:
+            self._add(pattern)
+        self._build_links()
+
+    def _add(self, pattern: str) -> None:
+        state = 0
+        for ch in pattern:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][ch] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = next_state
+
+        self._out[state] += (len(self.patterns),)
+        self.patterns.append(pattern)
+
+    def _build_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, child in self._goto[state].items():
+                queue.append(child)
+
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(ch, 0)
+                self._out[child] += self._out[self._fail[child]]
+
+    def iter_matches(self, text: str) -> Iterator[tuple[int, int]]:
+        """Yield (start index, pattern id) for every occurrence in the text."""
+        goto, fail, out, patterns = self._goto, self._fail, self._out, self.patterns
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for pattern_id in out[state]:
+                yield i - len(patterns[pattern_id]) + 1, pattern_id
+
+
+@dataclass(frozen=True)
+class MatchResult:
+    triggered: bool
+    # Best SequenceMatcher ratio among the windows that were verified. Windows
+    # that provably cannot reach `similarity` are never scored, so for a miss
+    # this is a lower bound of the best similarity in the text, not its value.
+    score: float = 0.0
+
+
+@dataclass(frozen=True)
+class _Piece:
+    word_id: int
+    offset: int
+
+
+def _window_lengths(length: int, margin: int) -> range:
+    return range(max(length - margin, 1), length + margin + 1)
+
+
+def _max_distance(length: int, margin: int, similarity: float) -> int:
+    """Largest insert/delete distance a window can have and still be similar."""
+    return floor((2 * length + margin) * (1 - similarity) + _EPSILON)
+
+
+def _split(word: str, parts: int) -> Iterator[tuple[int, str]]:
+    """Split a word into `parts` contiguous pieces of almost equal length."""
+    size, extra = divmod(len(word), parts)
+    offset = 0
+    for i in range(parts):
+        piece_len = size + (1 if i < extra else 0)
+        yield offset, word[offset : offset + piece_len]
+        offset += piece_len
+
+
+class BlacklistMatcher:
+    """Approximate multi-word matcher for already normalized blacklist entries."""
+
+    def __init__(self, words: Iterable[str], margin: int, similarity: float) -> None:
+        self.words = [w for w in dict.fromkeys(words) if w]
+        self.margin = margin
+        self.similarity = similarity
+
+        self._distances = [
+            _max_distance(len(w), margin, similarity) for w in self.words
+        ]
+        # Words that cannot be split into enough non-empty pieces.
+        self._unfiltered: list[int] = []
+
+        # pattern -> (ids of words equal to it, pieces equal to it)
+        exact: dict[str, list[int]] = {}
+        pieces: dict[str, list[_Piece]] = {}
+        for word_id, word in enumerate(self.words):
+            exact.setdefault(word, []).append(word_id)
+            parts = self._distances[word_id] + 1
+            if parts > len(word):
+                self._unfiltered.append(word_id)
+                continue
+            if parts == 1:
+                continue
+            for offset, piece in _split(word, parts):
+                pieces.setdefault(piece, []).append(_Piece(word_id, offset))
+
+        patterns = list(exact.keys() | pieces.keys())
+        self._automaton = AhoCorasick(patterns)
+        self._exact = [bool(exact.get(p)) for p in patterns]
+        self._pieces = [tuple(pieces.get(p, ())) for p in patterns]
+
+    def search(self, text: str) -> MatchResult:
+        checked: set[tuple[int, int, int]] = set()
+        best = 0.0
+
+        for start, pattern_id in self._automaton.iter_matches(text):
+            if self._exact[pattern_id]:
+                return MatchResult(triggered=True, score=1.0)
+
+            piece_len = len(self._automaton.patterns[pattern_id])
+            for piece in self._pieces[pattern_id]:
+                result = self._verify_around(text, piece, start, piece_len, checked)
+                if result.triggered:
+                    return result
+                best = max(best, result.score)
+
+        for word_id in self._unfiltered:
+            result = self._scan(text, word_id)
+            if result.triggered:
+                return result
+            best = max(best, result.score)
+
+        return MatchResult(triggered=False, score=best)
+
+    def _verify_around(
+        self,
+        text: str,
+        piece: _Piece,
+        start: int,
+        piece_len: int,
+        checked: set[tuple[int, int, int]],
+    ) -> MatchResult:
+        """Verify windows that contain this piece occurrence at a plausible shift."""
+        word = self.words[piece.word_id]
+        distance = self._distances[piece.word_id]
+        best = 0.0
+
+        for window_len in _window_lengths(len(word), self.margin):
+            low = max(
+                0, start + piece_len - window_len, start - piece.offset - distance
+            )
+            high = min(start, len(text) - window_len, start - piece.offset + distance)
+            for i in range(low, high + 1):
+                key = (piece.word_id, window_len, i)
+                if key in checked:
+                    continue
+                checked.add(key)
+
+                ratio = SequenceMatcher(None, text[i : i + window_len], word).ratio()
+                if ratio >= self.similarity:
+                    return MatchResult(triggered=True, score=ratio)
+                best = max(best, ratio)
+
+        return MatchResult(triggered=False, score=best)
+
+    def _scan(self, text: str, word_id: int) -> MatchResult:
+        word = self.words[word_id]
+        best = 0.0
+        for window_len in _window_lengths(len(word), self.margin):
+            for i in range(len(text) - window_len + 1):
+                ratio = SequenceMatcher(None, text[i : i + window_len], word).ratio()
+                if ratio >= self.similarity:
+                    return MatchResult(triggered=True, score=ratio)
+                best = max(best, ratio)
+        return MatchResult(triggered=False, score=best)
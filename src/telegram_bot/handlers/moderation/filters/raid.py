@@ -0,0 +1,54 @@
+import time
+from collections import deque
+
+from telegram_bot.models.filters import RaidConfig
+
+
+class JoinRaidDetector:
+    """Detect bursts of members joining a chat.
+
+    Track the latest joins of each chat and switch the chat to raid mode once
+    `join_limit` of them fall inside `time_window`. Raid mode lasts until
+    `raid_duration` seconds after the last join.
+    """
+
+    name = "raid"
+
+    def __init__(self) -> None:
+        # {chat_id: deque[(joined_at, user_id)]}, never longer than join_limit.
+        self._joins: dict[int, deque[tuple[float, int]]] = {}
+        # {chat_id: monotonic time when raid mode ends}
+        self._raid_until: dict[int, float] = {}
+
+    def in_raid(self, chat_id: int) -> bool:
+        until = self._raid_until.get(chat_id)
+        if until is None:
+            return False
+        if until <= time.monotonic():
+            del self._raid_until[chat_id]
+            return False
+        return True
+
+    def check(self, chat_id: int, user_ids: list[int], config: RaidConfig) -> list[int]:
+        """Record joins and return the members to restrict.
+
+        Outside a raid nothing is returned. When the joins trip the detector,
+        every member of the burst is returned, and during raid mode each new
+        member is returned as soon as they join.
+        """
+        now = time.monotonic()
+        if self.in_raid(chat_id):
+            self._raid_until[chat_id] = now + config.raid_duration
+            return list(user_ids)
+
+        joins = self._joins.setdefault(chat_id, deque())
+        while joins and now - joins[0][0] >= config.time_window:
+            joins.popleft()
+        joins.extend((now, user_id) for user_id in user_ids)
+
+        if len(joins) < config.join_limit:
+            return []
+
+        del self._joins[chat_id]
+        self._raid_until[chat_id] = now + config.raid_duration
+        return [user_id for _, user_id in joins]
@@ -1,3 +1,5 @@
+import unicodedata
+
 REPLACEMENTS = {
     "ru": {
         "а": ["a", "@"],
@@ -69,3 +71,146 @@ REPLACEMENTS = {
         "y": ["u"],
     },
 }
+
+# Lowercase homoglyphs from other scripts, folded into the Latin letter they
+# imitate. Uppercase entries cover letters that only look alike in uppercase.
+CONFUSABLES = {
+    # Cyrillic
+    "а": "a",
+    "в": "b",
+    "е": "e",
+    "о": "o",
+    "р": "p",
+    "с": "c",
+    "у": "y",
+    "х": "x",
+    "і": "i",
+    "ј": "j",
+    "ѕ": "s",
+    "ԁ": "d",
+    "ԛ": "q",
+    "ԝ": "w",
+    "һ": "h",
+    "ү": "y",
+    "ӏ": "l",
+    "В": "b",
+    "Н": "h",
+    "К": "k",
+    "М": "m",
+    "Т": "t",
+    # Greek
+    "α": "a",
+    "β": "b",
+    "γ": "y",
+    "ε": "e",
+    "ι": "i",
+    "κ": "k",
+    "ν": "v",
+    "ο": "o",
+    "ρ": "p",
+    "τ": "t",
+    "υ": "u",
+    "χ": "x",
+    "ω": "w",
+    # Latin
+    "ɑ": "a",
+    "ɡ": "g",
+    "ı": "i",
+    "ȷ": "j",
+}
+
+_LATIN = frozenset("abcdefghijklmnopqrstuvwxyz")
+_CYRILLIC = frozenset(chr(cp) for cp in range(ord("а"), ord("я") + 1))
+_DIGITS = frozenset("0123456789")
+_KEPT = _LATIN | _CYRILLIC | _DIGITS
+
+# Cyrillic letters that the Latin confusables stand for, so homoglyphs in
+# Cyrillic text fold into the letter they imitate instead of being
+# transliterated as Latin.
+_CYRILLIC_HOMOGLYPHS = {
+    latin: cyr for cyr, latin in CONFUSABLES.items() if cyr in _CYRILLIC
+}
+
+# Code points below this are compiled eagerly (Latin and Cyrillic blocks),
+# the rest on first use.
+_PRECOMPILED_RANGE = 0x0500
+# Caps lazily compiled entries so unusual input cannot grow a table forever.
+_MAX_TABLE_SIZE = 1 << 16
+
+
+def _strip_marks(ch: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", ch)
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+class TranslationTable(dict[int, str | None]):
+    """`str.translate` table doing the whole normalization of one language.
+
+    Each character is lowercased, folded with NFKC, confusables and accent
+    stripping unless the language already handles it, then passed through
+    the language's REPLACEMENTS chain. Characters outside [а-яa-z0-9] map
+    to None and are removed.
+    """
+
+    def __init__(self, lang: str) -> None:
+        super().__init__()
+        self.lang = lang
+        self._pairs = [
+            (variant, base)
+            for base, variants in REPLACEMENTS[lang].items()
+            for variant in variants
+        ]
+        cyrillic = lang != "en"
+        self._native = (_KEPT if cyrillic else _LATIN | _DIGITS) | frozenset(
+            c for pair in self._pairs for c in pair
+        )
+        self._homoglyphs = _CYRILLIC_HOMOGLYPHS if cyrillic else {}
+
+        for cp in range(_PRECOMPILED_RANGE):
+            self[cp] = self._compile(chr(cp))
+
+    def __missing__(self, cp: int) -> str | None:
+        value = self._compile(chr(cp))
+        if len(self) < _MAX_TABLE_SIZE:
+            self[cp] = value
+        return value
+
+    def _compile(self, ch: str) -> str | None:
+        result = "".join(self._replace(c) for c in self._fold(ch))
+        kept = "".join(c for c in result if c in _KEPT)
+        return kept or None
+
+    def _fold(self, ch: str) -> str:
+        lowered = ch.lower()
+        if all(c in self._native for c in lowered):
+            return lowered
+
+        folded = []
+        for c in unicodedata.normalize("NFKC", ch):
+            if c in CONFUSABLES:
+                folded.append(self._confusable(c))
+                continue
+            for low in c.lower():
+                # Letters from the kept classes are not homoglyphs, so only
+                # characters outside them lose their accents ("й" stays "й").
+                if low not in self._native and low not in _KEPT:
+                    low = "".join(
+                        s if s in self._native else self._confusable(s)
+                        for s in _strip_marks(low)
+                    )
+                folded.append(low)
+        return "".join(folded)
+
+    def _confusable(self, ch: str) -> str:
+        latin = CONFUSABLES.get(ch, ch)
+        return self._homoglyphs.get(latin, latin)
+
+    def _replace(self, ch: str) -> str:
+        # Same result as calling str.replace for every pair in order.
+        for variant, base in self._pairs:
+            if ch == variant:
+                ch = base
+        return ch
+
+
+TRANSLATION_TABLES = {lang: TranslationTable(lang) for lang in REPLACEMENTS}
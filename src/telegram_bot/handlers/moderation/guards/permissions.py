@@ -8,11 +8,31 @@ users and the bot have sufficient rights before executing moderation logic.
 from collections.abc import Awaitable, Callable
 from functools import wraps
 
-from aiogram.enums import ChatMemberStatus
-from aiogram.types import CallbackQuery, Message
+from aiogram.types import CallbackQuery, Message, User
 
 from telegram_bot.i18n import t
-from telegram_bot.services.db.chat_settings_service import get_chat_language
+from telegram_bot.services.telegram.moderation_context import (
+    ModerationContext,
+    get_moderation_context,
+)
+
+
+def _message_context(message: Message) -> ModerationContext:
+    return get_moderation_context(
+        message.bot, message.chat.id, _user_id(message.from_user)
+    )
+
+
+def _callback_context(callback: CallbackQuery) -> ModerationContext:
+    if callback.message is None:
+        raise RuntimeError("Callback has no message")
+    return get_moderation_context(
+        callback.bot, callback.message.chat.id, _user_id(callback.from_user)
+    )
+
+
+def _user_id(user: User | None) -> int | None:
+    return user.id if user is not None else None
 
 
 def group_only(
@@ -20,7 +40,7 @@ def group_only(
 ) -> Callable[[Message], Awaitable[None]]:
     @wraps(handler)
     async def wrapper(message: Message) -> None:
-        lang = await get_chat_language(message.chat.id)
+        lang = await _message_context(message).language()
 
         if message.chat.type not in ("group", "supergroup"):
             await message.reply(t("decorators.not_group", lang))
@@ -36,7 +56,7 @@ def supergroup_only_message(
 ) -> Callable[[Message], Awaitable[None]]:
     @wraps(handler)
     async def wrapper(message: Message) -> None:
-        lang = await get_chat_language(message.chat.id)
+        lang = await _message_context(message).language()
         if message.chat.type != "supergroup":
             await message.reply(t("decorators.not_supergroup", lang))
             return
@@ -54,7 +74,7 @@ def supergroup_only_callback(
         if callback.message is None:
             return
 
-        lang = await get_chat_language(callback.message.chat.id)
+        lang = await _callback_context(callback).language()
         if callback.message.chat.type != "supergroup":
             await callback.answer(t("decorators.not_supergroup", lang))
             return
@@ -72,11 +92,8 @@ def user_is_admin_message(
         if message.from_user is None or message.bot is None:
             return
 
-        lang = await get_chat_language(message.chat.id)
-        member = await message.bot.get_chat_member(
-            message.chat.id, message.from_user.id
-        )
-        if member.status not in ("administrator", "creator"):
+        lang = await _message_context(message).language()
+        if not await _message_context(message).user_is_admin():
             await message.reply(t("decorators.user_is_not_admin", lang))
             return
 
@@ -93,11 +110,8 @@ def user_is_admin_callback(
         if callback.bot is None or callback.message is None:
             return
 
-        lang = await get_chat_language(callback.message.chat.id)
-        member = await callback.bot.get_chat_member(
-            callback.message.chat.id, callback.from_user.id
-        )
-        if member.status not in ("administrator", "creator"):
+        lang = await _callback_context(callback).language()
+        if not await _callback_context(callback).user_is_admin():
             await callback.answer(
                 t("decorators.user_is_not_admin", lang), show_alert=True
             )
@@ -116,12 +130,8 @@ def bot_has_rights_message(
         if message.bot is None:
             return
 
-        lang = await get_chat_language(message.chat.id)
-        bot_member = await message.chat.get_member(message.bot.id)
-        if not (
-            bot_member.status == ChatMemberStatus.ADMINISTRATOR
-            and bot_member.can_restrict_members
-        ):
+        lang = await _message_context(message).language()
+        if not await _message_context(message).bot_can_restrict():
             await message.reply(t("decorators.bot_has_not_rights", lang))
             return
 
@@ -138,12 +148,8 @@ def bot_has_rights_callback(
         if callback.message is None or callback.message.bot is None:
             return
 
-        lang = await get_chat_language(callback.message.chat.id)
-        bot_member = await callback.message.chat.get_member(callback.message.bot.id)
-        if not (
-            bot_member.status == ChatMemberStatus.ADMINISTRATOR
-            and bot_member.can_restrict_members
-        ):
+        lang = await _callback_context(callback).language()
+        if not await _callback_context(callback).bot_can_restrict():
             await callback.answer(
                 t("decorators.bot_has_not_rights", lang), show_alert=True
             )
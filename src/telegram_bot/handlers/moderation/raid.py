@@ -0,0 +1,112 @@
+"""Join raid handling: mute members who join during a raid, in batches."""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+
+from aiogram import Bot
+from aiogram.types import User
+
+from telegram_bot.handlers.moderation.commands.mute import mute_user
+from telegram_bot.handlers.moderation.filters.raid import JoinRaidDetector
+from telegram_bot.i18n import t
+from telegram_bot.models.filters import RaidConfig
+from telegram_bot.models.user import UserDTO
+from telegram_bot.services.db.users_service import register_users
+
+# Joins that arrive within this many seconds are handled as one batch.
+RAID_BATCH_DELAY = 1.0
+# Mutes sent to the Bot API at the same time for one batch.
+MAX_CONCURRENT_RESTRICTIONS = 10
+
+raid_detector = JoinRaidDetector()
+
+
+@dataclass
+class _RaidBatch:
+    lang: str
+    config: RaidConfig
+    targets: set[int] = field(default_factory=set)
+    users: dict[int, User] = field(default_factory=dict)
+
+
+_batches: dict[int, _RaidBatch] = {}
+# Chats whose current raid was already announced.
+_announced: set[int] = set()
+# Strong references to the running flush tasks.
+_tasks: set[asyncio.Task[None]] = set()
+
+
+async def handle_join_raid(
+    bot: Bot, chat_id: int, lang: str, users: list[User], config: RaidConfig
+) -> bool:
+    """Queue the joined users for muting if they are part of a raid.
+
+    Return True if they were queued. Their registration is then done with
+    the rest of the batch.
+    """
+    if not config.enabled:
+        return False
+
+    if not raid_detector.in_raid(chat_id):
+        _announced.discard(chat_id)
+
+    targets = raid_detector.check(chat_id, [user.id for user in users], config)
+    if not targets:
+        return False
+
+    batch = _batches.get(chat_id)
+    if batch is None:
+        batch = _batches[chat_id] = _RaidBatch(lang, config)
+        task = asyncio.create_task(_flush_later(bot, chat_id))
+        _tasks.add(task)
+        task.add_done_callback(_tasks.discard)
+
+    batch.targets.update(targets)
+    batch.users.update((user.id, user) for user in users)
+    return True
+
+
+async def _flush_later(bot: Bot, chat_id: int) -> None:
+    await asyncio.sleep(RAID_BATCH_DELAY)
+    batch = _batches.pop(chat_id)
+    try:
+        await _flush(bot, chat_id, batch)
+    except Exception:
+        logging.exception(f"Failed to handle join raid in chat {chat_id}")
+
+
+async def _flush(bot: Bot, chat_id: int, batch: _RaidBatch) -> None:
+    await register_users(
+        [
+            UserDTO(id=user.id, full_name=user.full_name, username=user.username)
+            for user in batch.users.values()
+        ]
+    )
+
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_RESTRICTIONS)
+
+    async def restrict(user_id: int) -> None:
+        async with semaphore:
+            await mute_user(bot, chat_id, user_id, batch.config.mute_time)
+
+    results = await asyncio.gather(
+        *(restrict(user_id) for user_id in batch.targets), return_exceptions=True
+    )
+    failed = sum(isinstance(result, BaseException) for result in results)
+    muted = len(results) - failed
+    logging.warning(
+        f"Join raid in chat {chat_id}: muted {muted} members, {failed} failed"
+    )
+
+    if muted and chat_id not in _announced:
+        _announced.add(chat_id)
+        await bot.send_message(
+            chat_id,
+            t(
+                "moderation.raid.start",
+                batch.lang,
+                count=str(muted),
+                duration=str(batch.config.mute_time),
+            ),
+        )
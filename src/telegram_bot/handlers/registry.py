@@ -1,4 +1,5 @@
 from telegram_bot.handlers.common.bot_added import router as bot_added_router
+from telegram_bot.handlers.common.chat_member import router as chat_member_router
 from telegram_bot.handlers.common.commands.help import router as help_router
 from telegram_bot.handlers.common.commands.start import router as start_router
 from telegram_bot.handlers.moderation.commands import (
@@ -13,6 +14,7 @@ from telegram_bot.handlers.moderation.echo import router as echo_router
 
 routers = [
     bot_added_router,
+    chat_member_router,
     start_router,
     help_router,
     mute_router,
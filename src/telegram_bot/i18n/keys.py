@@ -38,6 +38,9 @@ I18nKey = Literal[
     "moderation.filters.flood.header",
     "moderation.filters.flood.limit",
     "moderation.filters.flood.mute",
+    "moderation.filters.raid.header",
+    "moderation.filters.raid.limit",
+    "moderation.filters.raid.mute",
     "moderation.filters.spam.caps",
     "moderation.filters.spam.gibberish",
     "moderation.filters.spam.header",
@@ -51,8 +54,11 @@ I18nKey = Literal[
     "moderation.modes.antispam.on",
     "moderation.modes.censorship.off",
     "moderation.modes.censorship.on",
+    "moderation.modes.raid.off",
+    "moderation.modes.raid.on",
     "moderation.mute.error",
     "moderation.mute.success",
+    "moderation.raid.start",
     "moderation.reset_warns.error",
     "moderation.reset_warns.success",
     "moderation.unban.callback.success",
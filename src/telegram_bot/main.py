@@ -11,8 +11,25 @@ from aiogram.methods import GetUpdates
 
 from telegram_bot.config import load_config
 from telegram_bot.handlers import routers
+from telegram_bot.handlers.middlewares import ModerationContextMiddleware
+from telegram_bot.handlers.moderation.echo import activity_index, flood_filter
+from telegram_bot.handlers.moderation.filters.activity import GlobalFloodConfig
+from telegram_bot.handlers.moderation.filters.censorship import (
+    configure_ai_checker,
+    stop_ai_checker,
+    warm_up_ai_checker,
+)
+from telegram_bot.handlers.moderation.filters.executor import (
+    start_filter_executor,
+    stop_filter_executor,
+)
+from telegram_bot.handlers.moderation.filters.flood_state import create_flood_state
 from telegram_bot.i18n import load_i18n
-from telegram_bot.repositories import init_db
+from telegram_bot.repositories import close_db, init_db
+from telegram_bot.services.db.chat_settings_service import is_ai_censorship_used
+from telegram_bot.services.db.logging_service import start_log_sink, stop_log_sink
+from telegram_bot.services.telegram.bot_self import bot_self
+from telegram_bot.services.telegram.request_scheduler import RequestScheduler
 
 
 async def main() -> None:
@@ -21,24 +38,78 @@ async def main() -> None:
     Initialize configuration, dependencies, and handlers before processing updates.
     """
     config = load_config()
-    await init_db()
-    load_i18n()
-
+    scheduler = RequestScheduler()
     session = AiohttpSession()
     session.middleware(RequestLogging(ignore_methods=[GetUpdates]))
+    session.middleware(scheduler)
+
+    # Filter workers first, before the database and log sink start threads.
+    start_filter_executor(config.filter_workers, config.filter_timeout)
+    # Everything started from here on is stopped in `finally`, also when a
+    # later startup step fails. Each stop is a no-op for what never started.
+    try:
+        await init_db()
+        start_log_sink(overflow_policy=config.log_overflow_policy)
+        configure_ai_checker(
+            config.ai_backend,
+            config.ai_onnx_cache_dir,
+            config.ai_intra_op_threads,
+            config.ai_inter_op_threads,
+            config.ai_timeout,
+            worker_socket=config.ai_worker_socket if config.ai_worker else None,
+        )
+        load_i18n()
+
+        # Models take seconds to load, so never let the first message wait.
+        if config.ai_warmup or await is_ai_censorship_used():
+            warm_up_ai_checker()
+
+        bot = Bot(
+            token=config.bot_token,
+            session=session,
+            default=DefaultBotProperties(parse_mode=ParseMode.HTML),
+        )
+
+        bot_self.set_user(await bot.get_me())
 
-    bot = Bot(
-        token=config.bot_token,
-        session=session,
-        default=DefaultBotProperties(parse_mode=ParseMode.HTML),
-    )
+        # Handlers can take `bot_self` to reach the bot's identity and chat rights.
+        dp = Dispatcher(bot_self=bot_self)
+        dp.message.outer_middleware(ModerationContextMiddleware())
+        dp.callback_query.outer_middleware(ModerationContextMiddleware())
 
-    dp = Dispatcher()
+        for router in routers:
+            dp.include_router(router)
 
-    for router in routers:
-        dp.include_router(router)
+        activity_index.configure(
+            GlobalFloodConfig(
+                message_limit=config.global_flood_messages,
+                hit_limit=config.global_flood_hits,
+                min_chats=config.global_flood_chats,
+                time_window=config.global_flood_window,
+                mute_time=config.global_flood_mute_time,
+            )
+        )
+        await flood_filter.start(
+            create_flood_state(
+                config.flood_backend, config.flood_snapshot_path, config.flood_db_path
+            )
+        )
 
-    await dp.start_polling(bot)  # type: ignore[reportUnknownMemberType]
+        await dp.start_polling(bot)  # type: ignore[reportUnknownMemberType]
+    finally:
+        await flood_filter.stop()
+        await scheduler.close()
+        await session.close()
+        stats = scheduler.get_stats()
+        logging.info(
+            f"Request scheduler stopped: {stats.sent} sent, {stats.retried} retried "
+            f"after flood limits, {stats.failed} failed, max queue depth "
+            f"{stats.max_depth}"
+        )
+        await stop_ai_checker()
+        stop_filter_executor()
+        await stop_log_sink()
+        await close_db()
 
 
 def run() -> None:
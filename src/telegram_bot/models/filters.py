@@ -22,6 +22,22 @@ class AICensorshipConfig(BaseConfig):
     enabled: bool = False
     threshold: Ratio = 0.7
 
+    # Long messages are classified in overlapping windows of `chunk_tokens`
+    # whitespace-separated tokens, spending at most `max_tokens` tokens
+    # (but no less than two windows) per message.
+    chunk_tokens: Annotated[int, Field(ge=16, le=256)] = 128
+    chunk_overlap: Annotated[int, Field(ge=0, le=64)] = 16
+    max_tokens: Annotated[int, Field(ge=16, le=4096)] = 1024
+
+    @field_validator("chunk_overlap")
+    def validate_chunk_overlap(cls, v: int, info: ValidationInfo) -> int:
+        chunk_tokens = info.data.get("chunk_tokens", 128)
+        if v >= chunk_tokens:
+            raise ValueError(
+                f'"chunk_overlap" ({v}) must be < "chunk_tokens" ({chunk_tokens})'
+            )
+        return v
+
 
 class CensorshipConfig(BaseConfig):
     enabled: bool = True
@@ -49,6 +65,23 @@ class FloodConfig(BaseConfig):
     mute_time: Annotated[int, Field(ge=30, le=100)] = 30
 
 
+class RaidConfig(BaseConfig):
+    # Opt-in: mutes everyone who joins during a raid.
+    enabled: bool = False
+    join_limit: Repeats = 10
+
+    # Time window in seconds for join raid detection.
+    time_window: Annotated[int, Field(ge=1, le=100)] = 10
+
+    # Seconds the chat stays in raid mode after the last join,
+    # every member who joins meanwhile is muted right away.
+    raid_duration: Annotated[int, Field(ge=30, le=3600)] = 300
+
+    # Telegram treats mutes < 30s as permanent, see FloodConfig.mute_time.
+    # Raids call for longer mutes than flood, so the upper bound is a day.
+    mute_time: Annotated[int, Field(ge=30, le=86400)] = 3600
+
+
 class CapsConfig(BaseConfig):
     enabled: bool = True
     ratio: Ratio = 0.7
@@ -106,3 +139,4 @@ class FiltersConfig(BaseConfig):
     censorship: CensorshipConfig = CensorshipConfig()
     spam: SpamConfig = SpamConfig()
     flood: FloodConfig = FloodConfig()
+    raid: RaidConfig = RaidConfig()
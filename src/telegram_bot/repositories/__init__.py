@@ -4,6 +4,9 @@ These modules read and write chat settings, users, logs, and other data
 directly from the SQLite database.
 """
 
-from .db import init_db
+from .db import close_db, init_db
 
-__all__ = ("init_db",)
+__all__ = (
+    "close_db",
+    "init_db",
+)
@@ -1,16 +1,17 @@
 import json
 
-import aiosqlite
-
 from telegram_bot.models.filters import FiltersConfig
-from telegram_bot.repositories.db import DB_PATH
+from telegram_bot.repositories.db import reader, writer
 
 
 async def get_filters(chat_id: int) -> FiltersConfig:
-    async with aiosqlite.connect(DB_PATH) as db, db.execute(
-        "SELECT filters FROM chat_settings WHERE chat_id=?",
-        (chat_id,),
-    ) as cursor:
+    async with (
+        reader() as db,
+        db.execute(
+            "SELECT filters FROM chat_settings WHERE chat_id=?",
+            (chat_id,),
+        ) as cursor,
+    ):
         row = await cursor.fetchone()
 
     if row is None or row[0] is None:
@@ -21,7 +22,7 @@ async def get_filters(chat_id: int) -> FiltersConfig:
 
 
 async def save_filters(chat_id: int, filters: FiltersConfig) -> None:
-    async with aiosqlite.connect(DB_PATH) as db:
+    async with writer() as db:
         await db.execute(
             """
             INSERT INTO chat_settings (chat_id, filters)
@@ -30,11 +31,10 @@ async def save_filters(chat_id: int, filters: FiltersConfig) -> None:
             """,
             (chat_id, filters.model_dump_json()),
         )
-        await db.commit()
 
 
 async def set_language(chat_id: int, lang: str) -> None:
-    async with aiosqlite.connect(DB_PATH) as db:
+    async with writer() as db:
         default_filters_json = FiltersConfig().model_dump_json()
         await db.execute(
             """
@@ -44,12 +44,31 @@ async def set_language(chat_id: int, lang: str) -> None:
             """,
             (chat_id, lang, default_filters_json),
         )
-        await db.commit()
 
 
 async def get_language(chat_id: int) -> str:
-    async with aiosqlite.connect(DB_PATH) as db, db.execute(
-        "SELECT language FROM chat_settings WHERE chat_id=?", (chat_id,)
-    ) as cursor:
+    async with (
+        reader() as db,
+        db.execute(
+            "SELECT language FROM chat_settings WHERE chat_id=?", (chat_id,)
+        ) as cursor,
+    ):
         row = await cursor.fetchone()
     return "en" if row is None else row[0]
+
+
+async def any_ai_censorship_enabled() -> bool:
+    """Return True if AI censorship is enabled in at least one chat."""
+    async with (
+        reader() as db,
+        db.execute(
+            """
+            SELECT 1 FROM chat_settings
+            WHERE json_extract(filters, '$.censorship.enabled')
+              AND json_extract(filters, '$.censorship.ai.enabled')
+            LIMIT 1
+            """
+        ) as cursor,
+    ):
+        row = await cursor.fetchone()
+    return row is not None
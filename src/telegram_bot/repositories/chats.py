@@ -1,10 +1,8 @@
-import aiosqlite
-
-from telegram_bot.repositories.db import DB_PATH
+from telegram_bot.repositories.db import writer
 
 
 async def add_chat(chat_id: int, title: str | None, type: str):
-    async with aiosqlite.connect(DB_PATH) as db:
+    async with writer() as db:
         await db.execute(
             """
             INSERT INTO chats (chat_id, title, type, bot_member)
@@ -14,4 +12,3 @@ async def add_chat(chat_id: int, title: str | None, type: str):
             """,
             (chat_id, title, type),
         )
-        await db.commit()
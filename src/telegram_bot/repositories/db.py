@@ -1,12 +1,161 @@
-"""Database initialization and global DB settings."""
+"""Database initialization and global DB settings.
+
+All repositories share one long-lived connection manager: a single writer
+connection guarded by a lock and a small pool of reader connections. It is
+opened by `init_db` and must be closed with `close_db` on shutdown.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from dataclasses import dataclass
 
 import aiosqlite
 
 DB_PATH = "settings.db"
 
+# Readers never block each other in WAL mode,
+# so a few connections are enough to serve concurrent handlers.
+READER_POOL_SIZE = 4
+
+
+@dataclass
+class PoolStats:
+    """Accumulated wait times for acquiring a connection."""
+
+    acquisitions: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+    @property
+    def avg_wait(self) -> float:
+        return self.total_wait / self.acquisitions if self.acquisitions else 0.0
+
+    def record(self, wait: float) -> None:
+        self.acquisitions += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+
+class ConnectionManager:
+    """Own the writer connection and the reader pool for one SQLite database."""
+
+    def __init__(self, db_path: str, reader_pool_size: int = READER_POOL_SIZE) -> None:
+        self.db_path = db_path
+        self.reader_pool_size = reader_pool_size
+        self.reader_stats = PoolStats()
+        self.writer_stats = PoolStats()
+
+        self._writer: aiosqlite.Connection | None = None
+        self._writer_lock = asyncio.Lock()
+        self._readers: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue()
+        self._all_readers: list[aiosqlite.Connection] = []
+
+    @property
+    def is_open(self) -> bool:
+        return self._writer is not None
+
+    async def open(self) -> None:
+        """Open the writer connection and fill the reader pool."""
+        if self.is_open:
+            return
+
+        writer = await aiosqlite.connect(self.db_path)
+        await writer.execute("PRAGMA journal_mode=WAL")
+        await writer.execute("PRAGMA synchronous=NORMAL")
+        await writer.execute("PRAGMA busy_timeout=5000")
+        self._writer = writer
+
+        for _ in range(self.reader_pool_size):
+            reader = await aiosqlite.connect(self.db_path)
+            await reader.execute("PRAGMA busy_timeout=5000")
+            self._all_readers.append(reader)
+            self._readers.put_nowait(reader)
+
+    async def close(self) -> None:
+        """Close all connections. Pending transactions are rolled back by SQLite."""
+        for reader in self._all_readers:
+            await reader.close()
+        self._all_readers.clear()
+        self._readers = asyncio.Queue()
+
+        if self._writer is not None:
+            await self._writer.close()
+            self._writer = None
+
+    @asynccontextmanager
+    async def reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Borrow a reader connection from the pool."""
+        if not self.is_open:
+            raise RuntimeError("Database is not initialized, call init_db() first")
 
-async def init_db():
-    async with aiosqlite.connect(DB_PATH) as db:
+        started = time.perf_counter()
+        conn = await self._readers.get()
+        self.reader_stats.record(time.perf_counter() - started)
+        try:
+            yield conn
+        finally:
+            self._readers.put_nowait(conn)
+
+    @asynccontextmanager
+    async def writer(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Run a write transaction on the shared writer connection.
+
+        Commit when the block exits normally and roll back on error.
+        """
+        if self._writer is None:
+            raise RuntimeError("Database is not initialized, call init_db() first")
+
+        started = time.perf_counter()
+        async with self._writer_lock:
+            self.writer_stats.record(time.perf_counter() - started)
+            try:
+                yield self._writer
+            except BaseException:
+                await self._writer.rollback()
+                raise
+            else:
+                await self._writer.commit()
+
+    def log_stats(self) -> None:
+        stats_by_name = {"reader": self.reader_stats, "writer": self.writer_stats}
+        for name, stats in stats_by_name.items():
+            logging.info(
+                f"DB {name} pool: {stats.acquisitions} acquisitions, "
+                f"avg wait {stats.avg_wait * 1000:.3f} ms, "
+                f"max wait {stats.max_wait * 1000:.3f} ms"
+            )
+
+
+_manager = ConnectionManager(DB_PATH)
+
+
+def reader() -> AbstractAsyncContextManager[aiosqlite.Connection]:
+    """Borrow a pooled reader connection from the shared manager."""
+    return _manager.reader()
+
+
+def writer() -> AbstractAsyncContextManager[aiosqlite.Connection]:
+    """Open a write transaction on the shared writer connection."""
+    return _manager.writer()
+
+
+def get_pool_stats() -> dict[str, PoolStats]:
+    """Return wait-time statistics for the reader pool and the writer lock."""
+    return {"reader": _manager.reader_stats, "writer": _manager.writer_stats}
+
+
+async def init_db(db_path: str = DB_PATH) -> None:
+    """Open the shared connections and create missing tables."""
+    global _manager
+    if _manager.is_open:
+        await _manager.close()
+    _manager = ConnectionManager(db_path)
+    await _manager.open()
+
+    async with _manager.writer() as db:
         await db.execute(
             """
             CREATE TABLE IF NOT EXISTS logs (
@@ -84,4 +233,10 @@ async def init_db():
             )
             """
         )
-        await db.commit()
+
+
+async def close_db() -> None:
+    """Close the shared connections and report pool statistics."""
+    if _manager.is_open:
+        _manager.log_stats()
+        await _manager.close()
@@ -1,36 +1,42 @@
-import aiosqlite
-
 from telegram_bot.models.log import Log
-from telegram_bot.repositories.db import DB_PATH
+from telegram_bot.repositories.db import writer
+
+INSERT_LOG_SQL = """
+    INSERT INTO logs (
+        chat_id,
+        status,
+        action_name,
+        called_by_id,
+        target_id,
+        msg_text,
+        msg_link,
+        details,
+        timestamp
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _log_row(log: Log) -> tuple[object, ...]:
+    return (
+        log.chat_id,
+        log.status.value,
+        log.action_name,
+        log.called_by_id,
+        log.target_id,
+        log.msg_text,
+        log.msg_link,
+        log.details,
+        log.timestamp,
+    )
 
 
 async def add_log(log: Log):
-    async with aiosqlite.connect(DB_PATH) as db:
-        await db.execute(
-            """
-            INSERT INTO logs (
-                chat_id,
-                status,
-                action_name,
-                called_by_id,
-                target_id,
-                msg_text,
-                msg_link,
-                details,
-                timestamp
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                log.chat_id,
-                log.status.value,
-                log.action_name,
-                log.called_by_id,
-                log.target_id,
-                log.msg_text,
-                log.msg_link,
-                log.details,
-                log.timestamp,
-            ),
-        )
-        await db.commit()
+    async with writer() as db:
+        await db.execute(INSERT_LOG_SQL, _log_row(log))
+
+
+async def add_logs(logs: list[Log]) -> None:
+    """Insert several log entries in a single transaction."""
+    async with writer() as db:
+        await db.executemany(INSERT_LOG_SQL, [_log_row(log) for log in logs])
@@ -1,12 +1,12 @@
-import aiosqlite
-
 from telegram_bot.models.user import UserDTO
-from telegram_bot.repositories.db import DB_PATH
+from telegram_bot.repositories.db import reader, writer
+
+MAX_QUERY_PARAMS = 500
 
 
 async def get_user_by_username(username: str) -> UserDTO | None:
     async with (
-        aiosqlite.connect(DB_PATH) as db,
+        reader() as db,
         db.execute(
             """
             SELECT id, username, full_name, link, updated_at
@@ -24,9 +24,37 @@ async def get_user_by_username(username: str) -> UserDTO | None:
     )
 
 
+async def get_users_by_usernames(usernames: list[str]) -> dict[str, UserDTO]:
+    """Return the known users among the given usernames, keyed by username."""
+    users: dict[str, UserDTO] = {}
+    unique = list(dict.fromkeys(usernames))
+    async with reader() as db:
+        # Stay below SQLite's limit on the number of query parameters.
+        for i in range(0, len(unique), MAX_QUERY_PARAMS):
+            batch = unique[i : i + MAX_QUERY_PARAMS]
+            placeholders = ", ".join("?" * len(batch))
+            async with db.execute(
+                f"""
+                SELECT id, username, full_name, link, updated_at
+                FROM users
+                WHERE username IN ({placeholders})
+                """,
+                batch,
+            ) as cursor:
+                async for row in cursor:
+                    users[row[1]] = UserDTO(
+                        id=row[0],
+                        username=row[1],
+                        full_name=row[2],
+                        link=row[3],
+                        updated_at=row[4],
+                    )
+    return users
+
+
 async def get_user_by_id(user_id: int) -> UserDTO | None:
     async with (
-        aiosqlite.connect(DB_PATH) as db,
+        reader() as db,
         db.execute(
             "SELECT id, username, full_name, link, updated_at FROM users WHERE id = ?",
             (user_id,),
@@ -44,7 +72,7 @@ async def upsert_user(
     user_id: int, username: str, full_name: str, updated_at: str
 ) -> None:
     link = f"https://t.me/{username}" if username else ""
-    async with aiosqlite.connect(DB_PATH) as db:
+    async with writer() as db:
         await db.execute(
             """
         INSERT INTO users (id, username, full_name, link, updated_at)
@@ -57,17 +85,42 @@ async def upsert_user(
         """,
             (user_id, username, full_name, link, updated_at),
         )
-        await db.commit()
+
+
+async def upsert_users(users: list[tuple[int, str, str]], updated_at: str) -> None:
+    """Create or update many users, given as (id, username, full_name), at once."""
+    rows = [
+        (
+            user_id,
+            username,
+            full_name,
+            f"https://t.me/{username}" if username else "",
+            updated_at,
+        )
+        for user_id, username, full_name in users
+    ]
+    async with writer() as db:
+        await db.executemany(
+            """
+        INSERT INTO users (id, username, full_name, link, updated_at)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(id) DO UPDATE SET
+            username=excluded.username,
+            full_name=excluded.full_name,
+            link=excluded.link,
+            updated_at=excluded.updated_at
+        """,
+            rows,
+        )
 
 
 async def remove_user(user_id: int):
-    async with aiosqlite.connect(DB_PATH) as db:
+    async with writer() as db:
         await db.execute("DELETE FROM users WHERE id = ?", (user_id,))
-        await db.commit()
 
 
 async def add_user_chat(chat_id: int, user_id: int, is_admin: int | None = None):
-    async with aiosqlite.connect(DB_PATH) as db:
+    async with writer() as db:
         await db.execute(
             """
         INSERT INTO user_chats (chat_id, user_id, is_admin)
@@ -80,13 +133,11 @@ async def add_user_chat(chat_id: int, user_id: int, is_admin: int | None = None)
         """,
             (chat_id, user_id, is_admin if is_admin is not None else 0),
         )
-        await db.commit()
 
 
 async def remove_user_chat(chat_id: int, user_id: int):
-    async with aiosqlite.connect(DB_PATH) as db:
+    async with writer() as db:
         await db.execute(
             "DELETE FROM user_chats WHERE chat_id = ? AND user_id = ?",
             (chat_id, user_id),
         )
-        await db.commit()
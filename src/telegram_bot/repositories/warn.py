@@ -1,11 +1,9 @@
-import aiosqlite
-
-from telegram_bot.repositories.db import DB_PATH
+from telegram_bot.repositories.db import reader, writer
 
 
 async def get_warnings(chat_id: int, user_id: int) -> int:
     async with (
-        aiosqlite.connect(DB_PATH) as db,
+        reader() as db,
         db.execute(
             "SELECT warning_count FROM warnings WHERE chat_id = ? AND user_id = ?",
             (chat_id, user_id),
@@ -16,7 +14,7 @@ async def get_warnings(chat_id: int, user_id: int) -> int:
 
 
 async def add_warning(chat_id: int, user_id: int):
-    async with aiosqlite.connect(DB_PATH) as db:
+    async with writer() as db:
         await db.execute(
             """
         INSERT INTO warnings (chat_id, user_id, warning_count)
@@ -26,12 +24,10 @@ async def add_warning(chat_id: int, user_id: int):
         """,
             (chat_id, user_id),
         )
-        await db.commit()
 
 
 async def reset_warnings(chat_id: int, user_id: int):
-    async with aiosqlite.connect(DB_PATH) as db:
+    async with writer() as db:
         await db.execute(
             "DELETE FROM warnings WHERE chat_id = ? AND user_id = ?", (chat_id, user_id)
         )
-        await db.commit()
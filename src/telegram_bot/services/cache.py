@@ -0,0 +1,151 @@
+"""Small in-process caches shared by services."""
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size: int = 0
+    bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class TTLCache(Generic[K, V]):
+    """Bounded LRU cache whose entries expire `ttl` seconds after being stored.
+
+    With `max_bytes`, the estimated size of the stored values, as reported by
+    `sizeof`, is bounded as well.
+
+    Read-through callers should take `generation(key)` before loading a value
+    and pass it to `set`, so a write or invalidation that happened while they
+    were loading is not overwritten with stale data. The bookkeeping for this
+    is bounded by `maxsize` as well: once it is exceeded, a value loaded
+    before the forgotten changes is dropped, never wrongly stored.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        max_bytes: int | None = None,
+        sizeof: Callable[[V], int] | None = None,
+    ) -> None:
+        if max_bytes is not None and sizeof is None:
+            raise ValueError("max_bytes requires a sizeof function")
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.stats = CacheStats()
+        # {key: (expires_at, value, size, generation it was stored at)}
+        self._data: OrderedDict[K, tuple[float, V, int, int]] = OrderedDict()
+        # Bumped on every set, invalidate and clear.
+        self._generation = 0
+        # Generations at which keys that are no longer stored were last changed,
+        # at most `maxsize` of them. Older keys are covered by `_floor`.
+        self._removed: OrderedDict[K, int] = OrderedDict()
+        self._floor = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: K) -> V | None:
+        """Return a fresh cached value and mark it as recently used."""
+        entry = self._data.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+
+        expires_at, value, _, _ = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.stats.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def generation(self, key: K) -> int:
+        """Return a token to pass to `set` after loading the value of `key`."""
+        return self._generation
+
+    def set(self, key: K, value: V, generation: int | None = None) -> None:
+        """Store a value, evicting the least recently used entries if needed.
+
+        With `generation`, the value is dropped if the key was stored or
+        invalidated since that generation was taken.
+        """
+        if generation is not None and self._changed_at(key) > generation:
+            return
+
+        self._generation += 1
+        if key in self._data:
+            self._remove(key)
+        self._removed.pop(key, None)
+
+        size = self.sizeof(value) if self.sizeof is not None else 0
+        self._data[key] = (time.monotonic() + self.ttl, value, size, self._generation)
+        self.stats.bytes += size
+
+        while len(self._data) > self.maxsize or (
+            self.max_bytes is not None and self.stats.bytes > self.max_bytes
+        ):
+            oldest = next(iter(self._data))
+            self._remove(oldest)
+            self.stats.evictions += 1
+
+        self.stats.size = len(self._data)
+
+    def invalidate(self, key: K) -> None:
+        self._generation += 1
+        if key in self._data:
+            self._remove(key)
+        self._forget(key, self._generation)
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._floor = self._generation
+        self._data.clear()
+        self._removed.clear()
+        self.stats.size = 0
+        self.stats.bytes = 0
+
+    def _changed_at(self, key: K) -> int:
+        entry = self._data.get(key)
+        if entry is not None:
+            return entry[3]
+        return self._removed.get(key, self._floor)
+
+    def _remove(self, key: K) -> None:
+        _, _, size, generation = self._data.pop(key)
+        self.stats.bytes -= size
+        self.stats.size = len(self._data)
+        self._forget(key, generation)
+
+    def _forget(self, key: K, generation: int) -> None:
+        """Remember when a removed key last changed, within `maxsize` keys.
+
+        Dropping the oldest ones raises `_floor`, so a load that started
+        before them is refused rather than trusted.
+        """
+        self._removed[key] = generation
+        self._removed.move_to_end(key)
+        while len(self._removed) > self.maxsize:
+            _, dropped = self._removed.popitem(last=False)
+            self._floor = max(self._floor, dropped)
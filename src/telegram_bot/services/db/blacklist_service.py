@@ -1,5 +1,7 @@
 import logging
+from typing import TYPE_CHECKING
 
+from telegram_bot.models.filters import CensorshipConfig
 from telegram_bot.repositories.blacklist import (
     add_blacklist_word as repo_add_blacklist_word,
 )
@@ -9,6 +11,20 @@ from telegram_bot.repositories.blacklist import (
 from telegram_bot.repositories.blacklist import (
     remove_blacklist_word as repo_remove_blacklist_word,
 )
+from telegram_bot.services.cache import CacheStats, TTLCache
+
+if TYPE_CHECKING:
+    from telegram_bot.handlers.moderation.filters.censorship import CompiledBlacklist
+
+# Compiled blacklists are invalidated on every change made through this service;
+# the TTL only bounds staleness from writers in other processes.
+_compiled_cache: "TTLCache[int, CompiledBlacklist]" = TTLCache(
+    maxsize=10_000, ttl=600.0
+)
+
+
+def get_compiled_blacklist_cache_stats() -> CacheStats:
+    return _compiled_cache.stats
 
 
 async def add_blacklist_word(chat_id: int, word: str) -> None:
@@ -17,6 +33,7 @@ async def add_blacklist_word(chat_id: int, word: str) -> None:
         await repo_add_blacklist_word(chat_id, word)
     except Exception:
         logging.exception(f"Failed to add word ({word}) to blacklist.")
+    _compiled_cache.invalidate(chat_id)
 
 
 async def remove_blacklist_word(chat_id: int, word: str) -> None:
@@ -25,6 +42,7 @@ async def remove_blacklist_word(chat_id: int, word: str) -> None:
         await repo_remove_blacklist_word(chat_id, word)
     except Exception:
         logging.exception(f"Failed to remove word ({word}) from blacklist.")
+    _compiled_cache.invalidate(chat_id)
 
 
 async def get_blacklist_words(chat_id: int) -> list[str]:
@@ -34,3 +52,35 @@ async def get_blacklist_words(chat_id: int) -> list[str]:
     except Exception:
         logging.exception("Failed to get blacklisted words.")
         return []
+
+
+async def get_compiled_blacklist(
+    chat_id: int, config: CensorshipConfig
+) -> "CompiledBlacklist":
+    """Return the chat's blacklist normalized for the given censorship settings.
+
+    The compiled blacklist is built once and cached until the blacklist changes.
+    """
+    # Imported lazily: the filters package lives under handlers,
+    # which import this module.
+    from telegram_bot.handlers.moderation.filters.censorship import (
+        CompiledBlacklist,
+    )
+
+    compiled = _compiled_cache.get(chat_id)
+    if compiled is not None and compiled.is_compatible(config):
+        return compiled
+
+    # A word added or removed while loading bumps the generation,
+    # so the blacklist compiled from the old words is not cached.
+    generation = _compiled_cache.generation(chat_id)
+    try:
+        words = await repo_get_blacklist_words(chat_id)
+    except Exception:
+        # Not cached, so the next message retries instead of going uncensored.
+        logging.exception("Failed to get blacklisted words.")
+        return CompiledBlacklist.build([], config)
+
+    compiled = CompiledBlacklist.build(words, config)
+    _compiled_cache.set(chat_id, compiled, generation)
+    return compiled
@@ -2,34 +2,74 @@ import logging
 
 from telegram_bot.models.filters import FiltersConfig
 from telegram_bot.repositories.chat_settings import (
+    any_ai_censorship_enabled,
     get_filters,
     get_language,
     save_filters,
     set_language,
 )
+from telegram_bot.services.cache import CacheStats, TTLCache
+
+# Chat settings change rarely but are read on every message, so keep them in memory.
+# Writes below update the caches; the TTL only bounds staleness from other writers.
+SETTINGS_CACHE_SIZE = 10_000
+SETTINGS_CACHE_TTL = 300.0
+
+_language_cache: TTLCache[int, str] = TTLCache(SETTINGS_CACHE_SIZE, SETTINGS_CACHE_TTL)
+_filters_cache: TTLCache[int, FiltersConfig] = TTLCache(
+    SETTINGS_CACHE_SIZE, SETTINGS_CACHE_TTL
+)
+
+
+def get_chat_settings_cache_stats() -> dict[str, CacheStats]:
+    """Return hit/miss counters for the language and filters caches."""
+    return {"language": _language_cache.stats, "filters": _filters_cache.stats}
+
+
+def clear_chat_settings_cache() -> None:
+    _language_cache.clear()
+    _filters_cache.clear()
 
 
 async def set_chat_language(chat_id: int, lang: str) -> None:
     """Set the language for a chat"""
     try:
         await set_language(chat_id, lang)
+        _language_cache.set(chat_id, lang)
     except Exception:
+        _language_cache.invalidate(chat_id)
         logging.exception("Failed to set chat language")
 
 
 async def get_chat_language(chat_id: int) -> str:
     """Return the language for a chat with a safe default."""
+    if (lang := _language_cache.get(chat_id)) is not None:
+        return lang
+
+    generation = _language_cache.generation(chat_id)
     try:
-        return await get_language(chat_id)
+        lang = await get_language(chat_id)
+        _language_cache.set(chat_id, lang, generation)
+        return lang
     except Exception:
         logging.exception("Failed to get chat language")
         return "en"
 
 
 async def get_chat_filters(chat_id: int) -> FiltersConfig:
-    """Return filter configuration for a chat with a safe default."""
+    """Return filter configuration for a chat with a safe default.
+
+    The returned object is shared with the cache and must not be mutated;
+    copy it before changing settings.
+    """
+    if (filters := _filters_cache.get(chat_id)) is not None:
+        return filters
+
+    generation = _filters_cache.generation(chat_id)
     try:
-        return await get_filters(chat_id)
+        filters = await get_filters(chat_id)
+        _filters_cache.set(chat_id, filters, generation)
+        return filters
     except Exception:
         logging.exception("Failed to get chat filters")
         return FiltersConfig()
@@ -39,7 +79,9 @@ async def save_chat_filters(chat_id: int, filters: FiltersConfig) -> None:
     """Persist filter configuration for a chat"""
     try:
         await save_filters(chat_id, filters)
+        _filters_cache.set(chat_id, filters)
     except Exception:
+        _filters_cache.invalidate(chat_id)
         logging.exception("Failed to get chat filters")
 
 
@@ -47,20 +89,36 @@ async def save_chat_filters(chat_id: int, filters: FiltersConfig) -> None:
 # and do not talk to the repository directly.
 async def set_chat_censorship(chat_id: int, enabled: bool) -> None:
     """Enable or disable text censorship filters for a chat."""
-    filters = await get_chat_filters(chat_id)
+    filters = (await get_chat_filters(chat_id)).model_copy(deep=True)
     filters.censorship.enabled = enabled
     await save_chat_filters(chat_id, filters)
 
 
 async def set_chat_antispam(chat_id: int, enabled: bool) -> None:
     """Enable or disable spam detection filters for a chat."""
-    filters = await get_chat_filters(chat_id)
+    filters = (await get_chat_filters(chat_id)).model_copy(deep=True)
     filters.spam.enabled = enabled
     await save_chat_filters(chat_id, filters)
 
 
 async def set_chat_ai_censorship(chat_id: int, enabled: bool) -> None:
     """Enable or disable AI-based censorship for a chat."""
-    filters = await get_chat_filters(chat_id)
+    filters = (await get_chat_filters(chat_id)).model_copy(deep=True)
     filters.censorship.ai.enabled = enabled
     await save_chat_filters(chat_id, filters)
+
+
+async def set_chat_raid_protection(chat_id: int, enabled: bool) -> None:
+    """Enable or disable join raid protection for a chat."""
+    filters = (await get_chat_filters(chat_id)).model_copy(deep=True)
+    filters.raid.enabled = enabled
+    await save_chat_filters(chat_id, filters)
+
+
+async def is_ai_censorship_used() -> bool:
+    """Return True if any chat has AI censorship enabled, False on errors."""
+    try:
+        return await any_ai_censorship_enabled()
+    except Exception:
+        logging.exception("Failed to check AI censorship settings")
+        return False
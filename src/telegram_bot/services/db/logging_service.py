@@ -1,12 +1,152 @@
+import asyncio
+import contextlib
 import logging
+from collections import deque
 
+from telegram_bot.config import LogOverflowPolicy
 from telegram_bot.models.log import Log
-from telegram_bot.repositories.logs import add_log
+from telegram_bot.repositories.logs import add_log, add_logs
+
+
+class LogSink:
+    """Buffer moderation logs and write them in batches.
+
+    A background task flushes the buffer with a single transaction once
+    `flush_size` entries are queued or `flush_interval` seconds have passed
+    since the first pending entry arrived. When the buffer is full, "block"
+    makes producers wait for the writer and "drop_oldest" discards old entries.
+    """
+
+    def __init__(
+        self,
+        flush_size: int = 50,
+        flush_interval: float = 1.0,
+        max_queue_size: int = 10_000,
+        overflow_policy: LogOverflowPolicy = "block",
+    ) -> None:
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.max_queue_size = max_queue_size
+        self.overflow_policy = overflow_policy
+
+        self.flushed = 0
+        self.dropped = 0
+        self.batches = 0
+
+        self._buffer: deque[Log] = deque()
+        self._cond = asyncio.Condition()
+        self._closed = False
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._closed
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def put(self, log: Log) -> None:
+        """Queue a log entry, applying the overflow policy when the buffer is full."""
+        async with self._cond:
+            if len(self._buffer) >= self.max_queue_size:
+                if self.overflow_policy == "drop_oldest":
+                    self._buffer.popleft()
+                    self.dropped += 1
+                else:
+                    await self._cond.wait_for(
+                        lambda: len(self._buffer) < self.max_queue_size or self._closed
+                    )
+
+            self._buffer.append(log)
+            self._cond.notify_all()
+
+    async def stop(self) -> None:
+        """Flush everything that is still buffered and stop the writer task."""
+        async with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+        # Producers blocked on a full buffer may append after the writer exits.
+        if self._buffer:
+            batch = list(self._buffer)
+            self._buffer.clear()
+            await self._write(batch)
+
+    async def _run(self) -> None:
+        while True:
+            async with self._cond:
+                await self._cond.wait_for(lambda: bool(self._buffer) or self._closed)
+                if not self._buffer:
+                    return
+
+                if len(self._buffer) < self.flush_size and not self._closed:
+                    # asyncio.TimeoutError is not the builtin one before 3.11.
+                    with contextlib.suppress(asyncio.TimeoutError):
+                        await asyncio.wait_for(
+                            self._cond.wait_for(
+                                lambda: (
+                                    len(self._buffer) >= self.flush_size or self._closed
+                                )
+                            ),
+                            timeout=self.flush_interval,
+                        )
+
+                count = min(len(self._buffer), self.flush_size)
+                batch = [self._buffer.popleft() for _ in range(count)]
+                self._cond.notify_all()
+
+            await self._write(batch)
+
+    async def _write(self, batch: list[Log]) -> None:
+        try:
+            await add_logs(batch)
+            self.flushed += len(batch)
+            self.batches += 1
+        except Exception as e:
+            self.dropped += len(batch)
+            logging.exception(f"Failed to flush {len(batch)} logs: {e}")
+
+
+_sink: LogSink | None = None
+
+
+def start_log_sink(
+    overflow_policy: LogOverflowPolicy = "block",
+    flush_size: int = 50,
+    flush_interval: float = 1.0,
+    max_queue_size: int = 10_000,
+) -> LogSink:
+    """Start buffering logs written through register_log."""
+    global _sink
+    if _sink is None:
+        _sink = LogSink(flush_size, flush_interval, max_queue_size, overflow_policy)
+        _sink.start()
+    return _sink
+
+
+async def stop_log_sink() -> None:
+    """Flush pending logs and fall back to direct writes."""
+    global _sink
+    if _sink is not None:
+        sink, _sink = _sink, None
+        await sink.stop()
+        logging.info(
+            f"Log sink stopped: {sink.flushed} logs in {sink.batches} batches, "
+            f"{sink.dropped} dropped"
+        )
 
 
 async def register_log(log: Log) -> None:
     """Store a moderation log entry in the database."""
     try:
-        await add_log(log)
+        if _sink is not None and _sink.running:
+            await _sink.put(log)
+        else:
+            await add_log(log)
     except Exception as e:
         logging.exception(f"Failed to register log: {e}")
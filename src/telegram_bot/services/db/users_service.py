@@ -5,7 +5,9 @@ from telegram_bot.models.user import UserDTO
 from telegram_bot.repositories.users import (
     get_user_by_id,
     get_user_by_username,
+    get_users_by_usernames,
     upsert_user,
+    upsert_users,
 )
 
 
@@ -26,6 +28,15 @@ async def get_user(
         return None
 
 
+async def get_users(usernames: list[str]) -> dict[str, UserDTO]:
+    """Return the known users among the given usernames, keyed by username."""
+    try:
+        return await get_users_by_usernames(usernames)
+    except Exception as e:
+        logging.exception(f"Failed to resolve users {usernames}: {e}")
+        return {}
+
+
 async def register_user(user: UserDTO) -> None:
     """Create or update a user record in the database."""
     try:
@@ -43,3 +54,16 @@ async def register_user(user: UserDTO) -> None:
                 "username": getattr(user, "username", None),
             },
         )
+
+
+async def register_users(users: list[UserDTO]) -> None:
+    """Create or update many user records with a single write."""
+    if not users:
+        return
+    try:
+        await upsert_users(
+            [(user.id, user.username or "", user.full_name) for user in users],
+            updated_at=datetime.now().strftime("%d/%m/%Y, %H:%M:%S"),
+        )
+    except Exception as e:
+        logging.exception(f"Failed to register {len(users)} users: {e}")
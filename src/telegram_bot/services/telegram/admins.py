@@ -0,0 +1,78 @@
+"""Per-chat roster of administrators, so admin checks need no Bot API call.
+
+A roster is loaded in bulk with get_chat_administrators, kept current by
+chat_member updates and refreshed after ADMIN_ROSTER_TTL in case an update
+was missed (the bot only receives them while it is an administrator).
+"""
+
+import logging
+from collections.abc import Iterable
+
+from aiogram import Bot
+from aiogram.types import ChatMember, ChatMemberUpdated
+
+from telegram_bot.services.cache import CacheStats, TTLCache
+
+ADMIN_ROSTER_SIZE = 10_000
+ADMIN_ROSTER_TTL = 600.0
+
+ADMIN_STATUSES = ("administrator", "creator")
+
+_rosters: TTLCache[int, frozenset[int]] = TTLCache(ADMIN_ROSTER_SIZE, ADMIN_ROSTER_TTL)
+
+
+def get_admin_roster_cache_stats() -> CacheStats:
+    return _rosters.stats
+
+
+def clear_admin_rosters() -> None:
+    _rosters.clear()
+
+
+def seed_chat_admins(chat_id: int, admins: Iterable[ChatMember]) -> None:
+    """Store the result of a get_chat_administrators call as the chat's roster."""
+    _rosters.set(chat_id, frozenset(admin.user.id for admin in admins))
+
+
+def apply_chat_member_update(update: ChatMemberUpdated) -> None:
+    """Add or remove the member from the chat's roster if it is cached.
+
+    Otherwise the roster is invalidated, so one loaded from before the
+    change is not cached.
+    """
+    roster = _rosters.get(update.chat.id)
+    if roster is None:
+        _rosters.invalidate(update.chat.id)
+        return
+
+    user_id = update.new_chat_member.user.id
+    if update.new_chat_member.status in ADMIN_STATUSES:
+        roster = roster | {user_id}
+    else:
+        roster = roster - {user_id}
+    _rosters.set(update.chat.id, roster)
+
+
+async def get_chat_admin_ids(bot: Bot, chat_id: int) -> frozenset[int]:
+    """Return the ids of the chat's administrators, loading them if needed."""
+    if (roster := _rosters.get(chat_id)) is not None:
+        return roster
+
+    # An update that arrives while loading must not be overwritten.
+    generation = _rosters.generation(chat_id)
+    admins = await bot.get_chat_administrators(chat_id)
+    roster = frozenset(admin.user.id for admin in admins)
+    _rosters.set(chat_id, roster, generation)
+    return roster
+
+
+async def is_chat_admin(bot: Bot, chat_id: int, user_id: int) -> bool:
+    """Return True if the user is an administrator or the creator of the chat."""
+    try:
+        return user_id in await get_chat_admin_ids(bot, chat_id)
+    except Exception as e:
+        # E.g. private chats have no administrators to list.
+        logging.warning(f"Failed to load administrators of chat {chat_id}: {e}")
+
+    member = await bot.get_chat_member(chat_id, user_id)
+    return member.status in ADMIN_STATUSES
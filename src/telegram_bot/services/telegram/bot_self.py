@@ -0,0 +1,67 @@
+"""The bot's own identity and its rights in each chat.
+
+The identity is resolved once at startup. The bot's member record in a chat
+is cached and replaced by my_chat_member updates, which Telegram always sends
+to the bot when its status or rights change.
+"""
+
+from aiogram import Bot
+from aiogram.types import ChatMember, ChatMemberAdministrator, ChatMemberUpdated, User
+
+from telegram_bot.services.cache import CacheStats, TTLCache
+
+BOT_MEMBER_CACHE_SIZE = 10_000
+# Only a safety net for updates missed while the bot was offline.
+BOT_MEMBER_TTL = 3600.0
+
+
+class BotSelf:
+    """Cached answers to getMe and getChatMember for the bot itself."""
+
+    def __init__(self) -> None:
+        self._user: User | None = None
+        self._members: TTLCache[int, ChatMember] = TTLCache(
+            BOT_MEMBER_CACHE_SIZE, BOT_MEMBER_TTL
+        )
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._members.stats
+
+    def set_user(self, user: User) -> None:
+        self._user = user
+
+    def clear(self) -> None:
+        self._user = None
+        self._members.clear()
+
+    async def get_user(self, bot: Bot) -> User:
+        """Return the bot's user, calling getMe only if it is not known yet."""
+        if self._user is None:
+            self._user = await bot.get_me()
+        return self._user
+
+    async def get_member(self, bot: Bot, chat_id: int) -> ChatMember:
+        """Return the bot's member record in the chat."""
+        if (member := self._members.get(chat_id)) is not None:
+            return member
+
+        # A my_chat_member update that arrives while loading must win.
+        generation = self._members.generation(chat_id)
+        member = await bot.get_chat_member(chat_id, bot.id)
+        self._members.set(chat_id, member, generation)
+        return member
+
+    async def can_restrict(self, bot: Bot, chat_id: int) -> bool:
+        """Return True if the bot is an administrator allowed to restrict members."""
+        member = await self.get_member(bot, chat_id)
+        return (
+            isinstance(member, ChatMemberAdministrator) and member.can_restrict_members
+        )
+
+    def apply_update(self, update: ChatMemberUpdated) -> None:
+        """Store the bot's new member record from a my_chat_member update."""
+        self._members.set(update.chat.id, update.new_chat_member)
+
+
+bot_self = BotSelf()
@@ -57,6 +57,26 @@ def build_filters_summary(filters: FiltersConfig, lang: str) -> str:
         ),
     ]
 
+    raid = filters.raid
+    raid_block: list[str] = [
+        t(
+            "moderation.filters.raid.header",
+            lang,
+            state=_on_off(raid.enabled, lang),
+        ),
+        t(
+            "moderation.filters.raid.limit",
+            lang,
+            limit=str(raid.join_limit),
+            window=str(raid.time_window),
+        ),
+        t(
+            "moderation.filters.raid.mute",
+            lang,
+            mute=str(raid.mute_time),
+        ),
+    ]
+
     spam = filters.spam
     spam_block: list[str] = [
         t(
@@ -90,5 +110,6 @@ def build_filters_summary(filters: FiltersConfig, lang: str) -> str:
     ]
 
     return "\n\n".join(
-        "\n".join(block) for block in (censorship_block, flood_block, spam_block)
+        "\n".join(block)
+        for block in (censorship_block, flood_block, raid_block, spam_block)
     )
@@ -0,0 +1,96 @@
+"""Chat facts needed to moderate one update, each looked up at most once.
+
+ModerationContextMiddleware creates a context for every message and callback
+query. The guards, the handler and process_action share it, so stacked
+checks do not repeat the same database reads and Bot API calls.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar, Token
+from typing import Any, TypeVar
+
+from aiogram import Bot
+
+from telegram_bot.models.filters import FiltersConfig
+from telegram_bot.services.db.chat_settings_service import (
+    get_chat_filters,
+    get_chat_language,
+)
+from telegram_bot.services.telegram.admins import is_chat_admin
+from telegram_bot.services.telegram.bot_self import bot_self
+
+T = TypeVar("T")
+
+_current: ContextVar["ModerationContext | None"] = ContextVar(
+    "moderation_context", default=None
+)
+
+
+class ModerationContext:
+    """Lazily loaded language, filters and permissions of one chat and caller."""
+
+    def __init__(self, bot: Bot | None, chat_id: int, user_id: int | None) -> None:
+        self.bot = bot
+        self.chat_id = chat_id
+        self.user_id = user_id
+        self._lookups: dict[str, asyncio.Future[Any]] = {}
+
+    async def _once(self, name: str, load: Callable[[], Awaitable[T]]) -> T:
+        # Share the lookup, so concurrent callers do not start a second one.
+        if name not in self._lookups:
+            self._lookups[name] = asyncio.ensure_future(load())
+        return await asyncio.shield(self._lookups[name])
+
+    async def language(self) -> str:
+        return await self._once("language", lambda: get_chat_language(self.chat_id))
+
+    async def filters(self) -> FiltersConfig:
+        return await self._once("filters", lambda: get_chat_filters(self.chat_id))
+
+    async def user_is_admin(self) -> bool:
+        """Return True if the caller administers the chat."""
+        bot, user_id = self.bot, self.user_id
+        if bot is None or user_id is None:
+            return False
+        return await self._once(
+            "user_is_admin", lambda: is_chat_admin(bot, self.chat_id, user_id)
+        )
+
+    async def bot_can_restrict(self) -> bool:
+        """Return True if the bot may restrict members of the chat."""
+        bot = self.bot
+        if bot is None:
+            return False
+        return await self._once(
+            "bot_can_restrict", lambda: bot_self.can_restrict(bot, self.chat_id)
+        )
+
+
+def set_moderation_context(
+    context: ModerationContext | None,
+) -> Token["ModerationContext | None"]:
+    """Make `context` current for the running task, return a token to reset it."""
+    return _current.set(context)
+
+
+def reset_moderation_context(token: Token["ModerationContext | None"]) -> None:
+    _current.reset(token)
+
+
+def get_moderation_context(
+    bot: Bot | None, chat_id: int, user_id: int | None
+) -> ModerationContext:
+    """Return the current update's context if it matches, else a new one.
+
+    Code that runs outside the middleware, such as tests, still works, it only
+    loses the sharing.
+    """
+    context = _current.get()
+    if (
+        context is not None
+        and context.chat_id == chat_id
+        and context.user_id == user_id
+    ):
+        return context
+    return ModerationContext(bot, chat_id, user_id)
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from collections.abc import Awaitable, Callable
 
@@ -16,14 +17,18 @@ from aiogram.types import (
 from telegram_bot.handlers.moderation.commands.utils.parsing import parse_duration
 from telegram_bot.i18n import t
 from telegram_bot.models.log import ActionStatus, Log
-from telegram_bot.services.db.chat_settings_service import get_chat_language
 from telegram_bot.services.db.logging_service import register_log
 from telegram_bot.services.telegram.build_messages import build_action_messages
 from telegram_bot.services.telegram.display import get_display_name
 from telegram_bot.services.telegram.message_links import get_message_link
+from telegram_bot.services.telegram.moderation_context import get_moderation_context
 from telegram_bot.services.telegram.resolve_targets import get_target_members
 from telegram_bot.services.telegram.types import ActionLiteral, ChatMemberTypes
 
+# Targets of one command acted on at the same time. Kept small so bulk
+# commands stay well below Telegram's flood limits for a single chat.
+MAX_CONCURRENT_TARGETS = 5
+
 
 def _split_text_and_parse_reason(text: str) -> tuple[str, str | None]:
     """Split command text into body and optional reason (last line)."""
@@ -89,7 +94,7 @@ async def process_action(
         List of acted users only for warn action
     """
     chat_id = message.chat.id
-    lang = await get_chat_language(chat_id)
+    lang = await get_moderation_context(bot, chat_id, admin_user.id).language()
 
     text, reason = _split_text_and_parse_reason(text)
     text, duration = _split_text_and_parse_duration(text)
@@ -151,67 +156,96 @@ async def process_targets(
 ) -> tuple[list[User], list[str], list[str]]:
     """Process a list of target members for a moderation action.
 
-    Apply the specified action to each valid target member.
+    Apply the specified action to each valid target member. Up to
+    MAX_CONCURRENT_TARGETS members are processed at the same time, a failed
+    action only affects its own target. The returned lists keep the order
+    of `target_members`.
 
     Return:
         A tuple containing lists of acted users,
         skipped member names, and unknown member names.
     """
-    acted_users: list[User] = []
-    skipped_members_names: list[str] = []
-    unknown_members_names: list[str] = []
-
     for target_member in target_members:
-        if isinstance(target_member, str):
-            unknown_members_names.append(target_member)
-            continue
-
-        if not isinstance(target_member, ChatMemberTypes):
+        if not isinstance(target_member, str | ChatMemberTypes):
             raise RuntimeError(
                 f"Unexpected ChatMember type: {type(target_member).__name__}. \
                 Expected one of: {ChatMemberTypes}"
             )
 
-        if _should_skip_target(target_member, bot.id, admin_user.id):
-            skipped_members_names.append(get_display_name(target_member.user))
-            log = Log(
-                chat_id=chat_id,
-                status=ActionStatus.SKIPPED,
-                action_name=action_name,
-                called_by_id=admin_user.id,
-                target_id=target_member.user.id,
-                msg_text=text,
-                msg_link=link,
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_TARGETS)
+
+    async def process(target_member: ChatMemberTypes) -> bool:
+        async with semaphore:
+            return await _process_target(
+                bot,
+                chat_id,
+                admin_user,
+                text,
+                target_member,
+                action_name,
+                action_func,
+                link,
             )
-            await register_log(log)
-            continue
 
-        log_status = ActionStatus.SUCCESS
-        log_details: str | None = None
+    members = [m for m in target_members if not isinstance(m, str)]
+    acted = await asyncio.gather(*(process(m) for m in members))
 
-        try:
-            acted_users.append(target_member.user)
-            await action_func(bot, chat_id, target_member.user.id)
-            log_status = ActionStatus.SUCCESS
+    acted_users = [m.user for m, ok in zip(members, acted, strict=True) if ok]
+    skipped_members_names = [
+        get_display_name(m.user) for m, ok in zip(members, acted, strict=True) if not ok
+    ]
+    unknown_members_names = [m for m in target_members if isinstance(m, str)]
+    return acted_users, skipped_members_names, unknown_members_names
 
-        except Exception as e:
-            logging.info(f"Error while {action_name}: {e}")
-            log_status = ActionStatus.ERROR
-            log_details = str(e)
 
+async def _process_target(
+    bot: Bot,
+    chat_id: int,
+    admin_user: User,
+    text: str,
+    target_member: ChatMemberTypes,
+    action_name: ActionLiteral,
+    action_func: Callable[[Bot, int, int], Awaitable[None]],
+    link: str | None,
+) -> bool:
+    """Apply the action to one member and log it, return False if it was skipped."""
+    if _should_skip_target(target_member, bot.id, admin_user.id):
         log = Log(
             chat_id=chat_id,
-            status=log_status,
+            status=ActionStatus.SKIPPED,
             action_name=action_name,
             called_by_id=admin_user.id,
             target_id=target_member.user.id,
             msg_text=text,
             msg_link=link,
-            details=log_details,
         )
         await register_log(log)
+        return False
 
-    return acted_users, skipped_members_names, unknown_members_names
+    log_status = ActionStatus.SUCCESS
+    log_details: str | None = None
+
+    try:
+        await action_func(bot, chat_id, target_member.user.id)
+        log_status = ActionStatus.SUCCESS
+
+    except Exception as e:
+        logging.info(f"Error while {action_name}: {e}")
+        log_status = ActionStatus.ERROR
+        log_details = str(e)
+
+    log = Log(
+        chat_id=chat_id,
+        status=log_status,
+        action_name=action_name,
+        called_by_id=admin_user.id,
+        target_id=target_member.user.id,
+        msg_text=text,
+        msg_link=link,
+        details=log_details,
+    )
+    await register_log(log)
+    return True
 
 
 def _should_skip_target(
@@ -0,0 +1,284 @@
+"""Pacing of outgoing Bot API requests.
+
+RequestScheduler is a session middleware: every request waits for its turn
+in a priority queue and for tokens of a global and a per-chat bucket, and is
+retried after the delay Telegram asks for when it hits a flood limit.
+"""
+
+import asyncio
+import bisect
+import contextlib
+import itertools
+import logging
+import time
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import TYPE_CHECKING, Any
+
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import (
+    BanChatMember,
+    BanChatSenderChat,
+    CopyMessage,
+    DeleteMessage,
+    DeleteMessages,
+    EditMessageReplyMarkup,
+    EditMessageText,
+    ForwardMessage,
+    GetUpdates,
+    RestrictChatMember,
+    SendMessage,
+    TelegramMethod,
+    UnbanChatMember,
+)
+from aiogram.methods.base import Response, TelegramType
+
+if TYPE_CHECKING:
+    from aiogram import Bot
+
+# Telegram allows about 30 requests per second overall
+# and 20 messages per minute in one group.
+GLOBAL_RATE = 30.0
+CHAT_RATE = 20 / 60
+CHAT_BURST = 20
+# Attempts of a request that keeps hitting flood limits before it fails.
+MAX_ATTEMPTS = 3
+# Idle chat buckets are dropped once there are more than this many.
+MAX_CHAT_BUCKETS = 10_000
+
+
+class Priority(IntEnum):
+    MODERATION = 0
+    DEFAULT = 1
+    NOTICE = 2
+
+
+MODERATION_METHODS: tuple[type[TelegramMethod[Any]], ...] = (
+    BanChatMember,
+    BanChatSenderChat,
+    DeleteMessage,
+    DeleteMessages,
+    RestrictChatMember,
+    UnbanChatMember,
+)
+# Methods that post to a chat and count against its message limit.
+NOTICE_METHODS: tuple[type[TelegramMethod[Any]], ...] = (
+    CopyMessage,
+    EditMessageReplyMarkup,
+    EditMessageText,
+    ForwardMessage,
+    SendMessage,
+)
+
+
+class TokenBucket:
+    """`rate` tokens per second up to `capacity`, and a pause for retry_after."""
+
+    __slots__ = ("rate", "capacity", "tokens", "updated", "paused_until")
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+
+    def wait_time(self, now: float, cost: float) -> float:
+        """Return the seconds until `cost` tokens can be taken, 0 if they can now."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        refill = (cost - self.tokens) / self.rate if self.tokens < cost else 0.0
+        return max(self.paused_until - now, refill, 0.0)
+
+    def take(self, cost: float) -> None:
+        self.tokens -= cost
+
+    def pause(self, until: float) -> None:
+        self.paused_until = max(self.paused_until, until)
+
+    def is_idle(self, now: float) -> bool:
+        return self.tokens >= self.capacity and self.paused_until <= now
+
+
+@dataclass(order=True)
+class _Request:
+    priority: int
+    seq: int
+    chat_id: int | str | None = field(compare=False)
+    cost: float = field(compare=False)
+    future: asyncio.Future[None] = field(compare=False)
+
+
+@dataclass
+class SchedulerStats:
+    depth: int = 0
+    max_depth: int = 0
+    depth_by_priority: dict[str, int] = field(default_factory=dict)
+    sent: int = 0
+    retried: int = 0
+    failed: int = 0
+
+
+class RequestScheduler(BaseRequestMiddleware):
+    """Send Bot API requests in priority order within Telegram's rate limits.
+
+    Moderation actions go before other requests, and notices posted to chats
+    go last. Every request takes a token of the global bucket. Notices also
+    take a token of their chat's bucket, while other requests to a chat only
+    wait while the chat is paused after a flood limit was hit.
+    """
+
+    def __init__(
+        self,
+        global_rate: float = GLOBAL_RATE,
+        chat_rate: float = CHAT_RATE,
+        chat_burst: float = CHAT_BURST,
+    ) -> None:
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.stats = SchedulerStats()
+
+        self._global = TokenBucket(global_rate, global_rate)
+        self._chats: dict[int | str, TokenBucket] = {}
+        self._queue: list[_Request] = []
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
+
+    def get_stats(self) -> SchedulerStats:
+        """Return the counters with the current queue depth per priority."""
+        self.stats.depth = len(self._queue)
+        self.stats.depth_by_priority = {
+            priority.name.lower(): sum(r.priority == priority for r in self._queue)
+            for priority in Priority
+        }
+        return self.stats
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: "Bot",
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        # Long polling waits on the server and must never be queued.
+        if isinstance(method, GetUpdates):
+            return await make_request(bot, method)
+
+        priority = _get_priority(method)
+        chat_id: int | str | None = getattr(method, "chat_id", None)
+        cost = 1.0 if priority == Priority.NOTICE else 0.0
+        seq = next(self._seq)
+
+        loop = asyncio.get_running_loop()
+        attempt = 0
+        while True:
+            attempt += 1
+            await self._acquire(
+                _Request(priority, seq, chat_id, cost, loop.create_future())
+            )
+            try:
+                response = await make_request(bot, method)
+            except TelegramRetryAfter as e:
+                self._pause(chat_id, e.retry_after)
+                if attempt >= MAX_ATTEMPTS:
+                    self.stats.failed += 1
+                    raise
+                self.stats.retried += 1
+                logging.warning(
+                    f"{type(method).__name__} hit a flood limit in chat {chat_id}, "
+                    f"retrying in {e.retry_after}s"
+                )
+                continue
+
+            self.stats.sent += 1
+            return response
+
+    async def close(self) -> None:
+        """Stop the scheduler, requests still queued are cancelled."""
+        if self._task is not None:
+            task, self._task = self._task, None
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        for request in self._queue:
+            request.future.cancel()
+        self._queue.clear()
+
+    async def _acquire(self, request: _Request) -> None:
+        bisect.insort(self._queue, request)
+        self.stats.max_depth = max(self.stats.max_depth, len(self._queue))
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        self._wakeup.set()
+        await request.future
+
+    def _pause(self, chat_id: int | str | None, retry_after: float) -> None:
+        until = time.monotonic() + retry_after
+        bucket = self._global if chat_id is None else self._chat_bucket(chat_id)
+        bucket.pause(until)
+
+    def _chat_bucket(self, chat_id: int | str) -> TokenBucket:
+        bucket = self._chats.get(chat_id)
+        if bucket is None:
+            if len(self._chats) >= MAX_CHAT_BUCKETS:
+                now = time.monotonic()
+                for idle in [c for c, b in self._chats.items() if b.is_idle(now)]:
+                    del self._chats[idle]
+            bucket = self._chats[chat_id] = TokenBucket(self.chat_rate, self.chat_burst)
+        return bucket
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            delay = self._release_ready()
+            if delay is None:
+                await self._wakeup.wait()
+                continue
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), delay)
+
+    def _release_ready(self) -> float | None:
+        """Let every request through that may go now, in priority order.
+
+        Return the seconds until the next waiting request may go, or None if
+        nothing is waiting.
+        """
+        now = time.monotonic()
+        delay: float | None = None
+        waiting: list[_Request] = []
+
+        for request in self._queue:
+            if request.future.done():
+                continue
+
+            wait = self._global.wait_time(now, 1.0)
+            if wait == 0.0 and request.chat_id is not None:
+                wait = self._chat_bucket(request.chat_id).wait_time(now, request.cost)
+            if wait > 0.0:
+                waiting.append(request)
+                delay = wait if delay is None else min(delay, wait)
+                continue
+
+            self._global.take(1.0)
+            if request.chat_id is not None:
+                self._chat_bucket(request.chat_id).take(request.cost)
+            request.future.set_result(None)
+
+        self._queue = waiting
+        return delay
+
+
+def _get_priority(method: TelegramMethod[Any]) -> Priority:
+    if isinstance(method, MODERATION_METHODS):
+        return Priority.MODERATION
+    if isinstance(method, NOTICE_METHODS):
+        return Priority.NOTICE
+    return Priority.DEFAULT
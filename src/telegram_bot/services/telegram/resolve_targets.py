@@ -1,18 +1,37 @@
+import asyncio
 import logging
 
 from aiogram import Bot
 from aiogram.types import ChatMember, Message
 
-from telegram_bot.services.db.users_service import get_user
+from telegram_bot.models.user import UserDTO
+from telegram_bot.services.db.users_service import get_user, get_users
 from telegram_bot.services.telegram.types import ChatMemberTypes
 
+# Members of one command fetched from Telegram at the same time.
+MAX_CONCURRENT_LOOKUPS = 5
 
-async def fetch_member(bot: Bot, chat_id: int, identifier: str) -> ChatMember | str:
-    """Return ChatMember by username or ID if resolved, else original identifier."""
+
+async def fetch_member(
+    bot: Bot,
+    chat_id: int,
+    identifier: str,
+    known_users: dict[str, UserDTO] | None = None,
+) -> ChatMember | str:
+    """Return ChatMember by username or ID if resolved, else original identifier.
+
+    Usernames are looked up in `known_users` if given, else in the database.
+    """
     try:
         member = identifier
         if identifier.startswith("@"):
-            if user := await get_user(username=identifier[1:]):
+            username = identifier[1:]
+            user = (
+                known_users.get(username)
+                if known_users is not None
+                else await get_user(username=username)
+            )
+            if user:
                 user_id = user.id
                 member = await bot.get_chat_member(chat_id, user_id)
         elif identifier.isdigit() or (
@@ -28,31 +47,55 @@ async def fetch_member(bot: Bot, chat_id: int, identifier: str) -> ChatMember |
         return identifier
 
 
+async def _fetch_reply_member(bot: Bot, message: Message) -> ChatMember | None:
+    """Return the author of the replied message, if there is one."""
+    if not (message.reply_to_message and message.reply_to_message.from_user):
+        return None
+    try:
+        user_id = message.reply_to_message.from_user.id
+        return await bot.get_chat_member(message.chat.id, user_id)
+    except Exception as e:
+        logging.warning(f"Failed to fetch reply member: {e}")
+        return None
+
+
 async def get_target_members(
     message: Message, text: str, bot: Bot
 ) -> list[ChatMember | str]:
     """Retrieve and return a list of chat members targeted by a moderation command.
 
-    Ensure each concrete user appears only once (by user.id).
+    Usernames are looked up with one database query and members are fetched
+    concurrently. Ensure each concrete user appears only once (by user.id),
+    in the order they are named.
     """
     chat_id = message.chat.id
     parts = text.split()[1:]
     members: list[ChatMember | str] = []
     seen_ids: set[int] = set()
 
+    usernames = [part[1:] for part in parts if part.startswith("@")]
+    known_users = await get_users(usernames) if usernames else {}
+
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_LOOKUPS)
+
+    async def fetch(identifier: str) -> ChatMember | str:
+        async with semaphore:
+            return await fetch_member(bot, chat_id, identifier, known_users)
+
+    unique_parts = list(dict.fromkeys(parts))
+    reply_member, *fetched = await asyncio.gather(
+        _fetch_reply_member(bot, message), *(fetch(part) for part in unique_parts)
+    )
+    fetched_by_part = dict(zip(unique_parts, fetched, strict=True))
+
     # 1) target from reply
-    if message.reply_to_message and message.reply_to_message.from_user:
-        try:
-            user_id = message.reply_to_message.from_user.id
-            cm = await bot.get_chat_member(chat_id, user_id)
-            members.append(cm)
-            seen_ids.add(user_id)
-        except Exception as e:
-            logging.warning(f"Failed to fetch reply member: {e}")
+    if reply_member is not None:
+        members.append(reply_member)
+        seen_ids.add(reply_member.user.id)
 
     # 2) targets from command text
     for part in parts:
-        member = await fetch_member(bot, chat_id, part)
+        member = fetched_by_part[part]
 
         if isinstance(member, ChatMemberTypes):
             user_id = member.user.id
@@ -1,8 +1,11 @@
+import asyncio
+import threading
+import time
 from unittest.mock import Mock
 
 import pytest
 
-from telegram_bot.experiments.censor_ai import ToxicityDetector
+from telegram_bot.experiments.censor_ai import OnnxOptions, ToxicityDetector
 from telegram_bot.models.filters import AICensorshipConfig
 
 from .data.offensive_samples import norm_samples, toxic_samples
@@ -45,9 +48,27 @@ def test_toxicity_detector_load_classifiers_happy_path(monkeypatch: pytest.Monke
     detector.load_classifiers()
 
     assert detector.initialized
-    assert detector.classifiers == [
-        fake_classifier_en,
-        fake_classifier_ru,
+    assert detector.classifiers == {
+        "en": fake_classifier_en,
+        "ru": fake_classifier_ru,
+    }
+
+
+def test_toxicity_detector_load_onnx_classifiers(monkeypatch: pytest.MonkeyPatch):
+    options = OnnxOptions(cache_dir="/tmp/onnx", intra_op_threads=2)
+    detector = ToxicityDetector(onnx_options=options)
+
+    build_onnx = Mock(name="build_onnx_classifier")
+    monkeypatch.setattr(
+        "telegram_bot.experiments.censor_ai._build_onnx_classifier", build_onnx
+    )
+
+    detector.load_classifiers()
+
+    assert detector.initialized
+    assert [c.args for c in build_onnx.call_args_list] == [
+        ("unitary/toxic-bert", options),
+        ("cointegrated/rubert-tiny-toxicity", options),
     ]
 
 
@@ -89,3 +110,179 @@ async def test_toxicity_detector_norm_samples(sample: str):
     config = AICensorshipConfig(enabled=True)
 
     assert not await detector.is_toxic(sample, config)
+
+
+def _fake_classifier(label_for_bad: str) -> Mock:
+    def classify(texts: list[str], batch_size: int) -> list[dict[str, object]]:
+        return [
+            {"label": label_for_bad if "bad" in t else "neutral", "score": 0.9}
+            for t in texts
+        ]
+
+    return Mock(side_effect=classify)
+
+
+@pytest.mark.asyncio
+async def test_toxicity_detector_batches_concurrent_texts(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    fake_classifier_en = _fake_classifier("toxic")
+    fake_classifier_ru = _fake_classifier("neutral")
+    monkeypatch.setattr(
+        "telegram_bot.experiments.censor_ai._build_en_classifier",
+        Mock(return_value=fake_classifier_en),
+    )
+    monkeypatch.setattr(
+        "telegram_bot.experiments.censor_ai._build_ru_classifier",
+        Mock(return_value=fake_classifier_ru),
+    )
+
+    detector = ToxicityDetector(max_batch_size=8, max_wait=0.2)
+    config = AICensorshipConfig(enabled=True)
+    texts = ["good", "bad", "fine", "so bad", "плохо bad"]
+
+    try:
+        results = await asyncio.gather(*(detector.is_toxic(t, config) for t in texts))
+    finally:
+        detector.stop()
+
+    assert results == [False, True, False, True, True]
+    # All texts arrive within max_wait, so each model is called once,
+    # and only with the texts written in its script.
+    fake_classifier_en.assert_called_once_with(texts, batch_size=len(texts))
+    fake_classifier_ru.assert_called_once_with(["плохо bad"], batch_size=1)
+
+
+@pytest.mark.asyncio
+async def test_toxicity_detector_respects_max_batch_size():
+    fake_classifier = _fake_classifier("toxic")
+    detector = ToxicityDetector(max_batch_size=2, max_wait=0.2)
+    detector.classifiers = {"en": fake_classifier}
+    detector.initialized = True
+
+    try:
+        await asyncio.gather(*(detector.classify(str(i)) for i in range(5)))
+    finally:
+        detector.stop()
+
+    assert [len(c.args[0]) for c in fake_classifier.call_args_list] == [2, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_toxicity_detector_propagates_classifier_errors():
+    detector = ToxicityDetector(max_wait=0)
+    detector.classifiers = {"en": Mock(side_effect=RuntimeError("boom"))}
+    detector.initialized = True
+
+    try:
+        with pytest.raises(RuntimeError, match="boom"):
+            await detector.classify("text")
+    finally:
+        detector.stop()
+
+
+@pytest.mark.asyncio
+async def test_toxicity_detector_reuses_cached_scores():
+    fake_classifier = _fake_classifier("toxic")
+    detector = ToxicityDetector(max_wait=0)
+    detector.classifiers = {"en": fake_classifier}
+    detector.initialized = True
+
+    try:
+        strict = await detector.is_toxic(
+            "so bad", AICensorshipConfig(threshold=0.5), ["en"]
+        )
+        lenient = await detector.is_toxic(
+            "So   BAD", AICensorshipConfig(threshold=0.95), ["en"]
+        )
+    finally:
+        detector.stop()
+
+    assert strict
+    assert not lenient
+    fake_classifier.assert_called_once()
+    assert detector.verdicts.stats.hits == 1
+    assert detector.verdicts.stats.bytes > 0
+
+
+@pytest.mark.asyncio
+async def test_toxicity_detector_classifies_normalized_text_once():
+    fake_classifier = _fake_classifier("toxic")
+    detector = ToxicityDetector(max_wait=0.05)
+    detector.classifiers = {"en": fake_classifier}
+    detector.initialized = True
+
+    try:
+        results = await asyncio.gather(
+            *(detector.classify(t) for t in ["So  BAD", "so bad", "SO BAD"])
+        )
+    finally:
+        detector.stop()
+
+    assert results[0] == results[1] == results[2]
+    # Identical texts arriving together share a single inference.
+    fake_classifier.assert_called_once_with(["so bad"], batch_size=1)
+
+
+@pytest.mark.asyncio
+async def test_toxicity_detector_times_out_on_hung_worker():
+    release = threading.Event()
+
+    def hang(texts: list[str], batch_size: int) -> list[dict[str, object]]:
+        release.wait(timeout=5)
+        return [{"label": "neutral", "score": 0.9} for _ in texts]
+
+    detector = ToxicityDetector(max_wait=0, request_timeout=0.05)
+    detector.classifiers = {"en": Mock(side_effect=hang)}
+    detector.initialized = True
+
+    try:
+        with pytest.raises(asyncio.TimeoutError):
+            await detector.classify("text")
+    finally:
+        release.set()
+        detector.stop()
+
+
+@pytest.mark.asyncio
+async def test_toxicity_detector_stop_fails_queued_requests():
+    detector = ToxicityDetector()
+    # No worker thread is started, so the request stays queued.
+    detector.start = Mock()  # type: ignore[method-assign]
+    task = asyncio.create_task(detector.classify("text"))
+    await asyncio.sleep(0)
+
+    detector.stop()
+
+    with pytest.raises(RuntimeError, match="stopped"):
+        await task
+
+
+def test_toxicity_detector_warm_up_loads_in_background(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    loaded = threading.Event()
+
+    def build_classifier(onnx_options: object = None) -> Mock:
+        loaded.wait(timeout=5)
+        return Mock()
+
+    monkeypatch.setattr(
+        "telegram_bot.experiments.censor_ai._build_en_classifier", build_classifier
+    )
+    monkeypatch.setattr(
+        "telegram_bot.experiments.censor_ai._build_ru_classifier", build_classifier
+    )
+
+    detector = ToxicityDetector()
+    detector.warm_up()
+    try:
+        assert not detector.ready
+        loaded.set()
+        for _ in range(100):
+            if detector.ready:
+                break
+            time.sleep(0.01)
+        assert detector.ready
+    finally:
+        detector.stop()
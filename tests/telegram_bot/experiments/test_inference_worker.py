@@ -0,0 +1,132 @@
+import asyncio
+import json
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from telegram_bot.experiments.inference_worker import RemoteToxicityDetector
+from telegram_bot.models.filters import AICensorshipConfig
+
+
+async def fake_worker(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+) -> None:
+    while line := await reader.readline():
+        request = json.loads(line)
+        results = {
+            name: [{"label": "toxic", "score": 0.8}] for name in request["classifiers"]
+        }
+        writer.write(json.dumps({"id": request["id"], "results": results}).encode())
+        writer.write(b"\n")
+    writer.close()
+
+
+async def connect(detector: RemoteToxicityDetector, socket_path: Path) -> None:
+    reader, writer = await asyncio.open_unix_connection(str(socket_path))
+    detector._attach(reader, writer)
+
+
+@pytest.mark.asyncio
+async def test_remote_classify(tmp_path: Path):
+    socket_path = tmp_path / "worker.sock"
+    server = await asyncio.start_unix_server(fake_worker, path=str(socket_path))
+    detector = RemoteToxicityDetector(str(socket_path))
+
+    async with server:
+        await connect(detector, socket_path)
+        assert detector.ready
+
+        results = await asyncio.gather(
+            detector.classify("hello", ("en",)),
+            detector.classify("привет", ("ru",)),
+        )
+        assert results == [
+            {"en": [{"label": "toxic", "score": 0.8}]},
+            {"ru": [{"label": "toxic", "score": 0.8}]},
+        ]
+
+        # The worker returns raw scores, the threshold is applied locally.
+        assert await detector.is_toxic("hello", AICensorshipConfig(threshold=0.7))
+        assert not await detector.is_toxic("hello", AICensorshipConfig(threshold=0.9))
+
+        detector._disconnect()
+
+
+@pytest.mark.asyncio
+async def test_remote_not_running():
+    detector = RemoteToxicityDetector()
+
+    with pytest.raises(ConnectionError):
+        await detector.classify("hello", ("en",))
+
+
+@pytest.mark.asyncio
+async def test_remote_worker_stops(tmp_path: Path):
+    socket_path = tmp_path / "worker.sock"
+    received = asyncio.Event()
+
+    async def silent_worker(
+        reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        await reader.readline()
+        received.set()
+        writer.close()
+
+    server = await asyncio.start_unix_server(silent_worker, path=str(socket_path))
+    detector = RemoteToxicityDetector(str(socket_path))
+
+    async with server:
+        await connect(detector, socket_path)
+        with pytest.raises(ConnectionError):
+            await detector.classify("hello", ("en",))
+
+    assert received.is_set()
+    assert not detector.connected
+    assert not detector.ready
+
+
+@pytest.mark.asyncio
+async def test_malformed_responses_are_skipped(tmp_path: Path):
+    socket_path = tmp_path / "worker.sock"
+
+    async def sloppy_worker(
+        reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        request = json.loads(await reader.readline())
+        writer.write(b'not json\n{"results": {}}\n[1]\n')
+        writer.write(json.dumps({"id": request["id"], "results": {}}).encode())
+        writer.write(b"\n")
+        await reader.readline()
+        writer.close()
+
+    server = await asyncio.start_unix_server(sloppy_worker, path=str(socket_path))
+    detector = RemoteToxicityDetector(str(socket_path))
+
+    async with server:
+        await connect(detector, socket_path)
+        assert await detector.classify("hello", ("en",)) == {}
+        assert detector.connected
+        detector._disconnect()
+
+
+@pytest.mark.asyncio
+async def test_lost_connection_stops_waiting_for_running_worker(tmp_path: Path):
+    socket_path = tmp_path / "worker.sock"
+
+    async def closing_worker(
+        reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        writer.close()
+
+    server = await asyncio.start_unix_server(closing_worker, path=str(socket_path))
+    detector = RemoteToxicityDetector(str(socket_path))
+    process = Mock()
+    process.wait = AsyncMock(side_effect=asyncio.Event().wait)
+
+    async with server:
+        await connect(detector, socket_path)
+        # The worker process keeps running, losing the connection is enough.
+        await asyncio.wait_for(detector._wait_for_exit_or_disconnect(process), 2)
+
+    assert not detector.ready
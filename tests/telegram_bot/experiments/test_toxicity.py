@@ -0,0 +1,100 @@
+import pytest
+
+from telegram_bot.experiments.toxicity import (
+    ToxicResult,
+    classify_chunks,
+    detect_scripts,
+    has_toxic_label,
+    route_classifiers,
+    split_chunks,
+)
+from telegram_bot.models.filters import AICensorshipConfig
+
+
+@pytest.mark.parametrize(
+    ("text", "scripts"),
+    [
+        ("hello there", {"latin"}),
+        ("привет всем", {"cyrillic"}),
+        ("привет, how are you", {"latin", "cyrillic"}),
+        ("привет всем, ok", {"cyrillic"}),
+        ("123 !!! 🙂", set()),
+    ],
+)
+def test_detect_scripts(text: str, scripts: set[str]):
+    assert detect_scripts(text) == scripts
+
+
+@pytest.mark.parametrize(
+    ("text", "languages", "classifiers"),
+    [
+        ("hello", None, ("en",)),
+        ("привет", None, ("ru",)),
+        ("привет, how are you", None, ("en", "ru")),
+        ("123", None, ("en", "ru")),
+        ("привет, how are you", ["ua"], ("ru",)),
+        ("hello", ["ru"], ("ru",)),
+        ("hello", [], ()),
+    ],
+)
+def test_route_classifiers(
+    text: str, languages: list[str] | None, classifiers: tuple[str, ...]
+):
+    assert route_classifiers(text, languages) == classifiers
+
+
+def test_has_toxic_label():
+    results = [
+        [{"label": "neutral", "score": 0.99}],
+        [{"label": "insult", "score": 0.8}],
+    ]
+
+    assert has_toxic_label(results, threshold=0.7)
+    assert not has_toxic_label(results, threshold=0.9)
+
+
+def test_split_chunks_keeps_short_text():
+    assert split_chunks("  short   text ", 4, 1, 100) == ["  short   text "]
+
+
+def test_split_chunks_overlapping_windows():
+    text = " ".join(str(i) for i in range(10))
+
+    chunks = split_chunks(text, 4, 1, 100)
+
+    # The last window comes second, the rest keep their order.
+    assert chunks == ["0 1 2 3", "6 7 8 9", "3 4 5 6"]
+
+
+def test_split_chunks_budget_keeps_head_and_tail():
+    text = " ".join(str(i) for i in range(100))
+
+    chunks = split_chunks(text, 10, 0, 30)
+
+    assert len(chunks) == 3
+    assert chunks[0].startswith("0 ")
+    assert chunks[1].endswith(" 99")
+
+
+@pytest.mark.asyncio
+async def test_classify_chunks_stops_at_first_toxic_wave():
+    calls: list[str] = []
+
+    async def classify(
+        text: str, classifiers: tuple[str, ...]
+    ) -> dict[str, ToxicResult]:
+        calls.append(text)
+        label = "toxic" if "bad" in text else "neutral"
+        return {"en": [{"label": label, "score": 0.9}]}
+
+    config = AICensorshipConfig(chunk_tokens=16, chunk_overlap=0, max_tokens=4096)
+    words = ["ok"] * 16 * 12
+    words[-1] = "bad"
+
+    assert await classify_chunks(" ".join(words), ("en",), classify, config)
+    # The tail is in the first wave, later waves are skipped.
+    assert len(calls) == 4
+
+    calls.clear()
+    assert not await classify_chunks("ok " * 40, ("en",), classify, config)
+    assert len(calls) == 3
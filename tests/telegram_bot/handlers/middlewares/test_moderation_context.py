@@ -0,0 +1,101 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from aiogram.types import Message
+
+from telegram_bot.handlers.middlewares import ModerationContextMiddleware
+from telegram_bot.handlers.moderation.guards import (
+    bot_has_rights_message,
+    group_only,
+    user_is_admin_message,
+)
+from telegram_bot.services.telegram.moderation_context import (
+    ModerationContext,
+    get_moderation_context,
+)
+
+MODULE = "telegram_bot.services.telegram.moderation_context"
+
+
+def _message(chat_id: int = -1, user_id: int = 1) -> Mock:
+    message = Mock(spec=Message)
+    message.bot = Mock()
+    message.chat = Mock(id=chat_id, type="supergroup")
+    message.from_user = Mock(id=user_id)
+    message.reply = AsyncMock()
+    return message
+
+
+@pytest.mark.asyncio
+@patch(f"{MODULE}.bot_self")
+@patch(f"{MODULE}.is_chat_admin", new_callable=AsyncMock)
+@patch(f"{MODULE}.get_chat_language", new_callable=AsyncMock)
+async def test_stacked_guards_share_one_lookup_of_each_fact(
+    mock_get_chat_language: AsyncMock,
+    mock_is_chat_admin: AsyncMock,
+    mock_bot_self: Mock,
+):
+    mock_get_chat_language.return_value = "en"
+    mock_is_chat_admin.return_value = True
+    mock_bot_self.can_restrict = AsyncMock(return_value=True)
+    seen: list[ModerationContext] = []
+
+    @bot_has_rights_message
+    @user_is_admin_message
+    @group_only
+    async def handler(message: Message) -> None:
+        seen.append(get_moderation_context(message.bot, -1, 1))
+        await seen[-1].language()
+        await seen[-1].user_is_admin()
+
+    message = _message()
+    data: dict = {}
+    await ModerationContextMiddleware()(lambda e, d: handler(e), message, data)
+
+    assert seen == [data["moderation"]]
+    mock_get_chat_language.assert_awaited_once_with(-1)
+    mock_is_chat_admin.assert_awaited_once_with(message.bot, -1, 1)
+    mock_bot_self.can_restrict.assert_awaited_once_with(message.bot, -1)
+    message.reply.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_context_does_not_outlive_the_update():
+    message = _message()
+    inside: list[ModerationContext] = []
+
+    async def handler(event: Message, data: dict) -> None:
+        inside.append(get_moderation_context(event.bot, -1, 1))
+
+    await ModerationContextMiddleware()(handler, message, {})
+
+    assert inside[0] is not get_moderation_context(message.bot, -1, 1)
+
+
+@pytest.mark.asyncio
+@patch(f"{MODULE}.get_chat_language", new_callable=AsyncMock)
+async def test_concurrent_callers_share_the_lookup(mock_get_chat_language: AsyncMock):
+    async def slow_language(chat_id: int) -> str:
+        await asyncio.sleep(0.01)
+        return "ru"
+
+    mock_get_chat_language.side_effect = slow_language
+    context = ModerationContext(Mock(), -1, 1)
+
+    assert await asyncio.gather(context.language(), context.language()) == [
+        "ru",
+        "ru",
+    ]
+    mock_get_chat_language.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_other_chat_gets_its_own_context():
+    message = _message(chat_id=-1)
+
+    async def handler(event: Message, data: dict) -> None:
+        assert get_moderation_context(event.bot, -1, 1) is data["moderation"]
+        assert get_moderation_context(event.bot, -2, 1) is not data["moderation"]
+
+    await ModerationContextMiddleware()(handler, message, {})
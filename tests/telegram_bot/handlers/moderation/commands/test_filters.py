@@ -10,6 +10,8 @@ from telegram_bot.handlers.moderation.commands.filters import (
     handle_censor_off,
     handle_censor_on,
     handle_filters_overview,
+    handle_raid_off,
+    handle_raid_on,
 )
 
 
@@ -209,3 +211,57 @@ async def test_handle_antispam_off(
     mock_set_chat_antispam.assert_awaited_once_with(message.chat.id, False)
     mock_t.assert_called_once_with("moderation.modes.antispam.off", fake_lang)
     message.reply.assert_awaited_once_with(fake_t_text)
+
+
+@pytest.mark.asyncio
+@patch("telegram_bot.handlers.moderation.commands.filters.set_chat_raid_protection")
+@patch("telegram_bot.handlers.moderation.commands.filters.t")
+@patch("telegram_bot.handlers.moderation.commands.filters.get_chat_language")
+async def test_handle_raid_on(
+    mock_get_chat_language: Mock,
+    mock_t: Mock,
+    mock_set_chat_raid_protection: Mock,
+):
+    fake_lang = "en"
+    fake_t_text = "raid on"
+
+    message = Mock()
+    message.chat.id = -1234567890
+    message.reply = AsyncMock()
+
+    mock_get_chat_language.return_value = fake_lang
+    mock_t.return_value = fake_t_text
+
+    await handle_raid_on(message)
+
+    mock_get_chat_language.assert_awaited_once_with(message.chat.id)
+    mock_set_chat_raid_protection.assert_awaited_once_with(message.chat.id, True)
+    mock_t.assert_called_once_with("moderation.modes.raid.on", fake_lang)
+    message.reply.assert_awaited_once_with(fake_t_text)
+
+
+@pytest.mark.asyncio
+@patch("telegram_bot.handlers.moderation.commands.filters.set_chat_raid_protection")
+@patch("telegram_bot.handlers.moderation.commands.filters.t")
+@patch("telegram_bot.handlers.moderation.commands.filters.get_chat_language")
+async def test_handle_raid_off(
+    mock_get_chat_language: Mock,
+    mock_t: Mock,
+    mock_set_chat_raid_protection: Mock,
+):
+    fake_lang = "en"
+    fake_t_text = "raid off"
+
+    message = Mock()
+    message.chat.id = -1234567890
+    message.reply = AsyncMock()
+
+    mock_get_chat_language.return_value = fake_lang
+    mock_t.return_value = fake_t_text
+
+    await handle_raid_off(message)
+
+    mock_get_chat_language.assert_awaited_once_with(message.chat.id)
+    mock_set_chat_raid_protection.assert_awaited_once_with(message.chat.id, False)
+    mock_t.assert_called_once_with("moderation.modes.raid.off", fake_lang)
+    message.reply.assert_awaited_once_with(fake_t_text)
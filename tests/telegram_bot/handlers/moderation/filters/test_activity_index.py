@@ -0,0 +1,68 @@
+from pytest_mock import MockerFixture
+
+from telegram_bot.handlers.moderation.filters.activity import (
+    GlobalActivityIndex,
+    GlobalFloodConfig,
+)
+
+CONFIG = GlobalFloodConfig(message_limit=4, hit_limit=2, min_chats=2, time_window=60)
+
+
+def test_messages_across_chats_are_summed(mocker: MockerFixture):
+    mocker.patch("time.monotonic", return_value=1000.0)
+    index = GlobalActivityIndex(CONFIG)
+
+    for chat_id in (1, 2, 3):
+        index.record_message(chat_id, 7)
+    assert not index.is_flooding(7)
+
+    index.record_message(4, 7)
+    assert index.is_flooding(7)
+
+
+def test_activity_in_one_chat_is_left_to_the_chat_filters(mocker: MockerFixture):
+    mocker.patch("time.monotonic", return_value=1000.0)
+    index = GlobalActivityIndex(CONFIG)
+
+    for _ in range(10):
+        index.record_message(1, 7)
+
+    assert not index.is_flooding(7)
+
+
+def test_filter_hits_count_towards_the_hit_limit(mocker: MockerFixture):
+    mocker.patch("time.monotonic", return_value=1000.0)
+    index = GlobalActivityIndex(CONFIG)
+
+    index.record_hit(1, 7)
+    assert not index.is_flooding(7)
+    index.record_hit(2, 7)
+    assert index.is_flooding(7)
+
+
+def test_old_buckets_expire(mocker: MockerFixture):
+    now = mocker.patch("time.monotonic", return_value=1000.0)
+    index = GlobalActivityIndex(CONFIG)
+
+    index.record_message(1, 7)
+    index.record_message(2, 7)
+    index.record_message(1, 7)
+
+    # Only the first three messages have left the window.
+    now.return_value = 1061.0
+    index.record_message(2, 7)
+    assert not index.is_flooding(7)
+
+
+def test_idle_users_are_swept(mocker: MockerFixture):
+    now = mocker.patch("time.monotonic", return_value=1000.0)
+    index = GlobalActivityIndex(CONFIG)
+
+    index.record_message(1, 7)
+    now.return_value = 1030.0
+    index.record_message(1, 8)
+    assert len(index) == 2
+
+    now.return_value = 1065.0
+    assert index.sweep() == 1
+    assert len(index) == 1
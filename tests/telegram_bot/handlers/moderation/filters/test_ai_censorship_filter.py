@@ -1,9 +1,16 @@
+import sys
 from unittest.mock import AsyncMock, Mock
 
 import pytest
 
+from telegram_bot.experiments.inference_worker import RemoteToxicityDetector
+from telegram_bot.handlers.moderation.filters import censorship
 from telegram_bot.handlers.moderation.filters.base import FilterStatus
-from telegram_bot.handlers.moderation.filters.censorship import AICensorshipFilter
+from telegram_bot.handlers.moderation.filters.censorship import (
+    AICensorshipFilter,
+    configure_ai_checker,
+    get_ai_readiness,
+)
 from telegram_bot.models.filters import AICensorshipConfig
 
 from .fake_message_context import make_fake_message_context
@@ -42,13 +49,17 @@ async def test_exception(monkeypatch: pytest.MonkeyPatch):
         "telegram_bot.handlers.moderation.filters.censorship.get_ai_checker",
         fake_get_ai_checker,
     )
+    monkeypatch.setattr(
+        "telegram_bot.handlers.moderation.filters.censorship.get_ai_readiness",
+        lambda: lambda: True,
+    )
 
     ctx = make_fake_message_context("Some text")
     config = AICensorshipConfig(enabled=True)
 
     result = await AICensorshipFilter.check(ctx, config)
 
-    mock_is_toxic.assert_called_once_with(ctx.text, config)
+    mock_is_toxic.assert_called_once_with(ctx.text, config, languages=None)
     assert not result.triggered
     assert result.status == FilterStatus.FAILED
     assert result.error is not None
@@ -67,6 +78,10 @@ async def test_is_toxic_triggered(monkeypatch: pytest.MonkeyPatch):
         "telegram_bot.handlers.moderation.filters.censorship.get_ai_checker",
         fake_get_ai_checker,
     )
+    monkeypatch.setattr(
+        "telegram_bot.handlers.moderation.filters.censorship.get_ai_readiness",
+        lambda: lambda: True,
+    )
 
     ctx = make_fake_message_context("Some text")
     config = AICensorshipConfig(enabled=True)
@@ -88,6 +103,10 @@ async def test_is_toxic_not_triggered(monkeypatch: pytest.MonkeyPatch):
         "telegram_bot.handlers.moderation.filters.censorship.get_ai_checker",
         fake_get_ai_checker,
     )
+    monkeypatch.setattr(
+        "telegram_bot.handlers.moderation.filters.censorship.get_ai_readiness",
+        lambda: lambda: True,
+    )
 
     ctx = make_fake_message_context("Some text")
     config = AICensorshipConfig(enabled=True)
@@ -96,3 +115,113 @@ async def test_is_toxic_not_triggered(monkeypatch: pytest.MonkeyPatch):
 
     assert not result.triggered
     assert result.reason == ""
+
+
+@pytest.mark.asyncio
+async def test_models_not_ready(monkeypatch: pytest.MonkeyPatch):
+    mock_is_toxic = AsyncMock(return_value=True)
+
+    monkeypatch.setattr(
+        "telegram_bot.handlers.moderation.filters.censorship.get_ai_checker",
+        lambda: mock_is_toxic,
+    )
+    monkeypatch.setattr(
+        "telegram_bot.handlers.moderation.filters.censorship.get_ai_readiness",
+        lambda: lambda: False,
+    )
+
+    ctx = make_fake_message_context("Some text")
+    config = AICensorshipConfig(enabled=True)
+
+    result = await AICensorshipFilter.check(ctx, config)
+
+    mock_is_toxic.assert_not_called()
+    assert not result.triggered
+    assert result.status == FilterStatus.SKIPPED
+    assert result.error is not None
+    assert result.error.code == "ai_censor_not_ready"
+
+
+@pytest.mark.asyncio
+async def test_filter_fails_while_worker_is_down(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(
+        "telegram_bot.handlers.moderation.filters.censorship._remote_detector",
+        RemoteToxicityDetector(),
+    )
+    monkeypatch.setattr(
+        "telegram_bot.handlers.moderation.filters.censorship.get_ai_readiness",
+        lambda: lambda: True,
+    )
+
+    ctx = make_fake_message_context("hello")
+    result = await AICensorshipFilter.check(ctx, AICensorshipConfig(enabled=True))
+
+    assert not result.triggered
+    assert result.status == FilterStatus.FAILED
+    assert result.error is not None
+    assert result.error.code == "ai_censor_exception"
+
+
+@pytest.fixture
+def censor_ai(monkeypatch: pytest.MonkeyPatch) -> Mock:
+    censor_ai = Mock()
+    censor_ai.is_toxic = AsyncMock(return_value=True)
+    censor_ai.models_ready.return_value = True
+    monkeypatch.setitem(sys.modules, "telegram_bot.experiments.censor_ai", censor_ai)
+    for name in ("_pending_runtime", "_censor_ai", "_censor_ai_error"):
+        monkeypatch.setattr(censorship, name, None)
+    monkeypatch.setattr(censorship, "_censor_ai_loader", None)
+    return censor_ai
+
+
+def _wait_for_import() -> None:
+    assert censorship._censor_ai_loader is not None
+    censorship._censor_ai_loader.join(5)
+
+
+def test_runtime_applied_on_first_use(censor_ai: Mock):
+    configure_ai_checker("onnx", ".cache", 2, 1, 5.0)
+    censor_ai.configure_detector.assert_not_called()
+
+    assert not get_ai_readiness()()
+    _wait_for_import()
+    assert get_ai_readiness()()
+
+    censor_ai.OnnxOptions.assert_called_once_with(".cache", 2, 1)
+    censor_ai.configure_detector.assert_called_once_with(
+        censor_ai.OnnxOptions.return_value, 5.0
+    )
+    censor_ai.warm_up.assert_called_once_with()
+
+
+@pytest.mark.asyncio
+async def test_first_check_skips_while_censor_ai_is_imported(censor_ai: Mock):
+    ctx = make_fake_message_context("Some text")
+    config = AICensorshipConfig(enabled=True)
+
+    result = await AICensorshipFilter.check(ctx, config)
+    assert result.status == FilterStatus.SKIPPED
+    assert result.error is not None
+    assert result.error.code == "ai_censor_not_ready"
+
+    _wait_for_import()
+    result = await AICensorshipFilter.check(ctx, config)
+    assert result.triggered
+    censor_ai.is_toxic.assert_awaited_once_with(ctx.text, config, languages=None)
+
+
+@pytest.mark.asyncio
+async def test_failed_import_reports_missing_dependency(
+    censor_ai: Mock, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setitem(sys.modules, "telegram_bot.experiments.censor_ai", None)
+    ctx = make_fake_message_context("Some text")
+    config = AICensorshipConfig(enabled=True)
+
+    await AICensorshipFilter.check(ctx, config)
+    _wait_for_import()
+    result = await AICensorshipFilter.check(ctx, config)
+
+    assert result.status == FilterStatus.SKIPPED
+    assert result.error is not None
+    assert result.error.code == "ai_censor_dependency_missing"
@@ -1,6 +1,8 @@
+import pickle
+
 import pytest
 
-from telegram_bot.handlers.moderation.filters import CensorshipFilter
+from telegram_bot.handlers.moderation.filters import CensorshipFilter, CompiledBlacklist
 from telegram_bot.models.filters import CensorshipConfig
 
 from .data.offensive_samples import bad_samples, norm_samples
@@ -35,3 +37,57 @@ def test_norm_samples_not_triggered(norm_word: str, sample: str) -> None:
     config = CensorshipConfig()
     result = CensorshipFilter.check(ctx, [norm_word], config)
     assert not result.triggered
+
+
+@pytest.mark.parametrize("max_len", [1, 7, 50])
+def test_normalize_text_truncates_long_text(max_len: int) -> None:
+    config = CensorshipConfig(max_norm_text_len=max_len)
+    text = "a, b. " * 5 + "ｘ" * 40
+
+    normalized = CensorshipFilter._normalize_text(text, "en", config)
+
+    assert normalized == ("ab" * 5 + "x" * 40)[:max_len]
+
+
+def test_compiled_blacklist_normalizes_once_per_language() -> None:
+    config = CensorshipConfig(languages=["ru", "en"])
+    compiled = CompiledBlacklist.build(["Bad", "bad", "..."], config)
+
+    assert set(compiled.normalized) == {"ru", "en"}
+    # Duplicates after normalization and empty entries are dropped.
+    assert len(compiled.normalized["en"]) == 1
+    assert compiled.is_compatible(config)
+
+
+def test_compiled_blacklist_pickles_words_and_settings() -> None:
+    config = CensorshipConfig(languages=["en"], similarity=0.9)
+    compiled = CompiledBlacklist.build(["bad", "worse"], config)
+
+    restored = pickle.loads(pickle.dumps(compiled))
+
+    assert restored.words == compiled.words
+    assert restored.normalized == compiled.normalized
+    assert restored.is_compatible(config)
+
+
+def test_compiled_blacklist_rebuilt_for_other_settings() -> None:
+    compiled = CompiledBlacklist.build(["bad"], CensorshipConfig(languages=["en"]))
+    config = CensorshipConfig(languages=["ru"])
+
+    assert not compiled.is_compatible(config)
+    assert CompiledBlacklist.ensure(compiled, config).languages == ("ru",)
+
+
+@pytest.mark.parametrize(
+    ("bad_word", "sample"),
+    [
+        (bad_word, sample)
+        for bad_word, samples in bad_samples.items()
+        for sample in samples
+    ],
+)
+def test_compiled_blacklist_triggered(bad_word: str, sample: str) -> None:
+    ctx = make_fake_message_context(sample)
+    config = CensorshipConfig()
+    compiled = CompiledBlacklist.build([bad_word], config)
+    assert CensorshipFilter.check(ctx, compiled, config).triggered
@@ -0,0 +1,83 @@
+import os
+import time
+
+import pytest
+
+from telegram_bot.handlers.moderation.filters import CensorshipFilter, CompiledBlacklist
+from telegram_bot.handlers.moderation.filters.executor import (
+    FilterExecutor,
+    run_filter,
+)
+from telegram_bot.models.filters import CensorshipConfig
+
+from .fake_message_context import make_fake_message_context
+
+
+@pytest.mark.asyncio
+async def test_short_text_checked_inline():
+    executor = FilterExecutor(workers=1, inline_max_text_len=100)
+    executor.start()
+    try:
+        result = await executor.run("short", len, "short")
+    finally:
+        executor.shutdown()
+
+    assert result == 5
+    assert executor.inline == 1
+    assert executor.offloaded == 0
+
+
+@pytest.mark.asyncio
+async def test_long_text_checked_in_process_pool():
+    config = CensorshipConfig(languages=["en"])
+    blacklist = CompiledBlacklist.build(["badword"], config)
+    ctx = make_fake_message_context(text="x" * 50 + " badword")
+
+    executor = FilterExecutor(workers=1, inline_max_text_len=10)
+    executor.start()
+    try:
+        result = await executor.run(
+            ctx.text, CensorshipFilter.check, ctx, blacklist, config
+        )
+    finally:
+        executor.shutdown()
+
+    assert result.triggered
+    assert executor.offloaded == 1
+
+
+@pytest.mark.asyncio
+async def test_slow_check_times_out(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(
+        "telegram_bot.handlers.moderation.filters.executor.is_free_threaded",
+        lambda: True,
+    )
+    executor = FilterExecutor(workers=1, timeout=0.05, inline_max_text_len=0)
+    executor.start()
+    try:
+        with pytest.raises(TimeoutError):
+            await executor.run("text", time.sleep, 0.5)
+    finally:
+        executor.shutdown()
+
+    assert executor.timeouts == 1
+
+
+@pytest.mark.asyncio
+async def test_crashed_pool_is_restarted_without_inline_rerun():
+    executor = FilterExecutor(workers=1, inline_max_text_len=0)
+    executor.start()
+    try:
+        with pytest.raises(TimeoutError):
+            await executor.run("text", os._exit, 1)
+        assert executor.crashes == 1
+        assert executor.inline == 0
+
+        assert await executor.run("text", len, "text") == 4
+    finally:
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_run_filter_inline_without_executor():
+    assert await run_filter("x" * 1000, len, "abc") == 3
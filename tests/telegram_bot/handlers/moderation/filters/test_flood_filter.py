@@ -1,60 +1,101 @@
+import pytest
 from pytest_mock import MockerFixture
 
-from telegram_bot.handlers.moderation.filters import FloodFilter
+from telegram_bot.handlers.moderation.filters import FloodFilter, MessageContext
 from telegram_bot.models.filters import FloodConfig
 
 from .fake_message_context import make_fake_message_context
 
+# The event loop also reads time.monotonic, so only the state's clock is faked.
+MODULE = "telegram_bot.handlers.moderation.filters.flood_state"
 
-def test_flood_filter_init():
+
+@pytest.mark.asyncio
+async def test_flood_filter_init():
     flood_filter = FloodFilter()
-    assert not flood_filter.user_messages
+    assert (await flood_filter.stats()).keys == 0
 
 
-def test_flood_filter_triggers_on_message_limit(mocker: MockerFixture):
+@pytest.mark.asyncio
+async def test_flood_filter_triggers_on_message_limit(mocker: MockerFixture):
     ctx = make_fake_message_context("")
     config = FloodConfig(message_limit=3, time_window=10)
 
     flood_filter = FloodFilter()
 
     fake_time = 1_000_000.0
-    mocker.patch("time.time", return_value=fake_time)
+    mocker.patch(f"{MODULE}.time").monotonic.return_value = fake_time
 
     # First messages → no trigger
-    assert not flood_filter.check(ctx, config).triggered
-    assert not flood_filter.check(ctx, config).triggered
+    assert not (await flood_filter.check(ctx, config)).triggered
+    assert not (await flood_filter.check(ctx, config)).triggered
 
     # Third message → trigger
-    result = flood_filter.check(ctx, config)
+    result = await flood_filter.check(ctx, config)
     assert result.triggered
 
     # State should be cleared
-    assert flood_filter.user_messages[(ctx.chat_id, ctx.user_id)] == []
+    assert not (await flood_filter.check(ctx, config)).triggered
 
 
-def test_flood_filter_respects_time_window(mocker: MockerFixture):
+@pytest.mark.asyncio
+async def test_flood_filter_respects_time_window(mocker: MockerFixture):
     ctx = make_fake_message_context("")
     config = FloodConfig(message_limit=3, time_window=10)
 
     flood_filter = FloodFilter()
 
     times = iter([1, 2, 11])  # third message outside window
-    mocker.patch("time.time", side_effect=lambda: next(times))
+    mocker.patch(f"{MODULE}.time").monotonic.side_effect = lambda: next(times)
 
-    assert not flood_filter.check(ctx, config).triggered
-    assert not flood_filter.check(ctx, config).triggered
-    assert not flood_filter.check(ctx, config).triggered
+    assert not (await flood_filter.check(ctx, config)).triggered
+    assert not (await flood_filter.check(ctx, config)).triggered
+    assert not (await flood_filter.check(ctx, config)).triggered
 
 
-def test_flood_filter_edge_case_triggers(mocker: MockerFixture):
+@pytest.mark.asyncio
+async def test_flood_filter_edge_case_triggers(mocker: MockerFixture):
     ctx = make_fake_message_context("")
     config = FloodConfig(message_limit=3, time_window=10)
 
     flood_filter = FloodFilter()
 
     times = iter([1, 2, 10])  # third message on the threshold of the window
-    mocker.patch("time.time", side_effect=lambda: next(times))
+    mocker.patch(f"{MODULE}.time").monotonic.side_effect = lambda: next(times)
+
+    assert not (await flood_filter.check(ctx, config)).triggered
+    assert not (await flood_filter.check(ctx, config)).triggered
+    assert (await flood_filter.check(ctx, config)).triggered
+
+
+@pytest.mark.asyncio
+async def test_flood_filter_follows_limit_changes(mocker: MockerFixture):
+    ctx = make_fake_message_context("")
+    flood_filter = FloodFilter()
+    mocker.patch(f"{MODULE}.time").monotonic.return_value = 1.0
+
+    assert not (await flood_filter.check(ctx, FloodConfig(message_limit=5))).triggered
+    assert not (await flood_filter.check(ctx, FloodConfig(message_limit=5))).triggered
+    # Both earlier messages still count towards the lower limit.
+    assert (await flood_filter.check(ctx, FloodConfig(message_limit=3))).triggered
+
+
+@pytest.mark.asyncio
+async def test_flood_filter_sweeps_idle_users(mocker: MockerFixture):
+    config = FloodConfig(message_limit=3, time_window=10)
+    flood_filter = FloodFilter()
+    now = mocker.patch(f"{MODULE}.time").monotonic
+    now.return_value = 1.0
+
+    await flood_filter.check(MessageContext(chat_id=1, user_id=1, text=""), config)
+    now.return_value = 5.0
+    await flood_filter.check(MessageContext(chat_id=1, user_id=2, text=""), config)
+    assert (await flood_filter.stats()).keys == 2
+
+    now.return_value = 11.0
+    assert await flood_filter.sweep() == 1
 
-    assert not flood_filter.check(ctx, config).triggered
-    assert not flood_filter.check(ctx, config).triggered
-    assert flood_filter.check(ctx, config).triggered
+    stats = await flood_filter.stats()
+    assert stats.keys == 1
+    assert stats.swept == 1
+    assert stats.bytes > 0
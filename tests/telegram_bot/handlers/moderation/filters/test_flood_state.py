@@ -0,0 +1,77 @@
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from telegram_bot.handlers.moderation.filters.flood_state import (
+    SnapshotFloodState,
+    SqliteFloodState,
+)
+
+MODULE = "telegram_bot.handlers.moderation.filters.flood_state"
+
+
+@pytest.mark.asyncio
+async def test_snapshot_restores_windows_after_restart(tmp_path: Path):
+    path = str(tmp_path / "flood.json")
+
+    before = SnapshotFloodState(path)
+    await before.open()
+    assert not await before.hit((1, 1), 3, 60)
+    assert not await before.hit((1, 1), 3, 60)
+    await before.close()
+
+    after = SnapshotFloodState(path)
+    await after.open()
+    assert (await after.stats()).keys == 1
+    assert await after.hit((1, 1), 3, 60)
+
+
+@pytest.mark.asyncio
+async def test_snapshot_ignores_broken_file(tmp_path: Path):
+    path = tmp_path / "flood.json"
+    path.write_text("{")
+
+    state = SnapshotFloodState(str(path))
+    await state.open()
+
+    assert (await state.stats()).keys == 0
+
+
+@pytest.mark.asyncio
+async def test_sqlite_state_is_shared_between_processes(tmp_path: Path):
+    path = str(tmp_path / "flood.db")
+    first, second = SqliteFloodState(path), SqliteFloodState(path)
+    await first.open()
+    await second.open()
+    try:
+        assert not await first.hit((1, 1), 3, 60)
+        assert not await second.hit((1, 1), 3, 60)
+        assert await first.hit((1, 1), 3, 60)
+        # The window is cleared for everyone once it triggered.
+        assert not await second.hit((1, 1), 3, 60)
+
+        assert not await first.hit((1, 2), 3, 60)
+        assert (await second.stats()).keys == 2
+    finally:
+        await first.close()
+        await second.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_sweep_removes_expired_messages(
+    tmp_path: Path, mocker: MockerFixture
+):
+    now = mocker.patch(f"{MODULE}.time").time
+    now.return_value = 1000.0
+    state = SqliteFloodState(str(tmp_path / "flood.db"))
+    await state.open()
+    try:
+        await state.hit((1, 1), 3, 1)
+        await state.hit((1, 2), 3, 60)
+
+        now.return_value = 1001.0
+        assert await state.sweep() == 1
+        assert (await state.stats()).keys == 1
+    finally:
+        await state.close()
@@ -0,0 +1,81 @@
+import random
+from difflib import SequenceMatcher
+
+import pytest
+
+from telegram_bot.handlers.moderation.filters.matching import (
+    AhoCorasick,
+    BlacklistMatcher,
+)
+
+
+def _sliding_window_reference(
+    text: str, words: list[str], margin: int, similarity: float
+) -> bool:
+    """The original O(words x text x margin) sliding-window scan."""
+    for word in words:
+        length = len(word)
+        for window_len in range(max(length - margin, 1), length + margin + 1):
+            for i in range(len(text) - window_len + 1):
+                fragment = text[i : i + window_len]
+                if SequenceMatcher(None, fragment, word).ratio() >= similarity:
+                    return True
+    return False
+
+
+def test_aho_corasick_finds_overlapping_occurrences():
+    automaton = AhoCorasick(["he", "she", "hers", "his"])
+
+    matches = {
+        (start, automaton.patterns[pattern_id])
+        for start, pattern_id in automaton.iter_matches("ushers")
+    }
+
+    assert matches == {(1, "she"), (2, "he"), (2, "hers")}
+
+
+def test_blacklist_matcher_exact_hit():
+    matcher = BlacklistMatcher(["badword"], margin=0, similarity=1.0)
+
+    result = matcher.search("thisisabadwordhere")
+
+    assert result.triggered
+    assert result.score == 1.0
+
+
+def test_blacklist_matcher_fuzzy_hit():
+    matcher = BlacklistMatcher(["badword"], margin=2, similarity=0.85)
+
+    result = matcher.search("thisisabadwqrdhere")
+
+    assert result.triggered
+    assert result.score >= 0.85
+
+
+def test_blacklist_matcher_reports_best_score_when_not_triggered():
+    matcher = BlacklistMatcher(["badword"], margin=2, similarity=0.85)
+
+    result = matcher.search("xxbadwxxx")
+
+    assert not result.triggered
+    assert 0.0 < result.score < 0.85
+
+
+@pytest.mark.parametrize("similarity", [0.5, 0.7, 0.85, 0.95])
+@pytest.mark.parametrize("margin", [1, 2, 4])
+def test_blacklist_matcher_agrees_with_sliding_window(margin: int, similarity: float):
+    rng = random.Random(f"{margin}-{similarity}")
+    alphabet = "abcd"
+
+    for _ in range(150):
+        words = [
+            "".join(rng.choices(alphabet, k=rng.randint(1, 9)))
+            for _ in range(rng.randint(1, 4))
+        ]
+        text = "".join(rng.choices(alphabet, k=rng.randint(0, 30)))
+
+        matcher = BlacklistMatcher(words, margin, similarity)
+
+        assert matcher.search(text).triggered == _sliding_window_reference(
+            text, words, margin, similarity
+        ), (text, words)
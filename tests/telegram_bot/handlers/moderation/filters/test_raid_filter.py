@@ -0,0 +1,48 @@
+from pytest_mock import MockerFixture
+
+from telegram_bot.handlers.moderation.filters import JoinRaidDetector
+from telegram_bot.models.filters import RaidConfig
+
+CHAT_ID = -100
+
+
+def test_joins_below_limit_are_not_a_raid(mocker: MockerFixture):
+    config = RaidConfig(join_limit=3, time_window=10)
+    detector = JoinRaidDetector()
+    times = iter([1, 2, 11])  # third join outside the window
+    mocker.patch("time.monotonic", side_effect=lambda: next(times))
+
+    assert detector.check(CHAT_ID, [1], config) == []
+    assert detector.check(CHAT_ID, [2], config) == []
+    assert detector.check(CHAT_ID, [3], config) == []
+
+
+def test_burst_trips_raid_mode_and_returns_whole_burst(mocker: MockerFixture):
+    config = RaidConfig(join_limit=3, time_window=10, raid_duration=30)
+    detector = JoinRaidDetector()
+    now = mocker.patch("time.monotonic", return_value=1.0)
+
+    assert detector.check(CHAT_ID, [1], config) == []
+    assert detector.check(CHAT_ID, [2, 3], config) == [1, 2, 3]
+    assert detector.in_raid(CHAT_ID)
+
+    # Every later joiner is returned right away and extends the raid.
+    now.return_value = 25.0
+    assert detector.check(CHAT_ID, [4], config) == [4]
+    now.return_value = 50.0
+    assert detector.in_raid(CHAT_ID)
+
+    now.return_value = 55.0
+    assert not detector.in_raid(CHAT_ID)
+    assert detector.check(CHAT_ID, [5], config) == []
+
+
+def test_chats_are_tracked_separately(mocker: MockerFixture):
+    config = RaidConfig(join_limit=2, time_window=10)
+    detector = JoinRaidDetector()
+    mocker.patch("time.monotonic", return_value=1.0)
+
+    assert detector.check(1, [1], config) == []
+    assert detector.check(2, [2], config) == []
+    assert not detector.in_raid(1)
+    assert not detector.in_raid(2)
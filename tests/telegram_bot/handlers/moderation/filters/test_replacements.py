@@ -0,0 +1,68 @@
+import random
+import re
+
+import pytest
+
+from telegram_bot.handlers.moderation.filters.replacements import (
+    CONFUSABLES,
+    REPLACEMENTS,
+    TRANSLATION_TABLES,
+)
+
+
+def _chained_replace_reference(text: str, lang: str) -> str:
+    """The original str.replace chain followed by the character-class strip."""
+    text = text.lower()
+    for base, variants in REPLACEMENTS[lang].items():
+        for v in variants:
+            text = text.replace(v, base)
+    return re.sub(r"[^а-яa-z0-9]", "", text)
+
+
+@pytest.mark.parametrize("lang", list(REPLACEMENTS))
+def test_translation_table_matches_replace_chain(lang: str):
+    rng = random.Random(lang)
+    alphabet = (
+        "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789@$+!|#<(’ .,-_"
+    )
+    if lang != "en":
+        # Cyrillic in English text and "ё" are folded on purpose, see below.
+        alphabet += "абвгдежзийклмнопрстуфхцчшщъыьэюяАБВГДЕЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯ"
+    # Characters the original chain did not strip keep their old meaning.
+    alphabet += "".join(v for variants in REPLACEMENTS[lang].values() for v in variants)
+
+    for _ in range(200):
+        text = "".join(rng.choices(alphabet, k=rng.randint(0, 40)))
+        assert text.translate(TRANSLATION_TABLES[lang]) == (
+            _chained_replace_reference(text, lang)
+        ), text
+
+
+@pytest.mark.parametrize(
+    ("text", "lang", "expected"),
+    [
+        ("ｂａｄ", "en", "bad"),
+        ("𝐛𝐚𝐝", "en", "bad"),
+        ("bаd", "en", "bad"),  # Cyrillic а
+        ("ΒΑD", "en", "bad"),  # Greek capitals
+        ("bàd", "en", "bad"),
+        ("b​ad", "en", "bad"),
+        ("ёж", "ru", "еж"),
+        ("ёж", "ru", "еж"),
+        ("ρусский", "ru", "русский"),  # Greek rho
+    ],
+)
+def test_translation_table_folds_homoglyphs(text: str, lang: str, expected: str):
+    assert text.translate(TRANSLATION_TABLES[lang]) == expected
+
+
+def test_english_table_folds_only_cyrillic_homoglyphs():
+    # Cyrillic letters that look like Latin ones are read as Latin in English
+    # text, the rest are kept as they were before.
+    for cp in range(ord("а"), ord("я") + 1):
+        ch = chr(cp)
+        expected = _chained_replace_reference(CONFUSABLES.get(ch, ch), "en")
+        assert ch.translate(TRANSLATION_TABLES["en"]) == expected, ch
+
+    assert "й".translate(TRANSLATION_TABLES["en"]) == "й"
+    assert "бас".translate(TRANSLATION_TABLES["en"]) == "бac"
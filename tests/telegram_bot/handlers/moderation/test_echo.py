@@ -0,0 +1,218 @@
+from collections.abc import Iterator
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from aiogram.types import User
+
+from telegram_bot.handlers.moderation import echo
+from telegram_bot.handlers.moderation.echo import (
+    CensorshipStageStats,
+    _run_censorship_cascade,
+)
+from telegram_bot.handlers.moderation.filters import (
+    CompiledBlacklist,
+    FilterResult,
+    FloodFilter,
+    MessageContext,
+)
+from telegram_bot.handlers.moderation.filters.activity import (
+    GlobalActivityIndex,
+    GlobalFloodConfig,
+)
+from telegram_bot.models.filters import (
+    AICensorshipConfig,
+    CensorshipConfig,
+    FloodConfig,
+    RaidConfig,
+)
+
+MODULE = "telegram_bot.handlers.moderation.echo"
+
+
+@pytest.fixture(autouse=True)
+def stats(monkeypatch: pytest.MonkeyPatch) -> Iterator[CensorshipStageStats]:
+    stats = CensorshipStageStats()
+    monkeypatch.setattr(echo, "censorship_stats", stats)
+    yield stats
+
+
+CTX = MessageContext(chat_id=1, user_id=2, text="some text")
+
+
+def _config() -> CensorshipConfig:
+    return CensorshipConfig(languages=["en"], ai=AICensorshipConfig(enabled=True))
+
+
+@pytest.mark.asyncio
+@patch(f"{MODULE}._check_ai", new_callable=AsyncMock)
+@patch(f"{MODULE}._check_blacklist", new_callable=AsyncMock)
+async def test_blacklist_hit_skips_ai(
+    mock_check_blacklist: AsyncMock,
+    mock_check_ai: AsyncMock,
+    stats: CensorshipStageStats,
+):
+    mock_check_blacklist.return_value = FilterResult(True, "blacklist", score=0.9)
+
+    result = await _run_censorship_cascade(1, CTX, _config())
+
+    assert result.triggered
+    mock_check_ai.assert_not_awaited()
+    assert (stats.checked, stats.blacklist_hits, stats.ai_checked) == (1, 1, 0)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("score", [0.0, 0.6, None])
+@patch(f"{MODULE}._check_ai", new_callable=AsyncMock)
+@patch(f"{MODULE}._check_blacklist", new_callable=AsyncMock)
+async def test_blacklist_miss_checked_by_ai(
+    mock_check_blacklist: AsyncMock,
+    mock_check_ai: AsyncMock,
+    score: float | None,
+    stats: CensorshipStageStats,
+):
+    mock_check_blacklist.return_value = FilterResult(False, "", score=score)
+    mock_check_ai.return_value = FilterResult(True, "ai_censor")
+
+    result = await _run_censorship_cascade(1, CTX, _config())
+
+    assert result.reason == "ai_censor"
+    mock_check_ai.assert_awaited_once()
+    assert (stats.ai_checked, stats.ai_hits) == (1, 1)
+
+
+@pytest.mark.asyncio
+@patch(f"{MODULE}._check_ai", new_callable=AsyncMock)
+@patch(f"{MODULE}.get_compiled_blacklist", new_callable=AsyncMock)
+async def test_blacklisted_word_is_removed_without_ai(
+    mock_get_compiled_blacklist: AsyncMock,
+    mock_check_ai: AsyncMock,
+    stats: CensorshipStageStats,
+):
+    config = _config()
+    mock_get_compiled_blacklist.return_value = CompiledBlacklist.build(
+        ["idiot", "fuck"], config
+    )
+    ctx = MessageContext(chat_id=1, user_id=2, text="you are an idiot")
+
+    result = await _run_censorship_cascade(1, ctx, config)
+
+    assert result.triggered
+    mock_check_ai.assert_not_awaited()
+    assert (stats.checked, stats.blacklist_hits, stats.ai_checked) == (1, 1, 0)
+
+
+@pytest.mark.asyncio
+@patch(f"{MODULE}._check_ai", new_callable=AsyncMock)
+@patch(f"{MODULE}.get_compiled_blacklist", new_callable=AsyncMock)
+async def test_unlike_messages_go_to_ai(
+    mock_get_compiled_blacklist: AsyncMock,
+    mock_check_ai: AsyncMock,
+    stats: CensorshipStageStats,
+):
+    config = _config()
+    mock_get_compiled_blacklist.return_value = CompiledBlacklist.build(
+        ["idiot", "fuck"], config
+    )
+    mock_check_ai.return_value = FilterResult(True, "ai_censor")
+    ctx = MessageContext(chat_id=1, user_id=2, text="shut up loser")
+
+    result = await _run_censorship_cascade(1, ctx, config)
+
+    # Toxic but unlike any blacklist word, so only AI can catch it.
+    assert result.triggered
+    mock_check_ai.assert_awaited_once()
+    assert (stats.blacklist_hits, stats.ai_checked) == (0, 1)
+
+
+@pytest.mark.asyncio
+@patch(f"{MODULE}._mute_user_and_send_message", new_callable=AsyncMock)
+async def test_user_flooding_several_chats_is_muted_for_global_mute_time(
+    mock_mute: AsyncMock, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(
+        echo,
+        "activity_index",
+        GlobalActivityIndex(
+            GlobalFloodConfig(message_limit=3, min_chats=2, mute_time=600)
+        ),
+    )
+    monkeypatch.setattr(echo, "flood_filter", FloodFilter())
+    mock_mute.return_value = True
+    message, user = Mock(text="hi"), Mock(id=2)
+
+    assert not await echo.handle_antiflood(
+        message, Mock(), 1, user, "en", FloodConfig()
+    )
+    assert not await echo.handle_antiflood(
+        message, Mock(), 1, user, "en", FloodConfig()
+    )
+    assert await echo.handle_antiflood(message, Mock(), 3, user, "en", FloodConfig())
+
+    mock_mute.assert_awaited_once()
+    assert mock_mute.await_args.args[2:] == (3, "en", user, 600, "global_flood")
+
+
+def _user(user_id: int) -> User:
+    return User(id=user_id, is_bot=False, first_name=f"user{user_id}")
+
+
+def _joined(*user_ids: int, added_by: int | None = None) -> Mock:
+    message = Mock()
+    message.new_chat_members = [_user(user_id) for user_id in user_ids]
+    message.from_user = _user(user_ids[0] if added_by is None else added_by)
+    return message
+
+
+@pytest.mark.asyncio
+@patch(f"{MODULE}.register_users", new_callable=AsyncMock)
+@patch(f"{MODULE}.handle_join_raid", new_callable=AsyncMock)
+@patch(f"{MODULE}.is_chat_admin", new_callable=AsyncMock)
+async def test_admins_are_not_handed_to_raid_handling(
+    mock_is_chat_admin: AsyncMock,
+    mock_handle_join_raid: AsyncMock,
+    mock_register_users: AsyncMock,
+):
+    mock_is_chat_admin.side_effect = lambda bot, chat_id, user_id: user_id == 1
+    mock_handle_join_raid.return_value = True
+    config = RaidConfig(enabled=True)
+    message = _joined(1, 2, added_by=3)
+
+    assert await echo.handle_new_chat_members(message, Mock(), -1, "en", config)
+
+    (suspects,) = [call.args[3] for call in mock_handle_join_raid.await_args_list]
+    assert [user.id for user in suspects] == [2]
+    (registered,) = mock_register_users.await_args.args
+    assert [user.id for user in registered] == [1]
+
+
+@pytest.mark.asyncio
+@patch(f"{MODULE}.register_users", new_callable=AsyncMock)
+@patch(f"{MODULE}.handle_join_raid", new_callable=AsyncMock)
+@patch(f"{MODULE}.is_chat_admin", new_callable=AsyncMock)
+async def test_members_added_by_an_admin_skip_raid_handling(
+    mock_is_chat_admin: AsyncMock,
+    mock_handle_join_raid: AsyncMock,
+    mock_register_users: AsyncMock,
+):
+    mock_is_chat_admin.side_effect = lambda bot, chat_id, user_id: user_id == 9
+    message = _joined(1, 2, added_by=9)
+
+    await echo.handle_new_chat_members(
+        message, Mock(), -1, "en", RaidConfig(enabled=True)
+    )
+
+    mock_handle_join_raid.assert_not_awaited()
+    (registered,) = mock_register_users.await_args.args
+    assert [user.id for user in registered] == [1, 2]
+
+
+@pytest.mark.asyncio
+@patch(f"{MODULE}.register_users", new_callable=AsyncMock)
+@patch(f"{MODULE}.is_chat_admin", new_callable=AsyncMock)
+async def test_raid_protection_is_off_by_default(
+    mock_is_chat_admin: AsyncMock, mock_register_users: AsyncMock
+):
+    await echo.handle_new_chat_members(_joined(1), Mock(), -1, "en", RaidConfig())
+
+    mock_is_chat_admin.assert_not_awaited()
+    mock_register_users.assert_awaited_once()
@@ -0,0 +1,85 @@
+import asyncio
+from collections.abc import Iterator
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from aiogram import Bot
+from aiogram.types import User
+
+from telegram_bot.handlers.moderation import raid
+from telegram_bot.models.filters import RaidConfig
+
+MODULE = "telegram_bot.handlers.moderation.raid"
+
+
+def _user(user_id: int) -> User:
+    return User(id=user_id, is_bot=False, first_name=f"user{user_id}")
+
+
+@pytest.fixture(autouse=True)
+def fresh_raid_state() -> Iterator[None]:
+    with (
+        patch(f"{MODULE}.raid_detector", raid.JoinRaidDetector()),
+        patch(f"{MODULE}.RAID_BATCH_DELAY", 0.01),
+        patch.dict(raid._batches, clear=True),
+        patch.object(raid, "_announced", set()),
+        patch(f"{MODULE}.t", return_value="raid"),
+    ):
+        yield
+
+
+@pytest.mark.asyncio
+@patch(f"{MODULE}.register_users", new_callable=AsyncMock)
+@patch(f"{MODULE}.mute_user", new_callable=AsyncMock)
+async def test_raid_joiners_are_muted_and_registered_in_one_batch(
+    mock_mute_user: AsyncMock, mock_register_users: AsyncMock
+):
+    bot = Mock(spec=Bot)
+    bot.send_message = AsyncMock()
+    config = RaidConfig(enabled=True, join_limit=3, time_window=10, mute_time=60)
+
+    assert not await raid.handle_join_raid(bot, -1, "en", [_user(1)], config)
+    assert not await raid.handle_join_raid(bot, -1, "en", [_user(2)], config)
+    assert await raid.handle_join_raid(bot, -1, "en", [_user(3)], config)
+    assert await raid.handle_join_raid(bot, -1, "en", [_user(4), _user(5)], config)
+
+    await asyncio.gather(*raid._tasks)
+
+    assert sorted(call.args[2] for call in mock_mute_user.await_args_list) == [
+        1,
+        2,
+        3,
+        4,
+        5,
+    ]
+    mock_register_users.assert_awaited_once()
+    (users,) = mock_register_users.await_args.args
+    assert sorted(user.id for user in users) == [3, 4, 5]
+    bot.send_message.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+@patch(f"{MODULE}.register_users", new_callable=AsyncMock)
+@patch(f"{MODULE}.mute_user", new_callable=AsyncMock)
+async def test_raid_is_announced_once(
+    mock_mute_user: AsyncMock, mock_register_users: AsyncMock
+):
+    bot = Mock(spec=Bot)
+    bot.send_message = AsyncMock()
+    config = RaidConfig(enabled=True, join_limit=1)
+
+    assert await raid.handle_join_raid(bot, -1, "en", [_user(1)], config)
+    await asyncio.gather(*raid._tasks)
+    assert await raid.handle_join_raid(bot, -1, "en", [_user(2)], config)
+    await asyncio.gather(*raid._tasks)
+
+    assert mock_mute_user.await_count == 2
+    bot.send_message.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_disabled_raid_protection_ignores_joins():
+    config = RaidConfig(enabled=False, join_limit=1)
+
+    assert not await raid.handle_join_raid(Mock(), -1, "en", [_user(1)], config)
+    assert not raid._tasks
@@ -0,0 +1,30 @@
+from pathlib import Path
+
+import pytest
+
+from telegram_bot.models.filters import FiltersConfig
+from telegram_bot.repositories.chat_settings import (
+    any_ai_censorship_enabled,
+    save_filters,
+)
+from telegram_bot.repositories.db import close_db, init_db
+
+
+@pytest.mark.asyncio
+async def test_any_ai_censorship_enabled(tmp_path: Path):
+    await init_db(str(tmp_path / "test.db"))
+    try:
+        await save_filters(1, FiltersConfig())
+        assert not await any_ai_censorship_enabled()
+
+        filters = FiltersConfig()
+        filters.censorship.ai.enabled = True
+        filters.censorship.enabled = False
+        await save_filters(2, filters)
+        assert not await any_ai_censorship_enabled()
+
+        filters.censorship.enabled = True
+        await save_filters(3, filters)
+        assert await any_ai_censorship_enabled()
+    finally:
+        await close_db()
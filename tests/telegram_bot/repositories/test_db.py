@@ -0,0 +1,79 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from telegram_bot.repositories.blacklist import (
+    add_blacklist_word,
+    get_blacklist_words,
+)
+from telegram_bot.repositories.db import (
+    ConnectionManager,
+    close_db,
+    get_pool_stats,
+    init_db,
+    reader,
+)
+
+
+@pytest.mark.asyncio
+async def test_repositories_share_initialized_connections(tmp_path: Path):
+    await init_db(str(tmp_path / "test.db"))
+    try:
+        await add_blacklist_word(1, "word")
+        await add_blacklist_word(1, "other")
+
+        assert sorted(await get_blacklist_words(1)) == ["other", "word"]
+
+        stats = get_pool_stats()
+        assert stats["writer"].acquisitions >= 2
+        assert stats["reader"].acquisitions == 1
+    finally:
+        await close_db()
+
+
+@pytest.mark.asyncio
+async def test_reader_raises_before_init():
+    await close_db()
+
+    with pytest.raises(RuntimeError):
+        async with reader():
+            pass
+
+
+@pytest.mark.asyncio
+async def test_writer_rolls_back_on_error(tmp_path: Path):
+    manager = ConnectionManager(str(tmp_path / "test.db"), reader_pool_size=1)
+    await manager.open()
+    try:
+        async with manager.writer() as db:
+            await db.execute("CREATE TABLE t (x INTEGER)")
+
+        with pytest.raises(ValueError):
+            async with manager.writer() as db:
+                await db.execute("INSERT INTO t VALUES (1)")
+                raise ValueError("boom")
+
+        async with manager.reader() as db, db.execute("SELECT COUNT(*) FROM t") as cur:
+            row = await cur.fetchone()
+        assert row == (0,)
+    finally:
+        await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_reader_pool_records_wait_time(tmp_path: Path):
+    manager = ConnectionManager(str(tmp_path / "test.db"), reader_pool_size=1)
+    await manager.open()
+    try:
+
+        async def hold_reader() -> None:
+            async with manager.reader():
+                await asyncio.sleep(0.05)
+
+        await asyncio.gather(hold_reader(), hold_reader())
+
+        assert manager.reader_stats.acquisitions == 2
+        assert manager.reader_stats.max_wait > 0.0
+    finally:
+        await manager.close()
@@ -0,0 +1,45 @@
+from pathlib import Path
+
+import pytest
+
+from telegram_bot.repositories.db import close_db, init_db
+from telegram_bot.repositories.users import (
+    get_user_by_id,
+    get_users_by_usernames,
+    upsert_user,
+    upsert_users,
+)
+
+
+@pytest.mark.asyncio
+async def test_get_users_by_usernames(tmp_path: Path):
+    await init_db(str(tmp_path / "test.db"))
+    try:
+        await upsert_user(1, "alice", "Alice", "2026-01-01")
+        await upsert_user(2, "bob", "Bob", "2026-01-01")
+        await upsert_user(3, "carol", "Carol", "2026-01-01")
+
+        users = await get_users_by_usernames(["bob", "alice", "nobody", "bob"])
+
+        assert {name: user.id for name, user in users.items()} == {
+            "alice": 1,
+            "bob": 2,
+        }
+        assert await get_users_by_usernames([]) == {}
+    finally:
+        await close_db()
+
+
+@pytest.mark.asyncio
+async def test_upsert_users_writes_all_rows(tmp_path: Path):
+    await init_db(str(tmp_path / "test.db"))
+    try:
+        await upsert_user(1, "alice", "Alice", "2026-01-01")
+
+        await upsert_users([(1, "alice2", "Alice"), (2, "", "Bob")], "2026-01-02")
+
+        alice, bob = await get_user_by_id(1), await get_user_by_id(2)
+        assert alice is not None and alice.username == "alice2"
+        assert bob is not None and bob.full_name == "Bob" and bob.link == ""
+    finally:
+        await close_db()
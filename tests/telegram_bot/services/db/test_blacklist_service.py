@@ -0,0 +1,100 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from telegram_bot.models.filters import CensorshipConfig
+from telegram_bot.services.db.blacklist_service import (
+    add_blacklist_word,
+    get_compiled_blacklist,
+    remove_blacklist_word,
+)
+
+MODULE = "telegram_bot.services.db.blacklist_service"
+
+
+@pytest.mark.asyncio
+@patch(f"{MODULE}.repo_remove_blacklist_word", new_callable=AsyncMock)
+@patch(f"{MODULE}.repo_add_blacklist_word", new_callable=AsyncMock)
+@patch(f"{MODULE}.repo_get_blacklist_words", new_callable=AsyncMock)
+async def test_compiled_blacklist_cached_until_changed(
+    mock_get_words: AsyncMock,
+    mock_add_word: AsyncMock,
+    mock_remove_word: AsyncMock,
+):
+    chat_id = -42
+    config = CensorshipConfig(languages=["en"])
+    mock_get_words.return_value = ["bad"]
+
+    first = await get_compiled_blacklist(chat_id, config)
+    second = await get_compiled_blacklist(chat_id, config)
+    assert first is second
+    mock_get_words.assert_awaited_once_with(chat_id)
+
+    mock_get_words.return_value = ["bad", "worse"]
+    await add_blacklist_word(chat_id, "worse")
+    third = await get_compiled_blacklist(chat_id, config)
+    assert third.words == ("bad", "worse")
+
+    mock_get_words.return_value = ["bad"]
+    await remove_blacklist_word(chat_id, "worse")
+    fourth = await get_compiled_blacklist(chat_id, config)
+    assert fourth.words == ("bad",)
+    assert mock_get_words.await_count == 3
+
+
+@pytest.mark.asyncio
+@patch(f"{MODULE}.repo_get_blacklist_words", new_callable=AsyncMock)
+async def test_compiled_blacklist_rebuilt_when_settings_change(
+    mock_get_words: AsyncMock,
+):
+    chat_id = -43
+    mock_get_words.return_value = ["bad"]
+
+    en = await get_compiled_blacklist(chat_id, CensorshipConfig(languages=["en"]))
+    ru = await get_compiled_blacklist(chat_id, CensorshipConfig(languages=["ru"]))
+
+    assert en.languages == ("en",)
+    assert ru.languages == ("ru",)
+
+
+@pytest.mark.asyncio
+@patch(f"{MODULE}.repo_add_blacklist_word", new_callable=AsyncMock)
+@patch(f"{MODULE}.repo_get_blacklist_words", new_callable=AsyncMock)
+async def test_word_added_during_load_is_not_lost(
+    mock_get_words: AsyncMock, mock_add_word: AsyncMock
+):
+    chat_id = -44
+    config = CensorshipConfig(languages=["en"])
+    loaded = asyncio.Event()
+    release = asyncio.Event()
+    words = ["bad"]
+
+    async def slow_get_words(chat_id: int) -> list[str]:
+        snapshot = list(words)
+        loaded.set()
+        await release.wait()
+        return snapshot
+
+    mock_get_words.side_effect = slow_get_words
+
+    stale = asyncio.create_task(get_compiled_blacklist(chat_id, config))
+    await loaded.wait()
+    words.append("worse")
+    await add_blacklist_word(chat_id, "worse")
+    release.set()
+    assert (await stale).words == ("bad",)
+
+    fresh = await get_compiled_blacklist(chat_id, config)
+    assert fresh.words == ("bad", "worse")
+
+
+@pytest.mark.asyncio
+@patch(f"{MODULE}.repo_get_blacklist_words", new_callable=AsyncMock)
+async def test_failed_load_is_not_cached(mock_get_words: AsyncMock):
+    chat_id = -45
+    config = CensorshipConfig(languages=["en"])
+    mock_get_words.side_effect = [RuntimeError("database is locked"), ["bad"]]
+
+    assert (await get_compiled_blacklist(chat_id, config)).words == ()
+    assert (await get_compiled_blacklist(chat_id, config)).words == ("bad",)
@@ -0,0 +1,105 @@
+import asyncio
+from collections.abc import Iterator
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from telegram_bot.models.filters import FiltersConfig
+from telegram_bot.services.db.chat_settings_service import (
+    clear_chat_settings_cache,
+    get_chat_filters,
+    get_chat_language,
+    get_chat_settings_cache_stats,
+    save_chat_filters,
+    set_chat_censorship,
+    set_chat_language,
+)
+
+MODULE = "telegram_bot.services.db.chat_settings_service"
+
+
+@pytest.fixture(autouse=True)
+def clean_cache() -> Iterator[None]:
+    clear_chat_settings_cache()
+    yield
+    clear_chat_settings_cache()
+
+
+@pytest.mark.asyncio
+@patch(f"{MODULE}.get_language", new_callable=AsyncMock, return_value="ru")
+async def test_get_chat_language_is_cached(mock_get_language: AsyncMock):
+    assert await get_chat_language(1) == "ru"
+    assert await get_chat_language(1) == "ru"
+
+    mock_get_language.assert_awaited_once_with(1)
+    stats = get_chat_settings_cache_stats()["language"]
+    assert stats.hits == 1
+    assert stats.misses == 1
+
+
+@pytest.mark.asyncio
+@patch(f"{MODULE}.get_language", new_callable=AsyncMock)
+@patch(f"{MODULE}.set_language", new_callable=AsyncMock)
+async def test_set_chat_language_updates_cache(
+    mock_set_language: AsyncMock, mock_get_language: AsyncMock
+):
+    await set_chat_language(1, "ua")
+
+    assert await get_chat_language(1) == "ua"
+    mock_get_language.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+@patch(f"{MODULE}.get_language", new_callable=AsyncMock, side_effect=Exception)
+async def test_get_chat_language_failure_is_not_cached(mock_get_language: AsyncMock):
+    assert await get_chat_language(1) == "en"
+    assert await get_chat_language(1) == "en"
+
+    assert mock_get_language.await_count == 2
+
+
+@pytest.mark.asyncio
+@patch(f"{MODULE}.save_filters", new_callable=AsyncMock)
+@patch(f"{MODULE}.get_filters", new_callable=AsyncMock)
+async def test_set_chat_censorship_writes_through_cache(
+    mock_get_filters: AsyncMock, mock_save_filters: AsyncMock
+):
+    cached = FiltersConfig()
+    mock_get_filters.return_value = cached
+
+    await set_chat_censorship(1, False)
+    filters = await get_chat_filters(1)
+
+    mock_get_filters.assert_awaited_once_with(1)
+    mock_save_filters.assert_awaited_once()
+    assert not filters.censorship.enabled
+    # The previously cached object must not be mutated in place.
+    assert cached.censorship.enabled
+
+
+@pytest.mark.asyncio
+@patch(f"{MODULE}.save_filters", new_callable=AsyncMock)
+@patch(f"{MODULE}.get_filters", new_callable=AsyncMock)
+async def test_concurrent_save_is_not_overwritten_by_read(
+    mock_get_filters: AsyncMock, mock_save_filters: AsyncMock
+):
+    loaded = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_get_filters(chat_id: int) -> FiltersConfig:
+        loaded.set()
+        await release.wait()
+        return FiltersConfig()
+
+    mock_get_filters.side_effect = slow_get_filters
+    saved = FiltersConfig()
+    saved.censorship.enabled = False
+
+    read = asyncio.create_task(get_chat_filters(1))
+    await loaded.wait()
+    await save_chat_filters(1, saved)
+    release.set()
+    await read
+
+    assert not (await get_chat_filters(1)).censorship.enabled
+    mock_get_filters.assert_awaited_once_with(1)
@@ -0,0 +1,99 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from telegram_bot.models.log import ActionStatus, Log
+from telegram_bot.services.db.logging_service import LogSink
+
+
+def _make_log(target_id: int) -> Log:
+    return Log(
+        chat_id=-100,
+        status=ActionStatus.SUCCESS,
+        action_name="ban",
+        called_by_id=1,
+        target_id=target_id,
+        msg_text="/ban",
+    )
+
+
+@pytest.mark.asyncio
+@patch("telegram_bot.services.db.logging_service.add_logs", new_callable=AsyncMock)
+async def test_log_sink_flushes_on_size(mock_add_logs: AsyncMock):
+    sink = LogSink(flush_size=3, flush_interval=60)
+    sink.start()
+
+    for i in range(3):
+        await sink.put(_make_log(i))
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    mock_add_logs.assert_awaited_once()
+    (batch,), _ = mock_add_logs.await_args
+    assert [log.target_id for log in batch] == [0, 1, 2]
+
+    await sink.stop()
+
+
+@pytest.mark.asyncio
+@patch("telegram_bot.services.db.logging_service.add_logs", new_callable=AsyncMock)
+async def test_log_sink_flushes_on_interval(mock_add_logs: AsyncMock):
+    sink = LogSink(flush_size=100, flush_interval=0.01)
+    sink.start()
+
+    await sink.put(_make_log(1))
+    await asyncio.sleep(0.05)
+
+    mock_add_logs.assert_awaited_once()
+    assert sink.flushed == 1
+
+    await sink.stop()
+
+
+@pytest.mark.asyncio
+@patch("telegram_bot.services.db.logging_service.add_logs", new_callable=AsyncMock)
+async def test_log_sink_flushes_pending_logs_on_stop(mock_add_logs: AsyncMock):
+    sink = LogSink(flush_size=100, flush_interval=60)
+    sink.start()
+
+    for i in range(5):
+        await sink.put(_make_log(i))
+    await sink.stop()
+
+    assert sink.flushed == 5
+    assert not sink.running
+
+
+@pytest.mark.asyncio
+@patch("telegram_bot.services.db.logging_service.add_logs", new_callable=AsyncMock)
+async def test_log_sink_drop_oldest_policy(mock_add_logs: AsyncMock):
+    # Writer is not started, so the buffer only fills up.
+    sink = LogSink(max_queue_size=2, overflow_policy="drop_oldest")
+
+    for i in range(4):
+        await sink.put(_make_log(i))
+
+    assert sink.dropped == 2
+    await sink.stop()
+
+    (batch,), _ = mock_add_logs.await_args
+    assert [log.target_id for log in batch] == [2, 3]
+
+
+@pytest.mark.asyncio
+@patch("telegram_bot.services.db.logging_service.add_logs", new_callable=AsyncMock)
+async def test_log_sink_block_policy_waits_for_writer(mock_add_logs: AsyncMock):
+    sink = LogSink(flush_size=1, flush_interval=60, max_queue_size=1)
+
+    await sink.put(_make_log(1))
+    blocked = asyncio.create_task(sink.put(_make_log(2)))
+    await asyncio.sleep(0.01)
+    assert not blocked.done()
+
+    sink.start()
+    await asyncio.wait_for(blocked, timeout=1)
+    await sink.stop()
+
+    assert sink.flushed == 2
+    assert sink.dropped == 0
@@ -0,0 +1,144 @@
+import asyncio
+from collections.abc import Iterator
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from aiogram import Bot
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import (
+    ChatMemberAdministrator,
+    ChatMemberMember,
+    ChatMemberOwner,
+    User,
+)
+
+from telegram_bot.services.telegram.admins import (
+    apply_chat_member_update,
+    clear_admin_rosters,
+    is_chat_admin,
+    seed_chat_admins,
+)
+
+
+def _user(user_id: int) -> User:
+    return User(id=user_id, is_bot=False, first_name=f"user{user_id}")
+
+
+def _admin(user_id: int) -> ChatMemberAdministrator:
+    return ChatMemberAdministrator(
+        user=_user(user_id),
+        can_be_edited=False,
+        is_anonymous=False,
+        can_manage_chat=True,
+        can_delete_messages=True,
+        can_manage_video_chats=True,
+        can_restrict_members=True,
+        can_promote_members=False,
+        can_change_info=True,
+        can_invite_users=True,
+        can_post_stories=False,
+        can_edit_stories=False,
+        can_delete_stories=False,
+    )
+
+
+def _owner(user_id: int) -> ChatMemberOwner:
+    return ChatMemberOwner(user=_user(user_id), is_anonymous=False)
+
+
+def _update(chat_id: int, member) -> Mock:
+    update = Mock()
+    update.chat.id = chat_id
+    update.new_chat_member = member
+    return update
+
+
+@pytest.fixture(autouse=True)
+def empty_rosters() -> Iterator[None]:
+    clear_admin_rosters()
+    yield
+    clear_admin_rosters()
+
+
+@pytest.mark.asyncio
+async def test_roster_is_loaded_once_per_chat():
+    bot = Mock(spec=Bot)
+    bot.get_chat_administrators = AsyncMock(return_value=[_owner(1), _admin(2)])
+
+    assert await is_chat_admin(bot, -1, 1)
+    assert await is_chat_admin(bot, -1, 2)
+    assert not await is_chat_admin(bot, -1, 3)
+
+    bot.get_chat_administrators.assert_awaited_once_with(-1)
+
+
+@pytest.mark.asyncio
+async def test_seeded_roster_needs_no_api_call():
+    bot = Mock(spec=Bot)
+    bot.get_chat_administrators = AsyncMock()
+    seed_chat_admins(-1, [_owner(1)])
+
+    assert await is_chat_admin(bot, -1, 1)
+    bot.get_chat_administrators.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_chat_member_updates_promote_and_demote():
+    bot = Mock(spec=Bot)
+    bot.get_chat_administrators = AsyncMock()
+    seed_chat_admins(-1, [_owner(1), _admin(2)])
+
+    apply_chat_member_update(_update(-1, _admin(3)))
+    apply_chat_member_update(_update(-1, ChatMemberMember(user=_user(2))))
+
+    assert await is_chat_admin(bot, -1, 3)
+    assert not await is_chat_admin(bot, -1, 2)
+    bot.get_chat_administrators.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_update_for_unknown_chat_does_not_create_a_roster():
+    bot = Mock(spec=Bot)
+    bot.get_chat_administrators = AsyncMock(return_value=[_owner(1)])
+
+    apply_chat_member_update(_update(-1, _admin(3)))
+
+    assert not await is_chat_admin(bot, -1, 3)
+    bot.get_chat_administrators.assert_awaited_once_with(-1)
+
+
+@pytest.mark.asyncio
+async def test_update_during_load_is_not_overwritten():
+    loaded = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_get_chat_administrators(chat_id: int):
+        loaded.set()
+        await release.wait()
+        return [_owner(1), _admin(2)]
+
+    bot = Mock(spec=Bot)
+    bot.get_chat_administrators = AsyncMock(side_effect=slow_get_chat_administrators)
+
+    stale = asyncio.create_task(is_chat_admin(bot, -1, 2))
+    await loaded.wait()
+    apply_chat_member_update(_update(-1, ChatMemberMember(user=_user(2))))
+    release.set()
+    assert await stale
+
+    bot.get_chat_administrators.side_effect = None
+    bot.get_chat_administrators.return_value = [_owner(1)]
+    assert not await is_chat_admin(bot, -1, 2)
+    assert bot.get_chat_administrators.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_falls_back_to_member_status_when_roster_is_unavailable():
+    bot = Mock(spec=Bot)
+    bot.get_chat_administrators = AsyncMock(
+        side_effect=TelegramBadRequest(method=Mock(), message="no admins")
+    )
+    bot.get_chat_member = AsyncMock(return_value=_admin(1))
+
+    assert await is_chat_admin(bot, 1, 1)
+    bot.get_chat_member.assert_awaited_once_with(1, 1)
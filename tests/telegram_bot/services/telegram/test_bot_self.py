@@ -0,0 +1,87 @@
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from aiogram import Bot
+from aiogram.types import ChatMemberAdministrator, ChatMemberMember, User
+
+from telegram_bot.services.telegram.bot_self import BotSelf
+
+BOT_USER = User(id=42, is_bot=True, first_name="bot")
+
+
+def _admin(can_restrict_members: bool) -> ChatMemberAdministrator:
+    return ChatMemberAdministrator(
+        user=BOT_USER,
+        can_be_edited=False,
+        is_anonymous=False,
+        can_manage_chat=True,
+        can_delete_messages=True,
+        can_manage_video_chats=True,
+        can_restrict_members=can_restrict_members,
+        can_promote_members=False,
+        can_change_info=True,
+        can_invite_users=True,
+        can_post_stories=False,
+        can_edit_stories=False,
+        can_delete_stories=False,
+    )
+
+
+def _bot(member) -> Mock:
+    bot = Mock(spec=Bot)
+    bot.id = BOT_USER.id
+    bot.get_me = AsyncMock(return_value=BOT_USER)
+    bot.get_chat_member = AsyncMock(return_value=member)
+    return bot
+
+
+@pytest.mark.asyncio
+async def test_identity_is_fetched_once():
+    bot = _bot(None)
+    bot_self = BotSelf()
+
+    assert await bot_self.get_user(bot) is BOT_USER
+    assert await bot_self.get_user(bot) is BOT_USER
+    bot.get_me.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_identity_set_at_startup_needs_no_api_call():
+    bot = _bot(None)
+    bot_self = BotSelf()
+    bot_self.set_user(BOT_USER)
+
+    assert await bot_self.get_user(bot) is BOT_USER
+    bot.get_me.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_rights_are_cached_per_chat():
+    bot = _bot(_admin(can_restrict_members=True))
+    bot_self = BotSelf()
+
+    assert await bot_self.can_restrict(bot, -1)
+    assert await bot_self.can_restrict(bot, -1)
+    bot.get_chat_member.assert_awaited_once_with(-1, BOT_USER.id)
+
+
+@pytest.mark.asyncio
+async def test_my_chat_member_update_replaces_cached_rights():
+    bot = _bot(_admin(can_restrict_members=True))
+    bot_self = BotSelf()
+    assert await bot_self.can_restrict(bot, -1)
+
+    update = Mock()
+    update.chat.id = -1
+    update.new_chat_member = ChatMemberMember(user=BOT_USER)
+    bot_self.apply_update(update)
+
+    assert not await bot_self.can_restrict(bot, -1)
+    bot.get_chat_member.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_admin_without_restrict_right_cannot_restrict():
+    bot_self = BotSelf()
+
+    assert not await bot_self.can_restrict(_bot(_admin(False)), -1)
@@ -0,0 +1,56 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from aiogram import Bot
+from aiogram.types import ChatMemberAdministrator, ChatMemberMember, User
+
+from telegram_bot.services.telegram.processor import (
+    MAX_CONCURRENT_TARGETS,
+    process_targets,
+)
+
+MODULE = "telegram_bot.services.telegram.processor"
+
+
+def _user(user_id: int) -> User:
+    return User(id=user_id, is_bot=False, first_name=f"user{user_id}")
+
+
+def _member(user_id: int) -> ChatMemberMember:
+    return ChatMemberMember(user=_user(user_id))
+
+
+@pytest.mark.asyncio
+@patch(f"{MODULE}.register_log", new_callable=AsyncMock)
+async def test_process_targets_runs_concurrently_in_order(mock_register_log: AsyncMock):
+    running = 0
+    max_running = 0
+
+    async def action(bot: Bot, chat_id: int, user_id: int) -> None:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        # Later targets finish first.
+        await asyncio.sleep(0.001 * (20 - user_id))
+        running -= 1
+        if user_id == 3:
+            raise RuntimeError("not enough rights")
+
+    bot = Mock(spec=Bot)
+    bot.id = 100
+    admin = ChatMemberAdministrator.model_construct(user=_user(7))
+    targets = [_member(i) for i in range(1, 13)]
+    targets.insert(2, "@unknown")
+    targets.insert(5, admin)
+
+    acted, skipped, unknown = await process_targets(
+        bot, -1, _user(99), "/ban ...", targets, "ban", action
+    )
+
+    # A failed action does not stop the others and is still reported.
+    assert [u.id for u in acted] == list(range(1, 13))
+    assert skipped == ['<a href="tg://user?id=7">user7</a>']
+    assert unknown == ["@unknown"]
+    assert max_running == MAX_CONCURRENT_TARGETS
+    assert mock_register_log.await_count == 13
@@ -0,0 +1,134 @@
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import GetMe, GetUpdates, RestrictChatMember, SendMessage
+from aiogram.types import ChatPermissions
+
+from telegram_bot.services.telegram.request_scheduler import (
+    RequestScheduler,
+    TokenBucket,
+)
+
+
+def _send(chat_id: int = 1) -> SendMessage:
+    return SendMessage(chat_id=chat_id, text="notice")
+
+
+def _restrict(chat_id: int = 1) -> RestrictChatMember:
+    return RestrictChatMember(
+        chat_id=chat_id, user_id=2, permissions=ChatPermissions(can_send_messages=False)
+    )
+
+
+def test_token_bucket_refills_over_time():
+    bucket = TokenBucket(rate=2.0, capacity=2.0)
+    now = bucket.updated
+
+    bucket.take(2.0)
+    assert bucket.wait_time(now, 1.0) == pytest.approx(0.5)
+    assert bucket.wait_time(now + 0.5, 1.0) == 0.0
+
+    bucket.pause(now + 3.0)
+    assert bucket.wait_time(now + 1.0, 1.0) == pytest.approx(2.0)
+
+
+@pytest.mark.asyncio
+async def test_moderation_goes_before_queued_notices():
+    scheduler = RequestScheduler(global_rate=20.0)
+    scheduler._global.take(scheduler._global.tokens)
+    sent: list[str] = []
+
+    async def make_request(bot, method):
+        sent.append(type(method).__name__)
+        return Mock()
+
+    try:
+        notices = [
+            asyncio.create_task(scheduler(make_request, Mock(), _send()))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        moderation = asyncio.create_task(scheduler(make_request, Mock(), _restrict()))
+        await asyncio.sleep(0)
+
+        stats = scheduler.get_stats()
+        assert stats.depth == 4
+        assert stats.depth_by_priority == {"moderation": 1, "default": 0, "notice": 3}
+
+        await asyncio.wait_for(asyncio.gather(moderation, *notices), 2)
+    finally:
+        await scheduler.close()
+
+    assert sent[0] == "RestrictChatMember"
+    assert scheduler.get_stats().sent == 4
+    assert scheduler.depth == 0
+
+
+@pytest.mark.asyncio
+async def test_retry_after_is_honoured_and_request_requeued():
+    scheduler = RequestScheduler()
+    calls = 0
+
+    async def make_request(bot, method):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise TelegramRetryAfter(method, "Flood control exceeded", 0)
+        return "ok"
+
+    try:
+        result = await asyncio.wait_for(scheduler(make_request, Mock(), _send()), 2)
+    finally:
+        await scheduler.close()
+
+    assert result == "ok"
+    assert calls == 2
+    assert scheduler.stats.retried == 1
+    assert scheduler.stats.sent == 1
+
+
+@pytest.mark.asyncio
+async def test_gives_up_after_repeated_retry_after(mocker):
+    mocker.patch("telegram_bot.services.telegram.request_scheduler.MAX_ATTEMPTS", 2)
+    scheduler = RequestScheduler()
+
+    async def make_request(bot, method):
+        raise TelegramRetryAfter(method, "Flood control exceeded", 0)
+
+    try:
+        with pytest.raises(TelegramRetryAfter):
+            await asyncio.wait_for(scheduler(make_request, Mock(), _send()), 2)
+    finally:
+        await scheduler.close()
+
+    assert scheduler.stats.retried == 1
+    assert scheduler.stats.failed == 1
+
+
+@pytest.mark.asyncio
+async def test_requests_without_chat_skip_chat_buckets():
+    scheduler = RequestScheduler()
+
+    async def make_request(bot, method):
+        return "ok"
+
+    try:
+        assert await scheduler(make_request, Mock(), GetMe()) == "ok"
+    finally:
+        await scheduler.close()
+
+    assert scheduler._chats == {}
+
+
+@pytest.mark.asyncio
+async def test_get_updates_bypasses_the_queue():
+    scheduler = RequestScheduler()
+
+    async def make_request(bot, method):
+        return "updates"
+
+    assert await scheduler(make_request, Mock(), GetUpdates()) == "updates"
+    assert scheduler._task is None
+    assert scheduler.stats.sent == 0
@@ -0,0 +1,57 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from aiogram import Bot
+from aiogram.types import ChatMemberMember, User
+
+from telegram_bot.models.user import UserDTO
+from telegram_bot.services.telegram.resolve_targets import get_target_members
+
+MODULE = "telegram_bot.services.telegram.resolve_targets"
+
+
+def _member(user_id: int) -> ChatMemberMember:
+    return ChatMemberMember(
+        user=User(id=user_id, is_bot=False, first_name=f"user{user_id}")
+    )
+
+
+def _user_dto(user_id: int, username: str) -> UserDTO:
+    return UserDTO(id=user_id, username=username, full_name="", link="", updated_at="")
+
+
+@pytest.mark.asyncio
+@patch(f"{MODULE}.get_user", new_callable=AsyncMock)
+@patch(f"{MODULE}.get_users", new_callable=AsyncMock)
+async def test_get_target_members_resolves_concurrently_in_order(
+    mock_get_users: AsyncMock, mock_get_user: AsyncMock
+):
+    mock_get_users.return_value = {"a": _user_dto(1, "a"), "b": _user_dto(2, "b")}
+
+    async def get_chat_member(chat_id: int, user_id: int) -> ChatMemberMember:
+        # Earlier targets answer last.
+        await asyncio.sleep(0.01 / user_id)
+        return _member(user_id)
+
+    bot = Mock(spec=Bot)
+    bot.get_chat_member = AsyncMock(side_effect=get_chat_member)
+    message = Mock()
+    message.chat.id = -1
+    message.reply_to_message.from_user.id = 2
+
+    members = await get_target_members(
+        message, "/ban @a @b @unknown 1 @a 3 @unknown", bot
+    )
+
+    assert [m if isinstance(m, str) else m.user.id for m in members] == [
+        2,
+        1,
+        "@unknown",
+        3,
+        "@unknown",
+    ]
+    # One query for all usernames, each distinct identifier is fetched once.
+    mock_get_users.assert_awaited_once_with(["a", "b", "unknown", "a", "unknown"])
+    mock_get_user.assert_not_awaited()
+    assert bot.get_chat_member.await_count == 5
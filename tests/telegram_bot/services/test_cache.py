@@ -0,0 +1,107 @@
+from pytest_mock import MockerFixture
+
+from telegram_bot.services.cache import TTLCache
+
+
+def test_ttl_cache_hit_and_miss():
+    cache: TTLCache[int, str] = TTLCache(maxsize=2, ttl=60)
+
+    assert cache.get(1) is None
+    cache.set(1, "en")
+    assert cache.get(1) == "en"
+
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+    assert cache.stats.hit_rate == 0.5
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache: TTLCache[int, str] = TTLCache(maxsize=2, ttl=60)
+
+    cache.set(1, "a")
+    cache.set(2, "b")
+    cache.get(1)
+    cache.set(3, "c")
+
+    assert cache.get(2) is None
+    assert cache.get(1) == "a"
+    assert cache.get(3) == "c"
+    assert cache.stats.evictions == 1
+    assert len(cache) == 2
+
+
+def test_ttl_cache_expires_entries(mocker: MockerFixture):
+    now = mocker.patch("telegram_bot.services.cache.time.monotonic", return_value=0.0)
+    cache: TTLCache[int, str] = TTLCache(maxsize=2, ttl=10)
+
+    cache.set(1, "a")
+    now.return_value = 9.0
+    assert cache.get(1) == "a"
+
+    now.return_value = 10.0
+    assert cache.get(1) is None
+    assert len(cache) == 0
+
+
+def test_ttl_cache_invalidate():
+    cache: TTLCache[int, str] = TTLCache(maxsize=2, ttl=60)
+
+    cache.set(1, "a")
+    cache.invalidate(1)
+
+    assert cache.get(1) is None
+
+
+def test_ttl_cache_bounded_by_bytes():
+    cache: TTLCache[int, str] = TTLCache(maxsize=100, ttl=60, max_bytes=10, sizeof=len)
+
+    cache.set(1, "aaaa")
+    cache.set(2, "bbbb")
+    cache.set(3, "cccc")
+
+    assert cache.get(1) is None
+    assert cache.get(2) == "bbbb"
+    assert cache.stats.bytes == 8
+    assert cache.stats.evictions == 1
+
+    cache.set(2, "bb")
+    assert cache.stats.bytes == 6
+
+
+def test_ttl_cache_skips_stale_read_through():
+    cache: TTLCache[int, str] = TTLCache(maxsize=2, ttl=60)
+
+    generation = cache.generation(1)
+    cache.invalidate(1)
+    cache.set(1, "stale", generation)
+    assert cache.get(1) is None
+
+    generation = cache.generation(1)
+    cache.set(1, "fresh", generation)
+    assert cache.get(1) == "fresh"
+
+
+def test_ttl_cache_generations_stay_bounded():
+    cache: TTLCache[int, int] = TTLCache(maxsize=10, ttl=60)
+
+    for key in range(100_000):
+        cache.set(key, key, cache.generation(key))
+        if key % 3 == 0:
+            cache.invalidate(key)
+
+    assert len(cache) <= 10
+    assert len(cache._removed) <= 10
+
+    generation = cache.generation(1)
+    cache.set(1, 1, generation)
+    assert cache.get(1) == 1
+
+
+def test_ttl_cache_clear_drops_loads_in_flight():
+    cache: TTLCache[int, str] = TTLCache(maxsize=2, ttl=60)
+
+    generation = cache.generation(1)
+    cache.clear()
+    cache.set(1, "stale", generation)
+
+    assert cache.get(1) is None
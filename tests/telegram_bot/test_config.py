@@ -45,3 +45,24 @@ def test_load_config_token_not_set(
         load_config()
 
     mock_load_dotenv.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    ("name", "value"),
+    [
+        ("GLOBAL_FLOOD_WINDOW", "0.5"),
+        ("GLOBAL_FLOOD_WINDOW", "0"),
+        ("GLOBAL_FLOOD_MUTE_TIME", "29"),
+    ],
+)
+@patch("telegram_bot.config.load_dotenv")
+def test_load_config_rejects_invalid_global_flood_settings(
+    mock_load_dotenv: Mock, monkeypatch: pytest.MonkeyPatch, name: str, value: str
+):
+    env = {"BOT_TOKEN": "1a2b3c4d5e6f7g8h", name: value}
+
+    monkeypatch.setattr("telegram_bot.config.Path.exists", lambda self: True)
+    monkeypatch.setattr("telegram_bot.config.getenv", env.get)
+
+    with pytest.raises(RuntimeError, match=name):
+        load_config()